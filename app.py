@@ -1,12 +1,24 @@
 import streamlit as st
 import google.generativeai as genai
 import os
-import json
 from datetime import datetime, timedelta
 import base64
 from io import BytesIO
 from dotenv import load_dotenv
-import re
+from storage import LeagueRepository, DB_PATH
+from reference_data import ReferenceCache
+from instrumentation import metrics
+from response_parser import StreamingFields, parse_reply
+from replay import Recorder
+from intent_parser import parse_intent
+from response_cache import ResponseCache, normalize_message, refers_back
+from models import GAME_STATUSES, ValidationError, validate_action, validate_game, validate_league
+from chat_actions import check_game, check_games, check_league
+from chat_history import ChatHistory
+from context_builder import build_context, encode as encode_context, legend as context_legend
+from model_client import CircuitBreaker, ModelClient, ModelUnavailable
+from scheduler import SchedulingError, default_slot_times, generate_season
+import bulk_io
 
 # Load environment variables
 load_dotenv()
@@ -332,115 +344,137 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state
+# Demo data loaded into an empty database
+SEED_LEAGUES = [
+    {
+        'id': 1,
+        'name': 'Phoenix Winter 2025',
+        'format': '7v7',
+        'start_date': '2025-01-15',
+        'end_date': '2025-03-30',
+        'teams': [
+            {'id': 1, 'name': 'Phoenix Firebirds', 'logo': '🔥'},
+            {'id': 2, 'name': 'Desert Storm', 'logo': '⛈️'},
+            {'id': 3, 'name': 'Valley Vipers', 'logo': '🐍'},
+            {'id': 4, 'name': 'Cactus Kings', 'logo': '🌵'},
+            {'id': 5, 'name': 'Sun Devils', 'logo': '😈'},
+            {'id': 6, 'name': 'Red Rocks', 'logo': '🪨'},
+        ]
+    },
+    {
+        'id': 2,
+        'name': 'Phoenix Summer League',
+        'format': '5v5',
+        'start_date': '2025-06-01',
+        'end_date': '2025-08-15',
+        'teams': []
+    }
+]
+
+SEED_GAMES = [
+    {
+        'id': 1,
+        'league_id': 1,
+        'league_name': 'Phoenix Winter 2025',
+        'team_a': 'Phoenix Firebirds',
+        'team_a_logo': '🔥',
+        'team_b': 'Desert Storm',
+        'team_b_logo': '⛈️',
+        'date': '2025-01-20',
+        'time': '10:00',
+        'venue': 'Phoenix Sports Complex',
+        'referee': 'John Carter',
+        'status': 'Scheduled',
+        'score_a': None,
+        'score_b': None
+    },
+    {
+        'id': 2,
+        'league_id': 1,
+        'league_name': 'Phoenix Winter 2025',
+        'team_a': 'Valley Vipers',
+        'team_a_logo': '🐍',
+        'team_b': 'Cactus Kings',
+        'team_b_logo': '🌵',
+        'date': '2025-01-20',
+        'time': '14:00',
+        'venue': 'Desert Field',
+        'referee': 'Anthony Brooks',
+        'status': 'Scheduled',
+        'score_a': None,
+        'score_b': None
+    },
+    {
+        'id': 3,
+        'league_id': 1,
+        'league_name': 'Phoenix Winter 2025',
+        'team_a': 'Sun Devils',
+        'team_a_logo': '😈',
+        'team_b': 'Red Rocks',
+        'team_b_logo': '🪨',
+        'date': '2025-01-21',
+        'time': '11:00',
+        'venue': 'Valley Stadium',
+        'referee': 'John Carter',
+        'status': 'Scheduled',
+        'score_a': None,
+        'score_b': None
+    }
+]
+
+SEED_REFEREES = ['John Carter', 'Anthony Brooks', 'Sarah Williams', 'Mike Johnson']
+
+@st.cache_resource
+def get_repository():
+    """Open the shared league/game store, seeding it on first run"""
+    repo = LeagueRepository(DB_PATH)
+    if repo.count_leagues() == 0:
+        repo.seed(SEED_LEAGUES, SEED_GAMES, SEED_REFEREES)
+    elif not repo.list_referees():
+        repo.add_referees(SEED_REFEREES)
+    return repo
+
+@st.cache_resource
+def get_reference_cache():
+    """Leagues, teams and referees shared read-only by every session"""
+    return ReferenceCache(get_repository())
+
+repo = get_repository()
+reference = get_reference_cache()
+
+# Initialize session state (UI state only; shared data lives in the reference cache)
 if 'page' not in st.session_state:
     st.session_state.page = 'home'
-if 'leagues' not in st.session_state:
-    st.session_state.leagues = [
-        {
-            'id': 1,
-            'name': 'Phoenix Winter 2025',
-            'format': '7v7',
-            'start_date': '2025-01-15',
-            'end_date': '2025-03-30',
-            'teams': [
-                {'id': 1, 'name': 'Phoenix Firebirds', 'logo': '🔥'},
-                {'id': 2, 'name': 'Desert Storm', 'logo': '⛈️'},
-                {'id': 3, 'name': 'Valley Vipers', 'logo': '🐍'},
-                {'id': 4, 'name': 'Cactus Kings', 'logo': '🌵'},
-                {'id': 5, 'name': 'Sun Devils', 'logo': '😈'},
-                {'id': 6, 'name': 'Red Rocks', 'logo': '🪨'},
-            ]
-        },
-        {
-            'id': 2,
-            'name': 'Phoenix Summer League',
-            'format': '5v5',
-            'start_date': '2025-06-01',
-            'end_date': '2025-08-15',
-            'teams': []
-        }
-    ]
-if 'games' not in st.session_state:
-    st.session_state.games = [
-        {
-            'id': 1,
-            'league_id': 1,
-            'league_name': 'Phoenix Winter 2025',
-            'team_a': 'Phoenix Firebirds',
-            'team_a_logo': '🔥',
-            'team_b': 'Desert Storm',
-            'team_b_logo': '⛈️',
-            'date': '2025-01-20',
-            'time': '10:00',
-            'venue': 'Phoenix Sports Complex',
-            'referee': 'John Carter',
-            'status': 'Scheduled',
-            'score_a': None,
-            'score_b': None
-        },
-        {
-            'id': 2,
-            'league_id': 1,
-            'league_name': 'Phoenix Winter 2025',
-            'team_a': 'Valley Vipers',
-            'team_a_logo': '🐍',
-            'team_b': 'Cactus Kings',
-            'team_b_logo': '🌵',
-            'date': '2025-01-20',
-            'time': '14:00',
-            'venue': 'Desert Field',
-            'referee': 'Anthony Brooks',
-            'status': 'Scheduled',
-            'score_a': None,
-            'score_b': None
-        },
-        {
-            'id': 3,
-            'league_id': 1,
-            'league_name': 'Phoenix Winter 2025',
-            'team_a': 'Sun Devils',
-            'team_a_logo': '😈',
-            'team_b': 'Red Rocks',
-            'team_b_logo': '🪨',
-            'date': '2025-01-21',
-            'time': '11:00',
-            'venue': 'Valley Stadium',
-            'referee': 'John Carter',
-            'status': 'Scheduled',
-            'score_a': None,
-            'score_b': None
-        }
-    ]
-if 'users' not in st.session_state:
-    st.session_state.users = 2847
-if 'pending_payments' not in st.session_state:
-    st.session_state.pending_payments = 12540
-if 'referees' not in st.session_state:
-    st.session_state.referees = ['John Carter', 'Anthony Brooks', 'Sarah Williams', 'Mike Johnson']
 if 'create_league_step' not in st.session_state:
     st.session_state.create_league_step = 1
 if 'league_data' not in st.session_state:
     st.session_state.league_data = {}
 if 'show_modal' not in st.session_state:
     st.session_state.show_modal = None
-if 'ai_response' not in st.session_state:
-    st.session_state.ai_response = None
 if 'chatbot_state' not in st.session_state:
     st.session_state.chatbot_state = {}
 if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
+    st.session_state.chat_history = ChatHistory()
 
 # Configure Gemini API
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+HISTORY_TOKEN_BUDGET = int(os.getenv("PFFL_HISTORY_TOKEN_BUDGET", "800"))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("PFFL_CONTEXT_TOKEN_BUDGET", "1500"))
+MODEL_TIMEOUT = float(os.getenv("PFFL_MODEL_TIMEOUT", "20"))
+MODEL_MAX_RETRIES = int(os.getenv("PFFL_MODEL_MAX_RETRIES", "2"))
+METRICS_PORT = int(os.getenv("PFFL_METRICS_PORT", "0"))
+RECORD_PATH = os.getenv("PFFL_RECORD_PATH")
+GAMES_PAGE_SIZES = [10, 25, 50, 100]
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
 
 # System prompt for AI Chatbot
 SYSTEM_PROMPT = """You are the PFFL AI Chatbot - a helpful assistant for the Phoenix Performance Flag Football League.
 
-AVAILABLE LEAGUES: {leagues}
-AVAILABLE REFEREES: {referees}
+Each message comes with CONTEXT DATA as compact JSON with short keys:
+""" + context_legend() + """
+Only use league, team and referee names exactly as they appear there. If the
+user's league is not in lg, ask which league they mean.
 
 YOUR JOB:
 1. Help users CREATE LEAGUES through a 12-step conversation
@@ -471,6 +505,8 @@ When user wants to schedule a game, collect:
 - time (HH:MM format like 14:30)
 - venue (location)
 - referee (from available referees)
+When the user gives several games at once (e.g. a whole game day), return
+them ALL in a single create_games reply instead of one game per message.
 
 RESPONSE RULES:
 - Ask ONE question at a time
@@ -481,23 +517,23 @@ RESPONSE RULES:
 RESPONSE FORMAT - Always return valid JSON:
 
 For asking next question:
-{{
+{
   "action": "ask_question",
   "title": "Step 2: League Name",
   "body": "Great! You chose 7v7. What should we call your league?",
   "speak": "What name would you like for your league?",
   "current_step": 2,
   "total_steps": 12,
-  "conversation_state": {{"format": "7v7", "name": null}}
-}}
+  "conversation_state": {"format": "7v7", "name": null}
+}
 
 When league is complete:
-{{
+{
   "action": "create_league",
   "title": "League Created! 🎉",
   "body": "Your league 'Spring Championship' is ready with 6 teams!",
   "speak": "All done! Your league is created.",
-  "data": {{
+  "data": {
     "name": "Spring Championship",
     "format": "7v7",
     "start_date": "2025-01-15",
@@ -507,16 +543,16 @@ When league is complete:
     "fee_amount": 50,
     "venue": "Phoenix Stadium",
     "schedule_preferences": "Weekends"
-  }}
-}}
+  }
+}
 
 When game is complete:
-{{
+{
   "action": "create_game",
   "title": "Game Scheduled! ⚡",
   "body": "Game between Firebirds and Storm is set for Sunday!",
   "speak": "Game scheduled successfully!",
-  "data": {{
+  "data": {
     "league_name": "Phoenix Winter 2025",
     "team_a": "Phoenix Firebirds",
     "team_b": "Desert Storm",
@@ -524,29 +560,114 @@ When game is complete:
     "time": "10:00",
     "venue": "Phoenix Sports Complex",
     "referee": "John Carter"
-  }}
-}}
+  }
+}
+
+For several games at once (up to 50):
+{
+  "action": "create_games",
+  "title": "Game Day Scheduled! ⚡",
+  "body": "3 games are set for Saturday at Desert Field.",
+  "speak": "Your games are scheduled!",
+  "data": [
+    {"league_name": "Phoenix Winter 2025", "team_a": "Phoenix Firebirds", "team_b": "Desert Storm",
+     "date": "2025-01-25", "time": "09:00", "venue": "Desert Field", "referee": "John Carter"},
+    {"league_name": "Phoenix Winter 2025", "team_a": "Valley Vipers", "team_b": "Cactus Kings",
+     "date": "2025-01-25", "time": "10:30", "venue": "Desert Field", "referee": "John Carter"}
+  ]
+}
 
 For showing info:
-{{
+{
   "action": "show_info",
   "title": "Current Leagues",
   "body": "You have 2 active leagues: Phoenix Winter 2025 (7v7) and Phoenix Summer League (5v5).",
   "speak": "Here are your leagues"
-}}
+}
 
 For errors:
-{{
+{
   "action": "error",
   "title": "Oops!",
   "body": "That league name already exists. Please choose a different name.",
   "speak": "Please try a different name"
-}}
+}
+
+Remember: Return ONLY the JSON object. No extra text before or after.
+No markdown, no code blocks - just pure JSON starting with { and ending with }."""
+
+@st.cache_resource
+def get_response_cache():
+    """Process-wide cache of show_info answers, shared by every session"""
+    return ResponseCache(maxsize=256, ttl=300)
+
+@st.cache_resource
+def get_model_client():
+    """Shared executor, retry policy and circuit breaker for model calls"""
+    return ModelClient(
+        timeout=MODEL_TIMEOUT,
+        max_retries=MODEL_MAX_RETRIES,
+        breaker=CircuitBreaker(failure_threshold=3, reset_after=30)
+    )
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """Serve /metrics in OpenMetrics format when PFFL_METRICS_PORT is set"""
+    if METRICS_PORT:
+        metrics.serve(METRICS_PORT)
+    return METRICS_PORT
+
+start_metrics_endpoint()
+
+@st.cache_resource
+def get_recorder():
+    """Append-only log of model traffic for offline replay (PFFL_RECORD_PATH)"""
+    return Recorder(RECORD_PATH) if RECORD_PATH else None
+
+@st.cache_resource
+def get_model():
+    """Build the Gemini model once per process with the static system prompt"""
+    return genai.GenerativeModel(
+        model_name='gemini-2.5-flash',
+        generation_config={
+            "temperature": 0.7,
+            "top_p": 0.95,
+            "response_mime_type": "application/json",
+        },
+        system_instruction=SYSTEM_PROMPT
+    )
 
-Remember: Return ONLY the JSON object. No extra text before or after."""
+@metrics.timed('ai.response')
+def get_ai_response(user_message, context=None, on_partial=None):
+    """Get AI response from Gemini with conversation state management
 
-def get_ai_response(user_message, context=None):
-    """Get AI response from Gemini with conversation state management"""
+    When on_partial is given the reply is streamed and the callback receives
+    the title/body decoded so far, plus the set of fields already complete.
+    """
+    # Fully specified commands are handled locally without a model call,
+    # unless a multi-step conversation is under way and the message answers it
+    snapshot = reference.snapshot()
+    if not st.session_state.get('chatbot_state'):
+        local_response = parse_intent(user_message, snapshot.leagues, snapshot.referees, repo.get_stats(),
+                                      standings=repo.standings_table)
+        if local_response:
+            metrics.count('ai.local_answers')
+            return local_response
+    
+    # Read-only answers depend on what the model is shown: leagues, teams and referees
+    # (reference_version) and game counts by status. Score edits change neither, so they
+    # keep the cache warm. Follow-ups ("and their fees?") lean on the history and skip it
+    cache = get_response_cache()
+    cache_key = None
+    if not context and not st.session_state.get('chatbot_state') and not refers_back(user_message):
+        games_by_status = tuple(sorted(repo.get_stats()['games_by_status'].items()))
+        cache_key = (normalize_message(user_message), repo.reference_version, games_by_status)
+        cached = cache.get(cache_key)
+        if cached:
+            metrics.count('ai.cache_hits')
+            return cached
+        metrics.count('ai.cache_misses')
+    
     if not GEMINI_API_KEY:
         return {
             "action": "error",
@@ -556,108 +677,68 @@ def get_ai_response(user_message, context=None):
         }
     
     try:
-        # Initialize Gemini model
-        model = genai.GenerativeModel(
-            model_name='gemini-2.5-flash',
-            generation_config={
-                "temperature": 0.7,
-                "top_p": 0.95,
-            }
-        )
+        model = get_model()
         
-        # Build dynamic context
-        leagues_list = [{"name": l['name'], "format": l['format'], "teams": len(l['teams'])} for l in st.session_state.leagues]
-        
-        context_data = {
-            "leagues": leagues_list,
-            "referees": st.session_state.referees,
-            "total_games": len(st.session_state.games),
-            "conversation_state": st.session_state.get('chatbot_state', {}),
-            "chat_history": st.session_state.get('chat_history', [])[-3:] if st.session_state.get('chat_history') else []
-        }
+        # Compact context: only the entities the conversation mentions, within a hard token budget
+        context_data, context_tokens = build_context(
+            user_message, snapshot.leagues, snapshot.referees, repo.get_stats(),
+            state=st.session_state.get('chatbot_state'),
+            history=st.session_state.chat_history,
+            token_budget=CONTEXT_TOKEN_BUDGET,
+            history_budget=HISTORY_TOKEN_BUDGET,
+            search=repo.search_entities
+        )
+        metrics.count('ai.context_tokens', context_tokens)
         
         if context:
             context_data.update(context)
         
-        # Format system prompt with context
-        formatted_prompt = SYSTEM_PROMPT.format(
-            leagues=json.dumps(leagues_list),
-            referees=', '.join(st.session_state.referees)
-        )
-        
-        full_prompt = f"""{formatted_prompt}
-
-CONTEXT DATA:
-{json.dumps(context_data, indent=2)}
-
-USER MESSAGE: {user_message}
+        # Only the per-message context is sent; the system prompt lives on the cached model
+        full_prompt = f"""CONTEXT DATA:
+{encode_context(context_data)}
 
-IMPORTANT: Return ONLY valid JSON. No markdown, no code blocks, no extra text. Just pure JSON starting with {{ and ending with }}."""
+USER MESSAGE: {user_message}"""
         
-        # Call Gemini API
-        response = model.generate_content(full_prompt)
-        response_text = response.text.strip()
-        
-        # Debug: Print raw response
-        print(f"RAW AI RESPONSE: {response_text[:200]}...")
-        
-        # Clean up response text - remove markdown code blocks if present
-        if response_text.startswith('```'):
-            # Remove markdown code blocks
-            lines = response_text.split('\n')
-            # Find the first line that starts with { and last line that ends with }
-            start_idx = 0
-            end_idx = len(lines) - 1
-            for i, line in enumerate(lines):
-                if line.strip().startswith('{'):
-                    start_idx = i
-                    break
-            for i in range(len(lines) - 1, -1, -1):
-                if lines[i].strip().endswith('}'):
-                    end_idx = i
-                    break
-            response_text = '\n'.join(lines[start_idx:end_idx + 1])
-        
-        # Try to find JSON in the response if it's not pure JSON
-        if not response_text.startswith('{'):
-            # Look for JSON object in the text
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(0)
-            else:
-                # No JSON found, return error
-                return {
-                    "action": "error",
-                    "title": "Response Format Issue",
-                    "body": "I'm having trouble formatting my response. Let me try again.",
-                    "speak": "Sorry, let me rephrase that."
-                }
-        
-        # Parse JSON
-        ai_response = json.loads(response_text)
+        # Call Gemini API off the script thread, with timeout, retries and breaker
+        client = get_model_client()
+        if on_partial:
+            fields = StreamingFields()
+            client.generate(model, full_prompt, on_chunk=lambda text: on_partial(fields.feed(text), fields.done))
+            response_text = fields.buffer.strip()
+        else:
+            response_text = client.generate(model, full_prompt).strip()
         
-        # Validate response has required fields
-        if 'action' not in ai_response:
-            ai_response['action'] = 'show_info'
-        if 'title' not in ai_response:
-            ai_response['title'] = 'AI Response'
-        if 'body' not in ai_response:
-            ai_response['body'] = 'Processing your request...'
+        recorder = get_recorder()
+        if recorder:
+            recorder.record(user_message, context_data, response_text)
         
-        print(f"PARSED RESPONSE: {json.dumps(ai_response, indent=2)}")
+        with metrics.span('ai.extract_json', chars=len(response_text)) as span:
+            ai_response = parse_reply(response_text)
+            span['parsed'] = ai_response is not None
+        if ai_response is None:
+            metrics.count('ai.parse_failures')
+            return {
+                "action": "error",
+                "title": "Response Format Issue",
+                "body": "I'm having trouble formatting my response. Let me try again.",
+                "speak": "Sorry, let me rephrase that."
+            }
         
         # Update conversation state if provided
         if 'conversation_state' in ai_response:
             st.session_state.chatbot_state = ai_response['conversation_state']
         
+        if cache_key and ai_response['action'] == 'show_info':
+            cache.put(cache_key, ai_response)
+        
         return ai_response
         
-    except json.JSONDecodeError as e:
+    except ModelUnavailable as e:
         return {
             "action": "error",
-            "title": "Response Format Error",
-            "body": f"I had trouble understanding that. Could you try rephrasing your request?",
-            "speak": "Sorry, I didn't quite get that. Can you try again?",
+            "title": "AI Temporarily Unavailable",
+            "body": f"{e}. You can still use the Create League and Schedule Game forms, or send a fully specified command.",
+            "speak": "The assistant is unavailable right now.",
             "buttons": [{"text": "Close"}]
         }
     except Exception as e:
@@ -671,45 +752,36 @@ IMPORTANT: Return ONLY valid JSON. No markdown, no code blocks, no extra text. J
 
 def check_duplicate_game(team_a, team_b, league_id):
     """Check if game already exists between two teams"""
-    for game in st.session_state.games:
-        if game['league_id'] == league_id:
-            if (game['team_a'] == team_a and game['team_b'] == team_b) or \
-               (game['team_a'] == team_b and game['team_b'] == team_a):
-                return True
-    return False
+    return repo.game_exists(league_id, team_a, team_b)
 
 def create_game(team_a, team_b, date, time, venue, referee, league_id, league_name):
-    """Create a new game"""
-    # Get team logos
-    league = next((l for l in st.session_state.leagues if l['id'] == league_id), None)
-    team_a_logo = '🏈'
-    team_b_logo = '🏈'
-    
-    if league:
-        for team in league['teams']:
-            if team['name'] == team_a:
-                team_a_logo = team['logo']
-            if team['name'] == team_b:
-                team_b_logo = team['logo']
-    
-    new_game = {
-        'id': len(st.session_state.games) + 1,
+    """Create a new game, raising ValidationError if any field is malformed or it cannot be booked"""
+    game = validate_game({
         'league_id': league_id,
         'league_name': league_name,
         'team_a': team_a,
-        'team_a_logo': team_a_logo,
         'team_b': team_b,
-        'team_b_logo': team_b_logo,
         'date': date,
         'time': time,
         'venue': venue,
-        'referee': referee,
-        'status': 'Scheduled',
-        'score_a': None,
-        'score_b': None
-    }
-    st.session_state.games.append(new_game)
-    return new_game
+        'referee': referee
+    })
+    
+    # Roster spelling and logos for the teams, then refuse repeats and double-booked venues and referees
+    check_game(repo, reference.snapshot(), game)
+    
+    return repo.add_game(game.to_dict())
+
+def create_games(entries):
+    """Validate a batch of games together and store the valid ones in one transaction
+    
+    Each entry is checked like create_game, and also against the entries
+    accepted before it. Returns (created games, failures) where each
+    failure is {'index', 'game', 'reason', 'outcome'} with a 1-based index.
+    """
+    accepted, failures = check_games(repo, reference.snapshot(), entries)
+    created = repo.add_games([game.to_dict() for game in accepted]) if accepted else []
+    return created, failures
 
 def show_modal(modal_type, title, body, buttons):
     """Display a modal"""
@@ -739,6 +811,7 @@ def show_modal(modal_type, title, body, buttons):
                 if button.get('primary'):
                     st.rerun()
 
+@metrics.timed()
 def render_header():
     """Render PFFL header"""
     st.markdown("""
@@ -749,6 +822,7 @@ def render_header():
     </div>
     """, unsafe_allow_html=True)
 
+@metrics.timed()
 def render_navigation():
     """Render bottom navigation"""
     st.markdown(f"""
@@ -779,18 +853,20 @@ def render_navigation():
     </div>
     """, unsafe_allow_html=True)
 
+@metrics.timed()
 def render_home():
     """Render home dashboard"""
     st.markdown("### 📊 Dashboard Overview")
     
     # Stats cards
+    stats = repo.get_stats()
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.markdown(f"""
         <div class="stat-card">
             <div class="stat-label">Total Leagues</div>
-            <div class="stat-value">{len(st.session_state.leagues)}</div>
+            <div class="stat-value">{stats['leagues']}</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -798,23 +874,23 @@ def render_home():
         st.markdown(f"""
         <div class="stat-card">
             <div class="stat-label">Active Games</div>
-            <div class="stat-value">{len(st.session_state.games)}</div>
+            <div class="stat-value">{stats['active_games']}</div>
         </div>
         """, unsafe_allow_html=True)
     
     with col3:
         st.markdown(f"""
         <div class="stat-card">
-            <div class="stat-label">Registered Users</div>
-            <div class="stat-value">{st.session_state.users:,}</div>
+            <div class="stat-label">Registered Teams</div>
+            <div class="stat-value">{stats['teams']:,}</div>
         </div>
         """, unsafe_allow_html=True)
     
     with col4:
         st.markdown(f"""
         <div class="stat-card">
-            <div class="stat-label">Pending Payments</div>
-            <div class="stat-value">${st.session_state.pending_payments:,}</div>
+            <div class="stat-label">Entry Fees</div>
+            <div class="stat-value">${stats['fee_total']:,.0f}</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -838,10 +914,7 @@ def render_home():
     
     # Upcoming Games
     st.markdown("### 🏈 Upcoming Games")
-    upcoming_games = sorted(
-        [g for g in st.session_state.games if g['status'] == 'Scheduled'],
-        key=lambda x: (x['date'], x['time'])
-    )[:5]
+    upcoming_games = repo.upcoming_games(5)
     
     for game in upcoming_games:
         col1, col2, col3 = st.columns([3, 1, 1])
@@ -867,22 +940,50 @@ def render_home():
                 st.session_state.page = 'edit_game'
                 st.rerun()
 
+@metrics.timed()
 def render_games():
     """Render games list"""
     st.markdown("### 🏈 All Games")
     
     # Filter buttons
-    filters = ['All Games', 'Phoenix Winter 2025', 'Phoenix Summer League']
+    filters = ['All Games'] + reference.snapshot().league_names()
     selected_filter = st.radio("", filters, horizontal=True, label_visibility="collapsed")
+    league_name = None if selected_filter == 'All Games' else selected_filter
     
-    # Filter games
-    if selected_filter == 'All Games':
-        filtered_games = st.session_state.games
-    else:
-        filtered_games = [g for g in st.session_state.games if g['league_name'] == selected_filter]
+    col1, col2 = st.columns(2)
+    with col1:
+        sort_order = st.selectbox("Sort", ["Earliest first", "Latest first"], key="games_sort")
+    with col2:
+        page_size = st.selectbox("Games per page", GAMES_PAGE_SIZES, index=1, key="games_page_size")
+    
+    # Start from the first page whenever the query changes
+    query = (league_name, sort_order, page_size)
+    if st.session_state.get('games_query') != query:
+        st.session_state.games_query = query
+        st.session_state.games_cursors = [None]
+    
+    # Fetch just the current page from storage
+    cursors = st.session_state.games_cursors
+    page_games, next_cursor = repo.page_games(
+        league_name=league_name,
+        after=cursors[-1],
+        limit=page_size,
+        descending=sort_order == "Latest first"
+    )
+    total = repo.game_total(league_name)
+    
+    # Venue/referee double-bookings across the whole calendar
+    conflicts = repo.all_booking_conflicts()
+    if conflicts:
+        with st.expander(f"⚠️ {len(conflicts)} scheduling conflicts"):
+            for kind, name, game_id, other_id in conflicts[:50]:
+                st.markdown(f"- {kind.capitalize()} **{name}** is double-booked by games #{game_id} and #{other_id}")
+    
+    first = (len(cursors) - 1) * page_size
+    st.caption(f"Showing {first + 1 if page_games else 0}–{first + len(page_games)} of {total} games")
     
     # Display games
-    for game in sorted(filtered_games, key=lambda x: (x['date'], x['time'])):
+    for game in page_games:
         col1, col2 = st.columns([4, 1])
         
         with col1:
@@ -911,15 +1012,77 @@ def render_games():
                 st.session_state.edit_game_id = game['id']
                 st.session_state.page = 'edit_game'
                 st.rerun()
+    
+    # Pager
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("← Previous Page", key="games_prev", use_container_width=True, disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if st.button("Next Page →", key="games_next", use_container_width=True, disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+
+@metrics.timed()
+def render_edit_game():
+    """Render score entry for a game"""
+    game = repo.get_game(st.session_state.get('edit_game_id'))
+    if not game:
+        st.info("Game not found.")
+        if st.button("← Back to Games", use_container_width=True):
+            st.session_state.page = 'games'
+            st.rerun()
+        return
+    
+    st.markdown("### ✏️ Update Game")
+    st.markdown(f"""
+    <div class="game-card">
+        <div class="team-name">{game['team_a_logo']} {game['team_a']} vs {game['team_b_logo']} {game['team_b']}</div>
+        <div class="game-time">📅 {game['date']} at {game['time']} • {game['league_name']}</div>
+        <div class="game-time">📍 {game['venue']} • 👨‍⚖️ {game['referee']}</div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    status = st.selectbox("Status", GAME_STATUSES, index=GAME_STATUSES.index(game['status']), key="edit_status")
+    col1, col2 = st.columns(2)
+    with col1:
+        score_a = st.number_input(f"{game['team_a']} score", min_value=0, step=1, value=game['score_a'], key="edit_score_a")
+    with col2:
+        score_b = st.number_input(f"{game['team_b']} score", min_value=0, step=1, value=game['score_b'], key="edit_score_b")
+    
+    if st.button("💾 Save", use_container_width=True, type="primary"):
+        try:
+            record = validate_game(dict(game, status=status, score_a=score_a, score_b=score_b))
+            if record.status == 'Final' and (record.score_a is None or record.score_b is None):
+                raise ValidationError("Enter both scores to mark the game Final")
+        except ValidationError as e:
+            st.error(str(e))
+        else:
+            repo.update_game(game['id'], status=record.status, score_a=record.score_a, score_b=record.score_b)
+            st.session_state.show_modal = {
+                'type': 'success',
+                'title': 'Game Updated',
+                'body': f"{game['team_a']} vs {game['team_b']} is now {record.status.lower()}"
+                        + (f" ({record.score_a} - {record.score_b})." if record.score_a is not None and record.score_b is not None else "."),
+                'buttons': [{'text': 'Close'}]
+            }
+            st.session_state.page = 'games'
+            st.rerun()
+    
+    if st.button("← Back to Games", use_container_width=True):
+        st.session_state.page = 'games'
+        st.rerun()
 
+@metrics.timed()
 def render_create_game():
     """Render create game screen"""
     st.markdown("### ➕ Create New Game")
     
     # Select league
-    league_names = [l['name'] for l in st.session_state.leagues]
-    selected_league_name = st.selectbox("League", league_names)
-    selected_league = next(l for l in st.session_state.leagues if l['name'] == selected_league_name)
+    snapshot = reference.snapshot()
+    selected_league_name = st.selectbox("League", snapshot.league_names())
+    selected_league = snapshot.league_by_name(selected_league_name)
     
     # Team selection
     team_names = [t['name'] for t in selected_league['teams']]
@@ -943,7 +1106,7 @@ def render_create_game():
     
     col1, col2 = st.columns(2)
     with col1:
-        referee = st.selectbox("Referee", st.session_state.referees)
+        referee = st.selectbox("Referee", snapshot.referees)
     with col2:
         stat_keeper = st.text_input("Stat Keeper (Optional)", placeholder="Enter name")
     
@@ -965,12 +1128,21 @@ def render_create_game():
             st.rerun()
         else:
             # Create game
-            create_game(
-                team_a, team_b,
-                str(game_date), str(game_time),
-                venue, referee,
-                selected_league['id'], selected_league['name']
-            )
+            try:
+                create_game(
+                    team_a, team_b,
+                    str(game_date), str(game_time),
+                    venue, referee,
+                    selected_league['id'], selected_league['name']
+                )
+            except ValidationError as e:
+                st.session_state.show_modal = {
+                    'type': 'error',
+                    'title': 'Invalid Game Details',
+                    'body': str(e),
+                    'buttons': [{'text': 'Close'}]
+                }
+                st.rerun()
             st.session_state.show_modal = {
                 'type': 'success',
                 'title': 'Game Created Successfully',
@@ -987,6 +1159,7 @@ def render_create_game():
         st.session_state.page = 'home'
         st.rerun()
 
+@metrics.timed()
 def render_create_league():
     """Render create league wizard"""
     st.markdown(f"### ➕ Create New League - Step {st.session_state.create_league_step}/12")
@@ -1075,14 +1248,18 @@ def render_create_league():
         if st.button("Complete League Creation", use_container_width=True, type="primary"):
             # Create league
             new_league = {
-                'id': len(st.session_state.leagues) + 1,
                 'name': st.session_state.league_data.get('name', 'New League'),
                 'format': st.session_state.league_data.get('format', '7v7'),
                 'start_date': st.session_state.league_data.get('start_date', str(datetime.now().date())),
                 'end_date': st.session_state.league_data.get('end_date', str(datetime.now().date() + timedelta(days=90))),
                 'teams': []
             }
-            st.session_state.leagues.append(new_league)
+            try:
+                league = validate_league(new_league)
+            except ValidationError as e:
+                st.error(str(e))
+                return
+            repo.add_league(league.to_dict())
             st.session_state.create_league_step = 1
             st.session_state.league_data = {}
             st.session_state.page = 'leagues'
@@ -1095,11 +1272,12 @@ def render_create_league():
             st.session_state.create_league_step -= 1
             st.rerun()
 
+@metrics.timed()
 def render_leagues():
     """Render leagues list"""
     st.markdown("### 🏆 All Leagues")
     
-    for league in st.session_state.leagues:
+    for league in reference.snapshot().leagues:
         st.markdown(f"""
         <div class="game-card">
             <div style="display: flex; justify-content: space-between; align-items: center;">
@@ -1121,7 +1299,174 @@ def render_leagues():
     if st.button("➕ Create New League", use_container_width=True, type="primary"):
         st.session_state.page = 'create_league'
         st.rerun()
+    if st.button("📦 Import / Export", use_container_width=True):
+        st.session_state.page = 'data_transfer'
+        st.rerun()
 
+@metrics.timed()
+def render_data_transfer():
+    """Render bulk import and export of leagues, teams and games"""
+    st.markdown("### 📦 Import / Export")
+    importers = {'Leagues': bulk_io.import_leagues, 'Teams': bulk_io.import_teams, 'Games': bulk_io.import_games}
+    exporters = {'Leagues': bulk_io.export_leagues, 'Teams': bulk_io.export_teams, 'Games': bulk_io.export_games}
+    
+    # Import
+    st.markdown("#### ⬆️ Import")
+    st.caption("Leagues: name, format, start_date, end_date, fee_type, fee_amount, venue, schedule_preferences, teams (comma-separated). "
+               "Teams: league_name, name, logo. Games: league_name, team_a, team_b, date, time, venue, referee, status, score_a, score_b.")
+    dataset = st.selectbox("Data", list(importers), key="import_dataset")
+    upload = st.file_uploader("CSV, JSON-lines or Parquet file", type=['csv', 'jsonl', 'ndjson', 'json', 'parquet'])
+    if upload is not None and st.button("⬆️ Import", use_container_width=True, type="primary"):
+        try:
+            with st.spinner(f"Importing {dataset.lower()}..."):
+                report = importers[dataset](repo, upload, bulk_io.detect_format(upload.name))
+        except ValidationError as e:
+            st.error(str(e))
+        else:
+            (st.success if report.imported else st.warning)(f"{dataset}: {report.summary()}.")
+            if report.errors:
+                with st.expander(f"Skipped rows ({len(report.errors)} shown)"):
+                    for error in report.errors:
+                        st.markdown(f"- {error}")
+    
+    # Export
+    st.markdown("#### ⬇️ Export")
+    col1, col2 = st.columns(2)
+    with col1:
+        export_dataset = st.selectbox("Data", list(exporters), key="export_dataset")
+    with col2:
+        fmt = st.selectbox("Format", list(bulk_io.MIME_TYPES), key="export_format")
+    if st.button("Prepare Download", use_container_width=True):
+        buffer = BytesIO()
+        try:
+            exporters[export_dataset](repo, buffer, fmt)
+        except ValidationError as e:
+            st.error(str(e))
+        else:
+            st.download_button(
+                f"⬇️ Download {export_dataset.lower()}.{fmt}",
+                data=buffer.getvalue(),
+                file_name=f"pffl_{export_dataset.lower()}.{fmt}",
+                mime=bulk_io.MIME_TYPES[fmt],
+                use_container_width=True
+            )
+    
+    if st.button("← Back to Leagues", use_container_width=True):
+        st.session_state.page = 'leagues'
+        st.rerun()
+
+@metrics.timed()
+def render_admin():
+    """Render the hidden timing page (?page=admin)"""
+    st.markdown("### ⏱️ Performance")
+    rows = metrics.summary()
+    if not rows:
+        st.info("No timings recorded yet.")
+    else:
+        st.caption(f"Percentiles over the last {metrics.window} calls of each span.")
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+    counters = metrics.counters()
+    if counters:
+        st.markdown("#### Counters")
+        st.dataframe([{'event': k, 'total': v} for k, v in sorted(counters.items())], hide_index=True, use_container_width=True)
+    cache_stats = get_response_cache().stats()
+    st.markdown("#### Response Cache")
+    st.dataframe([dict(cache_stats, hit_rate=f"{cache_stats['hit_rate']:.1%}")], hide_index=True, use_container_width=True)
+    if METRICS_PORT:
+        st.caption(f"OpenMetrics endpoint: http://127.0.0.1:{METRICS_PORT}/metrics")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("⬇️ metrics.txt", metrics.openmetrics(), file_name="metrics.txt",
+                           mime="application/openmetrics-text", use_container_width=True)
+    with col2:
+        if st.button("🔄 Reset Timings", use_container_width=True):
+            metrics.reset()
+            st.rerun()
+
+@metrics.timed()
+def render_league_detail():
+    """Render league details and the season schedule generator"""
+    snapshot = reference.snapshot()
+    league = snapshot.league(st.session_state.get('selected_league_id'))
+    if not league:
+        st.info("League not found.")
+        if st.button("← Back to Leagues", use_container_width=True):
+            st.session_state.page = 'leagues'
+            st.rerun()
+        return
+    
+    st.markdown(f"### 🏆 {league['name']}")
+    st.markdown(f"""
+    <div class="game-card">
+        <div class="game-time">Format: {league['format']} • {league['start_date']} to {league['end_date']}</div>
+        <div class="game-time">Teams: {len(league['teams'])} • Venue: {league.get('venue', 'TBD')} • Schedule: {league.get('schedule_preferences', 'Any day')}</div>
+        <div class="team-name" style="margin-top: 8px;">{' '.join(f"{t['logo'] or '🏈'} {t['name']}" for t in league['teams'])}</div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Standings from final scores
+    st.markdown("#### 📊 Standings")
+    table = repo.standings_table(league['id'])
+    if table['played'].sum() == 0:
+        st.info("No games have been played yet.")
+    else:
+        st.dataframe(
+            table.rename(columns={
+                'rank': '#', 'team': 'Team', 'played': 'GP', 'wins': 'W', 'losses': 'L', 'ties': 'T',
+                'points_for': 'PF', 'points_against': 'PA', 'differential': 'Diff', 'win_pct': 'Pct', 'streak': 'Streak'
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    # Season schedule generator
+    st.markdown("#### 📅 Generate Season Schedule")
+    default_venue = league.get('venue', '') if league.get('venue') != 'TBD' else ''
+    venues_text = st.text_input("Venues (comma-separated)", value=default_venue, placeholder="e.g. Desert Field, Valley Stadium")
+    col1, col2 = st.columns(2)
+    with col1:
+        preference = st.text_input("Schedule preference", value=league.get('schedule_preferences', 'Weekends'))
+    with col2:
+        rest_days = st.number_input("Rest days between games", min_value=0, max_value=14, value=1)
+    times_text = st.text_input("Kickoff times (comma-separated)", value=', '.join(default_slot_times(preference)))
+    double = st.checkbox("Double round-robin (home and away)")
+    
+    if st.button("📅 Generate Schedule", use_container_width=True, type="primary"):
+        try:
+            games, unscheduled = generate_season(
+                dict(league, schedule_preferences=preference),
+                snapshot.referees,
+                venues=[v.strip() for v in venues_text.split(',') if v.strip()],
+                slot_times=[t.strip() for t in times_text.split(',') if t.strip()],
+                rest_days=int(rest_days),
+                double=double,
+                is_booked=repo.is_booked,
+                meetings=repo.meetings(league['id'])
+            )
+            logos = {t['name']: t['logo'] for t in league['teams']}
+            records = []
+            for game in games:
+                record = validate_game(game)
+                record.team_a_logo = logos.get(record.team_a) or record.team_a_logo
+                record.team_b_logo = logos.get(record.team_b) or record.team_b_logo
+                records.append(record.to_dict())
+        except (SchedulingError, ValidationError) as e:
+            st.error(str(e))
+        else:
+            repo.add_games(records)
+            if records:
+                st.success(f"Scheduled {len(records)} games from {records[0]['date']} to {records[-1]['date']}.")
+            else:
+                st.info("Every matchup in this league is already scheduled.")
+            if unscheduled:
+                st.warning(f"{len(unscheduled)} matchups did not fit before {league['end_date']}. Add venues, kickoff times or days and generate again.")
+    
+    if st.button("← Back to Leagues", use_container_width=True):
+        st.session_state.page = 'leagues'
+        st.rerun()
+
+@metrics.timed()
 def render_ai_chat():
     """Render AI Chatbot interface with conversational league creation"""
     st.markdown("### 🤖 AI Chatbot")
@@ -1130,7 +1475,7 @@ def render_ai_chat():
     # Display chat history
     if st.session_state.chat_history:
         st.markdown("---")
-        for chat in st.session_state.chat_history[-10:]:  # Show last 10 messages
+        for chat in st.session_state.chat_history.recent(10):  # Show last 10 messages
             # User message
             with st.container():
                 st.markdown(f"**👤 You:** {chat['user']}")
@@ -1207,7 +1552,7 @@ def render_ai_chat():
                             </div>
                             <div style="margin-top: 12px; padding-top: 12px; border-top: 1px solid rgba(255,255,255,0.2);">
                                 <div style="font-size: 11px; color: #86efac; text-transform: uppercase; margin-bottom: 6px;">Teams</div>
-                                <div style="font-size: 13px; color: #ffffff;">{', '.join([t['name'] if isinstance(t, dict) else t for t in item['data']['teams']])}</div>
+                                <div style="font-size: 13px; color: #ffffff;">{', '.join(t['name'] for t in item['data']['teams'])}</div>
                             </div>
                         </div>
                         """, unsafe_allow_html=True)
@@ -1240,9 +1585,38 @@ def render_ai_chat():
                             </div>
                         </div>
                         """, unsafe_allow_html=True)
+                    elif item['type'] == 'games':
+                        rows = ''.join(
+                            f"<div style='font-size: 14px; color: #ffffff; margin: 4px 0;'>{g['team_a']} <span style='color: #93c5fd;'>vs</span> {g['team_b']} "
+                            f"<span style='color: #bfdbfe;'>• {g['date']} at {g['time']} • {g['venue']} • {g['referee']}</span></div>"
+                            for g in item['data']
+                        )
+                        st.markdown(f"""
+                        <div style="background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%); padding: 20px; border-radius: 12px; margin: 12px 0; border: 2px solid #60a5fa;">
+                            <div style="font-size: 18px; font-weight: 700; color: #ffffff; margin-bottom: 12px;">🏈 {len(item['data'])} Games Scheduled Successfully!</div>
+                            {rows}
+                        </div>
+                        """, unsafe_allow_html=True)
+                    if item.get('failures'):
+                        st.warning("Not scheduled:\n" + "\n".join(
+                            f"- #{f['index']} {f['game']}: {f['reason']}" for f in item['failures']
+                        ))
         
         st.markdown("---")
     
+    # Fall back to the manual flows while the model is failing
+    if get_model_client().breaker.is_open:
+        st.warning("The AI model is not responding right now. Use the forms below in the meantime.")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("➕ Create League Manually", use_container_width=True):
+                st.session_state.page = 'create_league'
+                st.rerun()
+        with col2:
+            if st.button("📅 Schedule Game Manually", use_container_width=True):
+                st.session_state.page = 'create_game'
+                st.rerun()
+    
     # Input area
     col1, col2 = st.columns([4, 1])
     with col1:
@@ -1268,102 +1642,114 @@ def render_ai_chat():
             send_button = True
     with col3:
         if st.button("🔄 Reset Chat", use_container_width=True):
-            st.session_state.chat_history = []
+            st.session_state.chat_history.clear()
             st.session_state.chatbot_state = {}
-            st.session_state.ai_response = None
             st.rerun()
     
     # Process message
     if send_button and user_input:
-        # Add user message to history
-        st.session_state.chat_history.append({"user": user_input})
+        turn = {"user": user_input}
+        st.markdown(f"**👤 You:** {user_input}")
+        
+        # Stream the AI response into place as it arrives
+        placeholder = st.empty()
         
-        # Get AI response
-        response = get_ai_response(user_input)
+        def show_partial(fields, done):
+            text = f"🤖 **{fields['title']}**" if 'title' in done else "🤖 ..."
+            if fields.get('body'):
+                text += f"\n\n{fields['body']}"
+            placeholder.markdown(text)
         
-        # Add AI response to history
-        st.session_state.chat_history[-1]["ai"] = response
-        st.session_state.ai_response = response
+        response = get_ai_response(user_input, on_partial=show_partial)
+        
+        # Reject malformed actions before anything is written
+        try:
+            action = validate_action(response)
+        except ValidationError as e:
+            response = {
+                "action": "error",
+                "title": "Invalid Response",
+                "body": f"I couldn't use that reply ({e}). Could you try rephrasing your request?",
+                "speak": "Sorry, something was off. Can you try again?"
+            }
+            action = None
+        
+        turn["ai"] = response
         
         # Handle different actions
-        if response.get('action') == 'create_league':
-            # Extract league data and create league
-            league_data = response.get('data', {})
+        if action and action.action == 'create_league':
+            league = action.data
             
-            # Parse team names if they're in a string format
-            teams = league_data.get('teams', [])
-            if isinstance(teams, str):
-                teams = [t.strip() for t in teams.split(',')]
-            
-            # Create team objects with emojis
-            team_objects = []
+            # Give teams without a logo an emoji
             team_emojis = ['🔥', '⚡', '🌟', '💪', '🏆', '⭐', '🎯', '🚀', '💎', '👑', '🦅', '🐉']
-            for idx, team_name in enumerate(teams):
-                if isinstance(team_name, dict):
-                    team_objects.append(team_name)
-                else:
-                    team_objects.append({
-                        'id': idx + 1,
-                        'name': team_name,
-                        'logo': team_emojis[idx % len(team_emojis)]
-                    })
-            
-            # Create the league
-            new_league = {
-                'id': len(st.session_state.leagues) + 1,
-                'name': league_data.get('name', 'New League'),
-                'format': league_data.get('format', '7v7'),
-                'start_date': league_data.get('start_date', str(datetime.now().date())),
-                'end_date': league_data.get('end_date', str(datetime.now().date() + timedelta(days=90))),
-                'teams': team_objects,
-                'fee_type': league_data.get('fee_type', 'captain'),
-                'fee_amount': league_data.get('fee_amount', 0),
-                'venue': league_data.get('venue', 'TBD'),
-                'schedule_preferences': league_data.get('schedule_preferences', 'Weekends')
-            }
-            
-            st.session_state.leagues.append(new_league)
-            
-            # Add created item to chat history for display
-            st.session_state.chat_history[-1]['created_item'] = {
-                'type': 'league',
-                'data': new_league
-            }
+            for idx, team in enumerate(league.teams):
+                if not team.logo:
+                    team.logo = team_emojis[idx % len(team_emojis)]
             
-            # Reset chatbot state
-            st.session_state.chatbot_state = {}
+            try:
+                check_league(reference.snapshot(), league)
+            except ValidationError as e:
+                turn["ai"] = {
+                    "action": "error",
+                    "title": "Oops!",
+                    "body": str(e),
+                    "speak": "Please try a different name"
+                }
+            else:
+                # Create the league
+                new_league = repo.add_league(league.to_dict())
+                
+                # Attach created item to the turn for display
+                turn['created_item'] = {
+                    'type': 'league',
+                    'data': new_league
+                }
+                
+                # Reset chatbot state
+                st.session_state.chatbot_state = {}
             
-        elif response.get('action') == 'create_game':
-            # Extract game data and create game
-            game_data = response.get('data', {})
+        elif action and action.action == 'create_game':
+            game = action.data
             
-            # Find league
-            league_name = game_data.get('league_name')
-            league = next((l for l in st.session_state.leagues if l['name'] == league_name), None)
+            try:
+                check_game(repo, reference.snapshot(), game)
+                new_game = repo.add_game(game.to_dict())
+            except ValidationError as e:
+                turn["ai"] = {
+                    "action": "error",
+                    "title": "Couldn't Schedule That Game",
+                    "body": str(e),
+                    "speak": "I couldn't schedule that game. Check the details and try again."
+                }
+            else:
+                # Attach created item to the turn for display
+                turn['created_item'] = {
+                    'type': 'game',
+                    'data': new_game
+                }
             
-            if league:
-                # Check for duplicates
-                if not check_duplicate_game(game_data['team_a'], game_data['team_b'], league['id']):
-                    new_game = create_game(
-                        game_data['team_a'],
-                        game_data['team_b'],
-                        game_data['date'],
-                        game_data['time'],
-                        game_data.get('venue', 'TBD'),
-                        game_data.get('referee', st.session_state.referees[0]),
-                        league['id'],
-                        league['name']
-                    )
-                    
-                    # Add created item to chat history for display
-                    st.session_state.chat_history[-1]['created_item'] = {
-                        'type': 'game',
-                        'data': game_data
-                    }
+        elif action and action.action == 'create_games':
+            new_games, failures = create_games(action.data)
+            if new_games:
+                turn['created_item'] = {
+                    'type': 'games',
+                    'data': new_games,
+                    'failures': failures
+                }
+            else:
+                turn["ai"] = {
+                    "action": "error",
+                    "title": "Couldn't Schedule Those Games",
+                    "body": " ".join(f"#{f['index']} {f['game']}: {f['reason']}" for f in failures),
+                    "speak": "None of those games could be scheduled."
+                }
         
+        # Add the finished turn to history
+        st.session_state.chat_history.add(turn)
         st.rerun()
 
 # Main app
+@metrics.timed('rerun')
 def main():
     render_header()
     
@@ -1388,10 +1774,18 @@ def main():
         render_games()
     elif st.session_state.page == 'create_game':
         render_create_game()
+    elif st.session_state.page == 'edit_game':
+        render_edit_game()
     elif st.session_state.page == 'create_league':
         render_create_league()
     elif st.session_state.page == 'leagues':
         render_leagues()
+    elif st.session_state.page == 'league_detail':
+        render_league_detail()
+    elif st.session_state.page == 'data_transfer':
+        render_data_transfer()
+    elif st.session_state.page == 'admin':
+        render_admin()
     elif st.session_state.page == 'users':
         st.markdown("### 👥 Users")
         st.info("User management coming soon!")
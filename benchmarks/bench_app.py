@@ -0,0 +1,263 @@
+"""Load test the app flows through Streamlit's AppTest against a fake Gemini model
+
+For each database size (10 to 10,000 synthetic games) and session count,
+N live sessions take turns running the same cycle. The cycle covers the
+home page, the games list, Create Game (check_duplicate_game + create_game)
+and one chatbot turn (get_ai_response). The fake model sleeps for --latency
+seconds and returns a malformed reply at --malformed rate. The script
+reports rerun latency per flow, reruns/s and memory per session.
+
+AppTest keeps process-global runtime state and cannot run scripts from
+several threads at once, so sessions are interleaved round-robin. Each
+session keeps its own session_state and chat history, and all of them share
+the app's cached repository, reference cache and model client, as
+they would on one server.
+
+    python benchmarks/bench_app.py [--games 10,1000,10000] [--sessions 1,8] [--turns 4]
+                                   [--latency 0.05] [--malformed 0.1]
+                                   [--save baseline.json | --check baseline.json [--tolerance 0.5]]
+
+--save writes the p95 per flow; --check exits 1 if any p95 is more than
+`tolerance` slower than the saved baseline.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+warnings.filterwarnings("ignore")
+
+import google.generativeai as genai
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import storage
+from instrumentation import metrics
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+TEAMS = 12
+BENCH_LEAGUE = 'Bench Open'
+MESSAGES = [
+    "how many games are there?",                    # answered locally
+    "any tips for keeping a tournament on time?",   # model show_info
+    "please set up a game in Bench Open for me",    # model create_game
+]
+
+
+class FakeChunk:
+    def __init__(self, text, usage=None):
+        self.text = text
+        self.usage_metadata = usage
+
+
+class FakeUsage:
+    def __init__(self, prompt, completion):
+        self.prompt_token_count = prompt
+        self.candidates_token_count = completion
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel: fixed latency, some malformed replies"""
+    latency = 0.05
+    malformed = 0.1
+    _rng = random.Random(7)
+    _lock = threading.Lock()
+    _created = 0
+    malformed_sent = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @classmethod
+    def _reply(cls, prompt):
+        message = prompt.rsplit("USER MESSAGE:", 1)[-1].lower()
+        with cls._lock:
+            if cls._rng.random() < cls.malformed:
+                cls.malformed_sent += 1
+                return cls._rng.choice(['{"action": "show_info", "title": "Leag',
+                                        'Sure! Here is what I found about your leagues.'])
+            cls._created += 1
+            serial = cls._created
+        if 'set up a game' in message:
+            home, away = serial % TEAMS, (serial * 5 + 1) % TEAMS
+            if home == away:
+                away = (away + 1) % TEAMS
+            return json.dumps({"action": "create_game", "title": "Game Scheduled!", "body": "Done", "data": {
+                "league_name": BENCH_LEAGUE, "team_a": f"Open {home}", "team_b": f"Open {away}",
+                "date": str(date(2040, 1, 1) + timedelta(days=serial)), "time": "10:00",
+                "venue": f"AI Field {serial}", "referee": "John Carter"}})
+        return json.dumps({"action": "show_info", "title": "Tips", "body": "Keep kickoffs staggered by 90 minutes."})
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        time.sleep(self.latency)
+        reply = self._reply(prompt)
+        usage = FakeUsage(len(prompt) // 4, len(reply) // 4)
+        if not stream:
+            return FakeChunk(reply, usage)
+        parts = [reply[i:i + 40] for i in range(0, len(reply), 40)] or ['']
+        return [FakeChunk(part, usage if i == len(parts) - 1 else None) for i, part in enumerate(parts)]
+
+
+def build_database(path, games):
+    """Leagues of TEAMS teams with `games` conflict-free games, plus an empty league for new bookings"""
+    repo = storage.LeagueRepository(path)
+    leagues = max(1, games // 1000)
+    for n in range(leagues):
+        repo.add_league({'name': f'League {n}', 'format': '7v7', 'start_date': '2030-01-01', 'end_date': '2035-12-31',
+                         'teams': [{'id': t + 1, 'name': f'Team {n}-{t}', 'logo': '🏈'} for t in range(TEAMS)]})
+    repo.add_league({'name': BENCH_LEAGUE, 'format': '5v5', 'start_date': '2030-01-01', 'end_date': '2045-12-31',
+                     'teams': [{'id': t + 1, 'name': f'Open {t}', 'logo': None} for t in range(TEAMS)]})
+    statuses = ['Scheduled', 'Final', 'In Progress']
+    batch = []
+    for idx in range(games):
+        league = idx % leagues
+        home = idx % TEAMS
+        away = (home + 1 + idx // TEAMS % (TEAMS - 1)) % TEAMS
+        status = statuses[idx % 3]
+        batch.append({
+            'league_id': league + 1, 'league_name': f'League {league}',
+            'team_a': f'Team {league}-{home}', 'team_b': f'Team {league}-{away}',
+            'date': str(date(2030, 1, 1) + timedelta(days=idx // 40)), 'time': f'{8 + idx % 4 * 3:02d}:00',
+            'venue': f'Field {idx % 10}', 'referee': f'Ref {idx % 10}', 'status': status,
+            'score_a': idx % 30 if status == 'Final' else None, 'score_b': idx % 17 if status == 'Final' else None,
+            'team_a_logo': '🏈', 'team_b_logo': '🏈',
+        })
+    repo.add_games(batch)
+    repo.close()
+
+
+def open_app(games_db):
+    """Point the app's cached repository at `games_db` and reset shared caches"""
+    storage.DB_PATH = games_db
+    st.cache_resource.clear()
+    metrics.reset()
+
+
+def new_session(page='home'):
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state['page'] = page
+    at.run()
+    return at
+
+
+def timed_run(samples, flow, action):
+    started = time.perf_counter()
+    at = action()
+    samples.setdefault(flow, []).append(time.perf_counter() - started)
+    if at.exception:
+        raise RuntimeError(f"{flow}: {at.exception[0].message}")
+    return at
+
+
+def goto(at, page):
+    at.session_state['page'] = page
+    at.session_state['show_modal'] = None
+    return at.run
+
+
+def session_cycle(at, session, turn, samples):
+    """One pass over every flow in a live session"""
+    timed_run(samples, 'home', goto(at, 'home'))
+    timed_run(samples, 'games', goto(at, 'games'))
+
+    goto(at, 'create_game')()
+    at.selectbox[0].set_value(BENCH_LEAGUE).run()
+    at.selectbox(key='team_a').set_value(f'Open {(session + turn) % TEAMS}')
+    at.date_input[0].set_value(date(2046, 1, 1) + timedelta(days=session * 1000 + turn))
+    at.text_input[0].input(f'Bench Field {session}-{turn}')
+    timed_run(samples, 'create_game', at.button[0].click().run)
+
+    goto(at, 'settings')()
+    at.text_input(key='chat_input').input(MESSAGES[(session + turn) % len(MESSAGES)])
+    timed_run(samples, 'ai_chat', [b for b in at.button if b.label.startswith('Send')][0].click().run)
+
+
+def run_load(sessions, turns):
+    samples = {}
+    live = [new_session() for _ in range(sessions)]
+    started = time.perf_counter()
+    for turn in range(turns):
+        for session, at in enumerate(live):
+            session_cycle(at, session, turn, samples)
+    return samples, time.perf_counter() - started
+
+
+def memory_per_session(count=10):
+    """KB retained per idle session that has rendered the home page once"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [new_session('home') for _ in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / count / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--games', default='10,1000,10000')
+    parser.add_argument('--sessions', default='1,8')
+    parser.add_argument('--turns', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--malformed', type=float, default=0.1)
+    parser.add_argument('--save')
+    parser.add_argument('--check')
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    args = parser.parse_args()
+
+    # Silence Streamlit's bare-mode and empty-label warnings
+    logging.disable(logging.WARNING)
+    FakeModel.latency = args.latency
+    FakeModel.malformed = args.malformed
+    genai.GenerativeModel = FakeModel
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for games in (int(g) for g in args.games.split(',')):
+            path = os.path.join(tmp, f'bench-{games}.db')
+            build_database(path, games)
+            open_app(path)
+            new_session()  # load the repository before measuring sessions
+            per_session = memory_per_session()
+            for sessions in (int(s) for s in args.sessions.split(',')):
+                samples, elapsed = run_load(sessions, args.turns)
+                reruns = sum(len(v) for v in samples.values())
+                print(f"{games:>6} games, {sessions:>3} sessions: {reruns / elapsed:6.1f} reruns/s, "
+                      f"{per_session:6.0f} KB/session")
+                for flow, values in samples.items():
+                    p50, p95, p99 = np.quantile(values, (0.5, 0.95, 0.99)) * 1000
+                    results[f'{games}/{sessions}/{flow}'] = round(p95, 2)
+                    print(f"    {flow:<12} p50 {p50:7.1f} ms | p95 {p95:7.1f} ms | p99 {p99:7.1f} ms")
+            slowest = metrics.summary()[:5]
+            print("    most total time (p95): " + ", ".join(f"{row['span']} {row['p95_ms']} ms" for row in slowest))
+    print(f"fake model: {FakeModel.malformed_sent} malformed replies sent")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.check:
+        with open(args.check) as f:
+            baseline = json.load(f)
+        slower = {k: (baseline[k], v) for k, v in results.items()
+                  if k in baseline and v > baseline[k] * (1 + args.tolerance)}
+        for key, (before, after) in sorted(slower.items()):
+            print(f"REGRESSION {key}: p95 {before} ms -> {after} ms")
+        sys.exit(1 if slower else 0)
+
+
+if __name__ == '__main__':
+    main()
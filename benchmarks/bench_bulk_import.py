@@ -0,0 +1,91 @@
+"""Time a 100k-row game history import and export through bulk_io
+
+Writes a synthetic CSV/JSON-lines/Parquet history to a temp directory, imports
+it into a fresh database and reports rows/s and peak resident memory.
+
+    python benchmarks/bench_bulk_import.py [rows]
+"""
+import io
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import bulk_io
+from storage import LeagueRepository
+
+LEAGUES = 20
+TEAMS = 20
+VENUES = 50
+SLOTS = ['08:00', '09:30', '11:00', '12:30', '14:00', '15:30', '17:00', '18:30']
+
+
+def make_history(rows):
+    """Conflict-free games: every venue/referee gets one game per slot per day"""
+    idx = pd.RangeIndex(rows)
+    resource_idx = idx % VENUES
+    slot = (idx // VENUES) % len(SLOTS)
+    day = pd.Timestamp('2015-01-01') + pd.to_timedelta(idx // (VENUES * len(SLOTS)), unit='D')
+    league = idx % LEAGUES
+    home = (idx // LEAGUES) % TEAMS
+    away = (home + 1 + (idx // (LEAGUES * TEAMS)) % (TEAMS - 1)) % TEAMS
+    return pd.DataFrame({
+        'league_name': [f'League {n}' for n in league],
+        'team_a': [f'Team {n}' for n in home],
+        'team_b': [f'Team {n}' for n in away],
+        'date': day.strftime('%Y-%m-%d'),
+        'time': [SLOTS[n] for n in slot],
+        'venue': [f'Field {n}' for n in resource_idx],
+        'referee': [f'Ref {n}' for n in resource_idx],
+        'status': 'Final',
+        'score_a': idx % 35,
+        'score_b': (idx * 7) % 31,
+    })
+
+
+def fresh_repo(path):
+    repo = LeagueRepository(path)
+    for n in range(LEAGUES):
+        repo.add_league({'name': f'League {n}', 'format': '7v7', 'start_date': '2015-01-01',
+                         'end_date': '2030-01-01', 'teams': [{'id': t + 1, 'name': f'Team {t}', 'logo': None}
+                                                             for t in range(TEAMS)]})
+    return repo
+
+
+def peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    history = make_history(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        files = {'csv': os.path.join(tmp, 'games.csv'), 'jsonl': os.path.join(tmp, 'games.jsonl'),
+                 'parquet': os.path.join(tmp, 'games.parquet')}
+        history.to_csv(files['csv'], index=False)
+        history.to_json(files['jsonl'], orient='records', lines=True)
+        history.to_parquet(files['parquet'], index=False)
+        del history
+        print(f"{rows} rows, baseline peak RSS {peak_mb():.0f} MB")
+        for fmt, path in files.items():
+            repo = fresh_repo(os.path.join(tmp, f'{fmt}.db'))
+            started = time.perf_counter()
+            report = bulk_io.import_games(repo, path, fmt)
+            elapsed = time.perf_counter() - started
+            print(f"  import {fmt:>7}: {report.summary()}, {elapsed:.2f}s "
+                  f"({rows / elapsed:,.0f} rows/s), peak RSS {peak_mb():.0f} MB")
+            started = time.perf_counter()
+            out = io.BytesIO() if fmt == 'parquet' else open(os.devnull, 'wb')
+            with out:
+                bulk_io.export_games(repo, out, fmt)
+            print(f"  export {fmt:>7}: {time.perf_counter() - started:.2f}s")
+            repo.close()
+
+
+if __name__ == '__main__':
+    main()
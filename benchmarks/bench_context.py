@@ -0,0 +1,66 @@
+"""Prompt context size: the old pretty-printed full dump vs the compact builder
+
+    python benchmarks/bench_context.py
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_history import ChatHistory, estimate_tokens
+from context_builder import build_context, encode
+from entity_index import EntityIndex
+
+REFEREES = [f'Referee {n}' for n in range(12)]
+MESSAGE = "Can you schedule Team 3-1 vs Team 3-4 in the Valley 3 league next Saturday?"
+
+
+def make_leagues(count):
+    return [{'name': f'Valley {n} Flag League', 'format': '7v7',
+             'teams': [{'name': f'Team {n}-{t}', 'logo': None} for t in range(10)]} for n in range(count)]
+
+
+def make_history():
+    history = ChatHistory()
+    for n in range(6):
+        history.add({'user': f"What about the games on week {n}?",
+                     'ai': {'action': 'show_info', 'title': f'Week {n}', 'body': 'There are several games. ' * 12}})
+    return history
+
+
+def old_context(leagues, stats, history):
+    return json.dumps({
+        "leagues": [{"name": l['name'], "format": l['format'], "teams": len(l['teams'])} for l in leagues],
+        "referees": REFEREES,
+        "total_games": stats['games'],
+        "games_by_status": stats['games_by_status'],
+        "conversation_state": {},
+        "chat_history": history.context(800),
+    }, indent=2)
+
+
+def main():
+    stats = {'games': 420, 'games_by_status': {'Scheduled': 300, 'Final': 100, 'In Progress': 20}}
+    history = make_history()
+    for count in (5, 50, 500):
+        leagues = make_leagues(count)
+        before = estimate_tokens(old_context(leagues, stats, history))
+        index = EntityIndex()
+        for league in leagues:
+            index.add_league(league)
+        for search, label in ((None, 'name scan'), (index.search, 'trigram index')):
+            started = time.perf_counter()
+            for _ in range(100):
+                context, tokens = build_context(MESSAGE, leagues, REFEREES, stats, history=history,
+                                                token_budget=1500, history_budget=800, search=search)
+            build_ms = (time.perf_counter() - started) * 10
+            print(f"{count:>4} leagues, {label:<13}: full dump ~{before:6} tokens | compact ~{tokens:5} tokens "
+                  f"({before / tokens:4.1f}x smaller), leagues in full: {[l[0] for l in context.get('lg', [])]}, "
+                  f"build {build_ms:.2f} ms")
+    print("compact sample:", encode(build_context(MESSAGE, make_leagues(5), REFEREES, stats, token_budget=300)[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Entity retrieval at scale: build, query and incremental-update latency, and recall
+
+    python benchmarks/bench_entity_index.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from entity_index import EntityIndex
+
+WORDS = ['Desert', 'Valley', 'Canyon', 'Mesa', 'Sun', 'Cactus', 'Storm', 'Rocks', 'Vipers', 'Hawks', 'Coyotes',
+         'Scorpions', 'Thunder', 'Dust', 'Mirage', 'Saguaro', 'Falcons', 'Rattlers', 'Phoenix', 'Copper']
+
+
+def make_names(rng, count, suffix):
+    names = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(WORDS)} {rng.choice(WORDS)} {suffix}{rng.randint(1, 999)}")
+    return sorted(names)
+
+
+def typo(rng, name):
+    """Swap two adjacent letters in one alphabetic word"""
+    words = name.split()
+    idx = rng.choice([n for n, word in enumerate(words) if word.isalpha()])
+    word = words[idx]
+    if len(word) > 3:
+        pos = rng.randrange(1, len(word) - 2)
+        words[idx] = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+    return ' '.join(words)
+
+
+def main():
+    rng = random.Random(7)
+    for leagues in (10, 100, 1000):
+        league_names = make_names(rng, leagues, 'League ')
+        team_names = make_names(rng, leagues * 10, 'FC')
+        venues = make_names(rng, max(5, leagues // 2), 'Field ')
+        referees = [f"Ref {first} {last}" for first, last in zip(make_names(rng, 200, 'R'), range(200))]
+
+        index = EntityIndex()
+        started = time.perf_counter()
+        for n, name in enumerate(league_names):
+            index.add_league({'name': name, 'teams': [{'name': t} for t in team_names[n * 10:(n + 1) * 10]]})
+        for name in venues:
+            index.add('venue', name)
+        for name in referees:
+            index.add('referee', name)
+        index.search('warm up')
+        build_ms = (time.perf_counter() - started) * 1000
+
+        found = 0
+        timings = []
+        for _ in range(300):
+            team_a, team_b = rng.sample(team_names, 2)
+            message = f"Schedule {typo(rng, team_a)} vs {team_b} at {rng.choice(venues)} next Saturday at 10am"
+            started = time.perf_counter()
+            hits = index.search(message)
+            timings.append(time.perf_counter() - started)
+            names = {h.name for h in hits}
+            found += (team_a in names) + (team_b in names)
+        p50, p95 = np.quantile(timings, (0.5, 0.95)) * 1000
+
+        started = time.perf_counter()
+        index.add('team', 'Brand New Squad', league_names[0])
+        hit = index.search('book the brand new squad')[0]
+        update_ms = (time.perf_counter() - started) * 1000
+        print(f"{leagues:>5} leagues / {len(index):>6} entities: build {build_ms:7.1f} ms | query p50 {p50:5.2f} ms "
+              f"p95 {p95:5.2f} ms | team recall {found / 600:.1%} (one name misspelt) | "
+              f"add + query {update_ms:5.2f} ms -> {hit.name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark JSON extraction over a corpus of malformed Gemini replies
+
+Compares extract_json_object with the old markdown/regex cleanup that used
+to live in get_ai_response. Run from the repo root:
+
+    python benchmarks/bench_json_extract.py
+"""
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_parser import extract_json_object
+
+GAME = {
+    "action": "create_game",
+    "title": "Game Scheduled! ⚡",
+    "body": "Game between Firebirds and Storm is set for Sunday!",
+    "speak": "Game scheduled successfully!",
+    "data": {"league_name": "Phoenix Winter 2025", "team_a": "Phoenix Firebirds", "team_b": "Desert Storm",
+             "date": "2025-01-20", "time": "10:00", "venue": "Phoenix Sports Complex", "referee": "John Carter"}
+}
+QUESTION = {
+    "action": "ask_question",
+    "title": "Step 9: Teams",
+    "body": "List your teams separated by commas, e.g. {Hawks}, {Owls}.",
+    "current_step": 9,
+    "total_steps": 12,
+    "conversation_state": {"format": "7v7", "name": "Spring Cup", "teams": None}
+}
+LONG_INFO = {
+    "action": "show_info",
+    "title": "Current Leagues",
+    "body": " ".join(f"League {i} (7v7) has 12 teams." for i in range(400))
+}
+
+# Reply shapes seen from the model: clean, fenced, chatty, doubled, braces in prose
+CORPUS = [
+    json.dumps(GAME),
+    "```json\n" + json.dumps(GAME, indent=2) + "\n```",
+    "```\n" + json.dumps(QUESTION, indent=2) + "\n```\nLet me know!",
+    "Sure! Here is the response:\n" + json.dumps(QUESTION),
+    "Here you go {as requested}:\n" + json.dumps(GAME) + "\nHope that helps {:",
+    json.dumps(QUESTION) + "\n" + json.dumps(GAME),
+    '{"note": "draft"}\n' + json.dumps(GAME),
+    "I can't format that right now.",
+    json.dumps(LONG_INFO),
+    "```json\n" + json.dumps(LONG_INFO) + "\n```\n{trailing}",
+]
+
+
+def legacy_extract(response_text):
+    """The cleanup get_ai_response used before extract_json_object"""
+    response_text = response_text.strip()
+    if response_text.startswith('```'):
+        lines = response_text.split('\n')
+        start_idx = 0
+        end_idx = len(lines) - 1
+        for i, line in enumerate(lines):
+            if line.strip().startswith('{'):
+                start_idx = i
+                break
+        for i in range(len(lines) - 1, -1, -1):
+            if lines[i].strip().endswith('}'):
+                end_idx = i
+                break
+        response_text = '\n'.join(lines[start_idx:end_idx + 1])
+    if not response_text.startswith('{'):
+        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+        if not json_match:
+            return None
+        response_text = json_match.group(0)
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        return None
+
+
+def main():
+    number = 2000
+    for name, func in (('legacy', legacy_extract), ('extract_json_object', extract_json_object)):
+        parsed = sum(1 for reply in CORPUS if isinstance(func(reply), dict) and 'action' in func(reply))
+        seconds = timeit.timeit(lambda: [func(reply) for reply in CORPUS], number=number)
+        per_reply = seconds / (number * len(CORPUS)) * 1e6
+        print(f"{name:>20}: {parsed}/{len(CORPUS)} replies parsed, {per_reply:.1f} us/reply")
+
+
+if __name__ == '__main__':
+    main()
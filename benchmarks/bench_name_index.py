@@ -0,0 +1,99 @@
+"""League and team name resolution: the old exact-match scan vs the folded, fuzzy NameIndex
+
+For 10 to 1000 leagues, the names the model writes are simulated as exact,
+re-cased/punctuated, shortened, misspelt or padded with "League". For each
+variant the script reports how many resolve to the right league or team,
+how many resolve to a wrong one and the lookup latency, plus the cost of
+building the league index on first use.
+
+    python benchmarks/bench_name_index.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from reference_data import ReferenceSnapshot
+
+WORDS = ['Desert', 'Valley', 'Canyon', 'Mesa', 'Sun', 'Cactus', 'Storm', 'Rocks', 'Vipers', 'Hawks', 'Coyotes',
+         'Scorpions', 'Thunder', 'Dust', 'Mirage', 'Saguaro', 'Falcons', 'Rattlers', 'Phoenix', 'Copper']
+TEAMS = 10
+
+
+def make_names(rng, count, suffix):
+    names = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(WORDS)} {rng.choice(WORDS)} {suffix}{rng.randint(1, 999)}")
+    return sorted(names)
+
+
+def typo(rng, name):
+    """Swap two adjacent letters in the longest word"""
+    words = name.split()
+    idx = max(range(len(words)), key=lambda n: len(words[n]) if words[n].isalpha() else 0)
+    word = words[idx]
+    pos = rng.randrange(1, len(word) - 2)
+    words[idx] = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+    return ' '.join(words)
+
+
+VARIANTS = {
+    'exact': lambda rng, name: name,
+    'folded': lambda rng, name: name.upper().replace(' ', ', ', 1),
+    'shortened': lambda rng, name: name.split(' ', 1)[1],
+    'misspelt': typo,
+    'padded': lambda rng, name: f"The {name} League",
+}
+
+
+def scan(leagues, name):
+    """The chat page's old lookup"""
+    return next((l for l in leagues if l['name'] == name), None)
+
+
+def main():
+    rng = random.Random(7)
+    for count in (10, 100, 1000):
+        names = make_names(rng, count, 'Winter ')
+        team_names = make_names(rng, count * TEAMS, 'FC')
+        leagues = [{'id': n + 1, 'name': name, 'format': '7v7',
+                    'teams': [{'id': t + 1, 'name': team_names[n * TEAMS + t], 'logo': '🏈'} for t in range(TEAMS)]}
+                   for n, name in enumerate(names)]
+        snapshot = ReferenceSnapshot.build(1, leagues, ['Ref'])
+        started = time.perf_counter()
+        snapshot.resolve_league('warm up')
+        build_ms = (time.perf_counter() - started) * 1000
+        print(f"{count:>5} leagues / {count * TEAMS:>6} teams: league index built in {build_ms:6.2f} ms")
+
+        for variant, spell in VARIANTS.items():
+            picks = [rng.choice(leagues) for _ in range(300)]
+            queries = [(league, spell(rng, league['name']), rng.choice(league['teams'])) for league in picks]
+            results = {'scan': [0, 0, []], 'index': [0, 0, []]}
+            for league, query, team in queries:
+                started = time.perf_counter()
+                found = scan(leagues, query)
+                results['scan'][2].append(time.perf_counter() - started)
+                results['scan'][0] += found is league
+                started = time.perf_counter()
+                found = snapshot.resolve_league(query)
+                results['index'][2].append(time.perf_counter() - started)
+                results['index'][0] += found is not None and found['id'] == league['id']
+                results['index'][1] += found is not None and found['id'] != league['id']
+            line = []
+            for method, (right, wrong, times) in results.items():
+                p50 = np.quantile(times, 0.5) * 1e6
+                line.append(f"{method} {right / len(queries):6.1%} right {wrong:>3} wrong {p50:7.1f} us")
+            # Team names here are two words and a number, too short to shorten
+            if variant != 'shortened':
+                found = [snapshot.resolve_team(league['id'], spell(rng, team['name'])) for league, _, team in queries]
+                right = sum(f is not None and f['id'] == team['id'] for f, (_, _, team) in zip(found, queries))
+                line.append(f"teams {right / len(queries):6.1%} right")
+            print(f"    {variant:<10} " + " | ".join(line))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compare memory per game for slotted Game records against plain dicts
+
+    python benchmarks/bench_records.py
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import validate_game
+
+COUNT = 50_000
+
+
+def make_rows():
+    return [{
+        'id': i,
+        'league_id': 1,
+        'league_name': 'Phoenix Winter 2025',
+        'team_a': f'Team {i % 50}',
+        'team_a_logo': '🔥',
+        'team_b': f'Team {(i + 1) % 50}',
+        'team_b_logo': '⛈️',
+        'date': '2025-01-20',
+        'time': '10:00',
+        'venue': 'Phoenix Sports Complex',
+        'referee': 'John Carter',
+        'status': 'Scheduled',
+        'score_a': None,
+        'score_b': None
+    } for i in range(COUNT)]
+
+
+def measure(build):
+    tracemalloc.start()
+    records = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return size / COUNT
+
+
+def main():
+    rows = make_rows()
+    dict_bytes = measure(lambda: [dict(row) for row in rows])
+    record_bytes = measure(lambda: [validate_game(row) for row in rows])
+    print(f"dict:   {dict_bytes:.0f} bytes/game")
+    print(f"Game:   {record_bytes:.0f} bytes/game ({record_bytes / dict_bytes:.0%} of dict)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Time round-robin season generation for large leagues
+
+    python benchmarks/bench_scheduler.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import generate_season
+
+REFEREES = ['John Carter', 'Anthony Brooks', 'Sarah Williams', 'Mike Johnson',
+            'Dana Lee', 'Chris Patel', 'Morgan Diaz', 'Sam Rivera']
+VENUES = [f'Field {n}' for n in range(1, 9)]
+
+
+def check_conflicts(games):
+    seen = set()
+    for game in games:
+        for key in ((game['date'], game['time'], 'venue', game['venue']),
+                    (game['date'], game['time'], 'referee', game['referee']),
+                    (game['date'], 'team', game['team_a']),
+                    (game['date'], 'team', game['team_b'])):
+            assert key not in seen, f"conflict: {key}"
+            seen.add(key)
+
+
+def main():
+    for team_count in (8, 20, 50):
+        league = {
+            'id': 1,
+            'name': f'{team_count}-team league',
+            'start_date': '2025-01-04',
+            'end_date': '2025-12-31',
+            'schedule_preferences': 'Weekends',
+            'teams': [{'name': f'Team {n}'} for n in range(team_count)],
+        }
+        started = time.perf_counter()
+        games, unscheduled = generate_season(league, REFEREES, venues=VENUES, rest_days=1)
+        elapsed = time.perf_counter() - started
+        check_conflicts(games)
+        expected = team_count * (team_count - 1) // 2
+        print(f"{team_count:>3} teams: {len(games)}/{expected} games, {len(unscheduled)} unscheduled, "
+              f"{elapsed * 1000:.1f} ms, last game {games[-1]['date']}")
+
+
+if __name__ == '__main__':
+    main()
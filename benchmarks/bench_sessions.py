@@ -0,0 +1,57 @@
+"""Memory held by many sessions: shared reference snapshot vs per-session copies
+
+    python benchmarks/bench_sessions.py
+"""
+import copy
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reference_data import ReferenceCache
+from storage import LeagueRepository
+
+LEAGUES = 50
+TEAMS = 20
+REFEREES = [f'Ref {n}' for n in range(200)]
+
+
+def fresh_repo(path):
+    repo = LeagueRepository(path)
+    repo.add_referees(REFEREES)
+    for n in range(LEAGUES):
+        repo.add_league({'name': f'League {n}', 'format': '7v7', 'start_date': '2025-01-01',
+                         'end_date': '2025-12-31', 'teams': [{'id': t + 1, 'name': f'Team {n}-{t}', 'logo': None}
+                                                             for t in range(TEAMS)]})
+    return repo
+
+
+def held_kb(make_session, sessions):
+    """KB still allocated while `sessions` session dicts are alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [make_session() for _ in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / 1024
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = fresh_repo(os.path.join(tmp, 'bench.db'))
+        cache = ReferenceCache(repo)
+        cache.snapshot()
+        leagues = repo.list_leagues()
+        for sessions in (1, 50, 500):
+            copied = held_kb(lambda: {'page': 'home', 'leagues': copy.deepcopy(leagues), 'referees': list(REFEREES)}, sessions)
+            shared = held_kb(lambda: {'page': 'home', 'reference': cache.snapshot()}, sessions)
+            print(f"{sessions:>4} sessions: per-session copies {copied:9.0f} KB | shared snapshot {shared:6.0f} KB")
+        print(f"snapshot builds: {cache.builds}")
+        repo.close()
+
+
+if __name__ == '__main__':
+    main()
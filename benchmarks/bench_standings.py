@@ -0,0 +1,67 @@
+"""Time standings for large leagues: full recompute vs incremental score entry
+
+    python benchmarks/bench_standings.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standings import LeagueTable, compute_standings
+
+TEAMS = [f'Team {n}' for n in range(20)]
+
+
+def make_games(count, seed=7):
+    rng = random.Random(seed)
+    games = []
+    for idx in range(count):
+        team_a, team_b = rng.sample(TEAMS, 2)
+        games.append({
+            'id': idx + 1, 'league_id': 1, 'team_a': team_a, 'team_b': team_b,
+            'date': f"{2000 + idx // 4000}-{idx // 300 % 12 + 1:02d}-{idx % 28 + 1:02d}", 'time': '10:00',
+            'status': 'Final', 'score_a': rng.randint(0, 42), 'score_b': rng.randint(0, 42),
+        })
+    return games
+
+
+def timed(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    for count in (1_000, 10_000, 100_000):
+        games = make_games(count)
+        full_ms = timed(lambda: compute_standings(TEAMS, games), 5)
+
+        table = LeagueTable(TEAMS)
+        started = time.perf_counter()
+        for game in games:
+            table.add_game(game)
+        load_ms = (time.perf_counter() - started) * 1000
+        table.frame()
+
+        game = games[count // 2]
+        corrected = dict(game, score_a=game['score_b'], score_b=game['score_a'])
+
+        def enter_score():
+            table.remove_game(game)
+            table.add_game(corrected)
+            table.remove_game(corrected)
+            table.add_game(game)
+
+        update_us = timed(enter_score, 1000) * 1000 / 2
+        read_ms = timed(lambda: (enter_score(), table.frame()), 20)
+        cached_us = timed(table.frame, 1000) * 1000
+        assert table.frame().equals(compute_standings(TEAMS, games))
+        print(f"{count:>7} games: full recompute {full_ms:7.1f} ms | initial load {load_ms:7.1f} ms | "
+              f"score entry {update_us:5.1f} us | entry + re-rank {read_ms:6.1f} ms | cached read {cached_us:5.0f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+"""Streaming bulk import and export of leagues, teams and games
+
+Files are read in chunks of CHUNK_SIZE rows (CSV, JSON-lines or Parquet),
+so memory stays bounded by the chunk rather than the file. Every game row
+goes through validate_game, the same duplicate check as the manual form
+(pinned to the game date, so a history's rematches survive) and the
+venue/referee booking check; each accepted chunk is written in one
+transaction with LeagueRepository.add_games.
+"""
+from dataclasses import dataclass, field
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from models import ValidationError, validate_game, validate_league
+from storage import BookingIndex
+
+CHUNK_SIZE = 10_000
+MAX_REPORTED_ERRORS = 50
+FORMATS = {
+    'csv': 'csv',
+    'jsonl': 'jsonl',
+    'ndjson': 'jsonl',
+    'json': 'jsonl',
+    'parquet': 'parquet',
+    'pq': 'parquet',
+}
+MIME_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+LEAGUE_COLUMNS = ['name', 'format', 'start_date', 'end_date', 'logo', 'fee_type',
+                  'fee_amount', 'venue', 'schedule_preferences', 'teams']
+TEAM_COLUMNS = ['league_name', 'id', 'name', 'logo']
+GAME_COLUMNS = ['id', 'league_name', 'team_a', 'team_a_logo', 'team_b', 'team_b_logo',
+                'date', 'time', 'venue', 'referee', 'status', 'score_a', 'score_b']
+INT_COLUMNS = ('id', 'score_a', 'score_b')
+
+
+@dataclass(slots=True)
+class ImportReport:
+    """Row counts for one import; only the first MAX_REPORTED_ERRORS messages are kept"""
+    imported: int = 0
+    duplicates: int = 0
+    conflicts: int = 0
+    invalid: int = 0
+    errors: list = field(default_factory=list)
+
+    def reject(self, row, message, kind='invalid'):
+        setattr(self, kind, getattr(self, kind) + 1)
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Row {row}: {message}")
+
+    def summary(self):
+        parts = [f"{self.imported} imported"]
+        for label, count in (('duplicates skipped', self.duplicates),
+                             ('booking conflicts', self.conflicts),
+                             ('invalid rows', self.invalid)):
+            if count:
+                parts.append(f"{count} {label}")
+        return ', '.join(parts)
+
+
+def detect_format(filename):
+    """Map a file name to 'csv', 'jsonl' or 'parquet' by its extension"""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension not in FORMATS:
+        raise ValidationError(f"Unsupported file type '.{extension}', use CSV, JSON-lines or Parquet")
+    return FORMATS[extension]
+
+
+def read_chunks(source, fmt, chunk_size=CHUNK_SIZE):
+    """Yield DataFrames of at most chunk_size rows, with missing values as None"""
+    if fmt not in MIME_TYPES:
+        raise ValidationError(f"Unknown format '{fmt}'")
+    try:
+        if fmt == 'csv':
+            reader = pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False,
+                                 skipinitialspace=True)
+        elif fmt == 'jsonl':
+            reader = pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False,
+                                  convert_dates=False, keep_default_dates=False)
+        else:
+            parquet_file = pq.ParquetFile(source)
+            reader = (batch.to_pandas(date_as_object=False) for batch in parquet_file.iter_batches(chunk_size))
+        for chunk in reader:
+            yield _clean(chunk)
+    except pd.errors.EmptyDataError:
+        return
+    except ValidationError:
+        raise
+    except (pd.errors.ParserError, ValueError, OSError) as e:
+        raise ValidationError(f"Could not read the {fmt} file: {str(e)[:200]}")
+
+
+def _clean(chunk):
+    """Normalise column names, dates and missing values of a freshly read chunk"""
+    chunk.columns = [str(c).strip().lower().replace(' ', '_') for c in chunk.columns]
+    for column in chunk.columns:
+        if pd.api.types.is_datetime64_any_dtype(chunk[column]):
+            chunk[column] = chunk[column].dt.strftime('%H:%M' if column == 'time' else '%Y-%m-%d')
+    chunk = chunk.reset_index(drop=True).astype(object)
+    return chunk.where(chunk.notna() & (chunk != ''), None)
+
+
+def _records(chunk, columns):
+    """Row dicts for a chunk, with every expected column present"""
+    values = [chunk[c].tolist() if c in chunk else [None] * len(chunk) for c in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+# Import
+
+def import_leagues(repo, source, fmt, chunk_size=CHUNK_SIZE):
+    """Import leagues (teams as a comma-separated `teams` column), skipping names already taken"""
+    report = ImportReport()
+    taken = {name.lower() for name in repo.league_names()}
+    offset = 0
+    for chunk in read_chunks(source, fmt, chunk_size):
+        rows = _records(chunk, LEAGUE_COLUMNS)
+        for idx, row in enumerate(rows, start=offset + 1):
+            try:
+                league = validate_league(row)
+            except ValidationError as e:
+                report.reject(idx, e)
+                continue
+            if league.name.lower() in taken:
+                report.reject(idx, f"League '{league.name}' already exists", 'duplicates')
+                continue
+            record = league.to_dict()
+            record.pop('id')
+            repo.add_league(record)
+            taken.add(league.name.lower())
+            report.imported += 1
+        offset += len(rows)
+    return report
+
+
+def import_teams(repo, source, fmt, chunk_size=CHUNK_SIZE):
+    """Append teams (league_name, name, logo rows) to existing leagues"""
+    report = ImportReport()
+    leagues = {league['name']: league for league in repo.list_leagues()}
+    rosters = {name: {t['name'].lower() for t in league['teams']} for name, league in leagues.items()}
+    offset = 0
+    for chunk in read_chunks(source, fmt, chunk_size):
+        chunk = chunk.reindex(columns=TEAM_COLUMNS)
+        rows = np.arange(offset + 1, offset + len(chunk) + 1)
+        names = chunk['name'].astype('string').str.strip()
+        keys = chunk['league_name'].astype('string').str.strip() + '\x00' + names.str.lower()
+
+        missing = names.isna() | chunk['league_name'].isna()
+        unknown = ~missing & ~chunk['league_name'].isin(list(leagues))
+        repeated = ~missing & ~unknown & keys.duplicated()
+        for row in rows[missing.to_numpy()]:
+            report.reject(row, "Missing league name or team name")
+        for row, league_name in zip(rows[unknown.to_numpy()], chunk['league_name'][unknown]):
+            report.reject(row, f"Unknown league '{league_name}'")
+        for row in rows[repeated.to_numpy()]:
+            report.reject(row, "Team appears twice in this file", 'duplicates')
+
+        keep = chunk[~(missing | unknown | repeated).to_numpy()].assign(name=names)
+        for league_name, group in keep.groupby('league_name', sort=False):
+            roster = rosters[league_name]
+            new_teams = []
+            for row, team in zip(rows[group.index], group.to_dict('records')):
+                if team['name'].lower() in roster:
+                    report.reject(row, f"{team['name']} is already in {league_name}", 'duplicates')
+                    continue
+                roster.add(team['name'].lower())
+                new_teams.append(team)
+            report.imported += len(repo.add_teams(leagues[league_name]['id'], new_teams))
+        offset += len(chunk)
+    return report
+
+
+def import_games(repo, source, fmt, chunk_size=CHUNK_SIZE):
+    """Import games into existing leagues, one transaction per accepted chunk"""
+    report = ImportReport()
+    leagues = {league['name']: league for league in repo.list_leagues()}
+    logos = {(league['id'], t['name']): t['logo'] for league in leagues.values() for t in league['teams']}
+    members = pd.MultiIndex.from_tuples(list(logos) or [(None, None)])
+    offset = 0
+    for chunk in read_chunks(source, fmt, chunk_size):
+        rows = _records(chunk, GAME_COLUMNS)
+        valid, valid_rows = [], []
+        for idx, row in enumerate(rows, start=offset + 1):
+            league = leagues.get(row['league_name'])
+            if league is None:
+                report.reject(idx, f"Unknown league '{row['league_name']}'")
+                continue
+            row = dict(row, id=None, league_id=league['id'])
+            try:
+                valid.append(validate_game(row).to_dict())
+            except ValidationError as e:
+                report.reject(idx, e)
+                continue
+            valid_rows.append(idx)
+        offset += len(rows)
+        if not valid:
+            continue
+
+        # Vectorized roster and in-file duplicate checks over the validated chunk
+        frame = pd.DataFrame(valid, columns=['league_id', 'team_a', 'team_b', 'date'])
+        row_numbers = np.array(valid_rows)
+        in_league = (pd.MultiIndex.from_frame(frame[['league_id', 'team_a']]).isin(members) &
+                     pd.MultiIndex.from_frame(frame[['league_id', 'team_b']]).isin(members))
+        first, second = frame['team_a'].to_numpy(), frame['team_b'].to_numpy()
+        swap = first > second
+        frame['low'], frame['high'] = np.where(swap, second, first), np.where(swap, first, second)
+        repeated = frame.duplicated(['league_id', 'low', 'high', 'date']).to_numpy() & in_league
+
+        chunk_bookings = BookingIndex()
+        accepted = []
+        for pos, game in enumerate(valid):
+            row = row_numbers[pos]
+            if not in_league[pos]:
+                report.reject(row, f"{game['team_a']} and {game['team_b']} are not both in {game['league_name']}")
+            elif repeated[pos] or repo.game_exists(game['league_id'], game['team_a'], game['team_b'], game['date']):
+                report.reject(row, f"{game['team_a']} vs {game['team_b']} on {game['date']} already exists",
+                              'duplicates')
+            elif booked := _booked(repo, chunk_bookings, game):
+                report.reject(row, f"{booked} is double-booked on {game['date']} at {game['time']}", 'conflicts')
+            else:
+                game['team_a_logo'] = logos.get((game['league_id'], game['team_a'])) or game['team_a_logo']
+                game['team_b_logo'] = logos.get((game['league_id'], game['team_b'])) or game['team_b_logo']
+                game.pop('id')
+                chunk_bookings.add(dict(game, id=-pos - 1))
+                accepted.append(game)
+        repo.add_games(accepted)
+        report.imported += len(accepted)
+    return report
+
+
+def _booked(repo, chunk_bookings, game):
+    """Name of the venue or referee this game would double-book, or None"""
+    for kind in ('venue', 'referee'):
+        name = game.get(kind)
+        if not name or name == 'TBD':
+            continue
+        if chunk_bookings.overlapping(kind, name, game['date'], game['time']) or \
+                repo.bookings.overlapping(kind, name, game['date'], game['time']):
+            return name
+    return None
+
+
+# Export
+
+def _league_rows(repo):
+    for league in repo.list_leagues():
+        row = {column: league.get(column) for column in LEAGUE_COLUMNS}
+        row['teams'] = ', '.join(t['name'] for t in league['teams'])
+        yield row
+
+
+def _team_rows(repo):
+    for league in repo.list_leagues():
+        for team in league['teams']:
+            yield {'league_name': league['name'], 'id': team['id'], 'name': team['name'], 'logo': team['logo']}
+
+
+def _game_chunks(repo, league_name=None, chunk_size=CHUNK_SIZE):
+    """Walk the games table in keyset pages so only one chunk is in memory"""
+    cursor = None
+    while True:
+        games, cursor = repo.page_games(league_name=league_name, after=cursor, limit=chunk_size)
+        if games:
+            yield games
+        if cursor is None:
+            return
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _frame(rows, columns):
+    frame = pd.DataFrame(rows, columns=columns)
+    for column in INT_COLUMNS:
+        if column in frame:
+            frame[column] = frame[column].astype('Int64')
+    return frame
+
+
+def write_chunks(chunks, columns, dest, fmt):
+    """Write an iterable of row-dict batches to a binary file object
+
+    An export with no rows still gets a CSV header or a Parquet schema.
+    """
+    writer = None
+    for idx, rows in enumerate(chain(chunks, [[]])):
+        if idx and not rows:
+            break
+        frame = _frame(rows, columns)
+        if fmt == 'csv':
+            dest.write(frame.to_csv(index=False, header=idx == 0).encode('utf-8'))
+        elif fmt == 'jsonl':
+            if rows:
+                dest.write(frame.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n').encode('utf-8') + b'\n')
+        elif fmt == 'parquet':
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f
+                                    for f in table.schema]).remove_metadata()
+                writer = pq.ParquetWriter(dest, schema)
+            writer.write_table(table.cast(writer.schema))
+        else:
+            raise ValidationError(f"Unknown format '{fmt}'")
+    if writer is not None:
+        writer.close()
+
+
+def export_leagues(repo, dest, fmt):
+    """Write every league, one row each with its team names comma-separated"""
+    write_chunks(_batched(_league_rows(repo), CHUNK_SIZE), LEAGUE_COLUMNS, dest, fmt)
+
+
+def export_teams(repo, dest, fmt):
+    """Write every team as a (league_name, id, name, logo) row"""
+    write_chunks(_batched(_team_rows(repo), CHUNK_SIZE), TEAM_COLUMNS, dest, fmt)
+
+
+def export_games(repo, dest, fmt, league_name=None, chunk_size=CHUNK_SIZE):
+    """Write games in kickoff order, optionally for one league"""
+    write_chunks(_game_chunks(repo, league_name, chunk_size), GAME_COLUMNS, dest, fmt)
@@ -0,0 +1,128 @@
+"""Checks a chatbot action has to pass before it is applied
+
+The chat page runs these before writing anything, and replay.py runs the
+same functions for its dry run, so a replay reports exactly what the app
+would accept. Nothing here writes to the repository.
+
+A rejection is an ActionRejected (a ValidationError) whose `outcome` names
+the reason: unknown_league, unknown_team, same_team, duplicate, conflict or
+duplicate_league. Any other ValidationError means the action was malformed.
+"""
+from instrumentation import metrics
+from models import ValidationError, validate_game
+from storage import BookingIndex
+
+
+class ActionRejected(ValidationError):
+    """A well-formed action the current data does not allow"""
+
+    def __init__(self, message, outcome):
+        super().__init__(message)
+        self.outcome = outcome
+
+
+def outcome(error):
+    """Outcome name for a ValidationError raised by these checks"""
+    return getattr(error, 'outcome', 'invalid')
+
+
+def _hint(close):
+    return f". Did you mean {' or '.join(repr(n) for n in close)}?" if close else ""
+
+
+def find_league(snapshot, name):
+    """Return the league a possibly shortened or misspelt name refers to"""
+    league = snapshot.resolve_league(name)
+    if league is None:
+        raise ActionRejected(f"Unknown league '{name}'{_hint(snapshot.suggest_leagues(name))}", 'unknown_league')
+    if league['name'] != name:
+        metrics.count('ai.names_resolved')
+    return league
+
+
+def resolve_teams(game, snapshot):
+    """Swap the game's team names for their roster spelling and copy the teams' logos"""
+    for side in ('team_a', 'team_b'):
+        name = getattr(game, side)
+        team = snapshot.resolve_team(game.league_id, name)
+        if team is None:
+            hint = _hint(snapshot.suggest_teams(game.league_id, name))
+            raise ActionRejected(f"'{name}' is not a team in {game.league_name}{hint}", 'unknown_team')
+        if team['name'] != name:
+            metrics.count('ai.names_resolved')
+        setattr(game, side, team['name'])
+        setattr(game, f'{side}_logo', team['logo'] or '🏈')
+    if game.team_a == game.team_b:
+        raise ActionRejected("Team A and Team B must be different", 'same_team')
+
+
+def booking_conflict(repo, game, batch=None, batch_bookings=None):
+    """Describe the booking a game would clash with, or return None
+
+    `batch` and `batch_bookings` hold games accepted earlier in the same
+    batch (indexed with ids -1, -2, ...) that are not stored yet.
+    """
+    conflicts = repo.booking_conflicts(game.date, game.time, game.venue, game.referee)
+    if batch_bookings is not None:
+        for kind, name in (('venue', game.venue), ('referee', game.referee)):
+            if name and name != 'TBD':
+                conflicts += [(kind, batch[-i - 1].to_dict()) for i in batch_bookings.overlapping(kind, name, game.date, game.time)]
+    if not conflicts:
+        return None
+    kind, other = conflicts[0]
+    booked = game.venue if kind == 'venue' else game.referee
+    return f"{booked} is already booked for {other['team_a']} vs {other['team_b']} on {other['date']} at {other['time']}."
+
+
+def check_league(snapshot, league):
+    """Refuse a league whose name matches an existing one, ignoring case, accents and punctuation"""
+    # The model may not see every league name, so uniqueness is enforced here
+    existing = snapshot.league_by_name(league.name, folded=True)
+    if existing:
+        raise ActionRejected(f"A league named '{existing['name']}' already exists. Please choose a different name.",
+                             'duplicate_league')
+
+
+def check_game(repo, snapshot, game, pairs=None, batch=None, batch_bookings=None):
+    """Resolve a validated Game's league, teams and referee in place and refuse it if it
+    repeats a matchup or double-books its venue or referee
+
+    `pairs`, `batch` and `batch_bookings` carry the games accepted earlier in
+    the same batch (see check_games).
+    """
+    # The model often shortens or misspells names; resolve them here instead of asking again
+    league = find_league(snapshot, game.league_name)
+    game.league_id, game.league_name = league['id'], league['name']
+    resolve_teams(game, snapshot)
+    if not game.referee and snapshot.referees:
+        game.referee = snapshot.referees[0]
+    pair = (league['id'], frozenset((game.team_a, game.team_b)))
+    if (pairs is not None and pair in pairs) or repo.game_exists(league['id'], game.team_a, game.team_b):
+        raise ActionRejected("A game between these two teams has already been created.", 'duplicate')
+    conflict = booking_conflict(repo, game, batch, batch_bookings)
+    if conflict:
+        raise ActionRejected(conflict, 'conflict')
+    return game
+
+
+def check_games(repo, snapshot, entries):
+    """Check a batch of game dicts together, each also against the games accepted before it
+
+    Returns (accepted Games, failures) where each failure is
+    {'index', 'game', 'reason', 'outcome'} with a 1-based index.
+    """
+    accepted = []
+    batch_bookings = BookingIndex()
+    pairs = set()
+    failures = []
+    for index, entry in enumerate(entries, start=1):
+        label = f"{entry.get('team_a', '?')} vs {entry.get('team_b', '?')}" if isinstance(entry, dict) else str(entry)[:60]
+        try:
+            game = check_game(repo, snapshot, validate_game(entry), pairs, accepted, batch_bookings)
+        except ValidationError as e:
+            failures.append({'index': index, 'game': label, 'reason': str(e), 'outcome': outcome(e)})
+            continue
+        pairs.add((game.league_id, frozenset((game.team_a, game.team_b))))
+        accepted.append(game)
+        batch_bookings.add(dict(game.to_dict(), id=-len(accepted)))
+    return accepted, failures
@@ -0,0 +1,100 @@
+"""Bounded chatbot history with compaction and token-budgeted context"""
+import json
+from collections import deque
+
+MAX_TURNS = 20
+MAX_SUMMARIES = 100
+MAX_USER_CHARS = 500
+MAX_BODY_CHARS = 300
+
+
+def estimate_tokens(value):
+    """Rough token count for a JSON-serialisable value (~4 characters per token)"""
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':'))) // 4 + 1
+
+
+def compact_turn(turn):
+    """Strip a turn down to what the model needs to follow the conversation"""
+    compact = {"user": turn['user'][:MAX_USER_CHARS]}
+    ai = turn.get('ai')
+    if ai:
+        compact['ai'] = {k: ai[k] for k in ('action', 'title', 'current_step') if ai.get(k) is not None}
+        if ai.get('body'):
+            compact['ai']['body'] = ai['body'][:MAX_BODY_CHARS]
+    # Batch results the model should know about when the user follows up
+    failures = (turn.get('created_item') or {}).get('failures')
+    if failures:
+        compact['not_scheduled'] = [f"#{f['index']} {f['game']}: {f['reason']}"[:120] for f in failures]
+    return compact
+
+
+def summarize_turn(turn):
+    """One-line summary kept once a turn leaves the ring buffer"""
+    ai = turn.get('ai') or {}
+    line = f"{turn['user'][:80]} -> {ai.get('action', '?')}: {ai.get('title', '')}"
+    if ai.get('current_step'):
+        line += f" (step {ai['current_step']})"
+    return line
+
+
+class ChatHistory:
+    """Ring buffer of recent chat turns plus one-line summaries of older ones
+
+    Full turns (including created_item payloads for the summary cards) are
+    kept for the last `max_turns` messages; older turns survive only as
+    short summaries, themselves capped at `max_summaries`.
+    """
+
+    def __init__(self, max_turns=MAX_TURNS, max_summaries=MAX_SUMMARIES):
+        self.turns = deque(maxlen=max_turns)
+        self.summaries = deque(maxlen=max_summaries)
+
+    def __len__(self):
+        return len(self.turns)
+
+    def __bool__(self):
+        return bool(self.turns)
+
+    def add(self, turn):
+        """Append a finished turn, compacting the oldest one if the buffer is full"""
+        if len(self.turns) == self.turns.maxlen:
+            self.summaries.append(summarize_turn(self.turns[0]))
+        turn = dict(turn, user=turn['user'][:MAX_USER_CHARS])
+        self.turns.append(turn)
+
+    def recent(self, count):
+        """Return the last `count` full turns, oldest first"""
+        return list(self.turns)[-count:]
+
+    def clear(self):
+        """Forget every turn and summary"""
+        self.turns.clear()
+        self.summaries.clear()
+
+    def context(self, token_budget):
+        """Build the history sent to the model, newest turns first, within a token budget"""
+        recent = []
+        used = 0
+        for turn in reversed(self.turns):
+            compact = compact_turn(turn)
+            cost = estimate_tokens(compact)
+            if used + cost > token_budget:
+                break
+            recent.append(compact)
+            used += cost
+        recent.reverse()
+
+        earlier = []
+        if len(recent) == len(self.turns):
+            for line in reversed(self.summaries):
+                cost = estimate_tokens(line)
+                if used + cost > token_budget:
+                    break
+                earlier.append(line)
+                used += cost
+            earlier.reverse()
+
+        context = {"recent_turns": recent}
+        if earlier:
+            context["earlier_turns"] = earlier
+        return context
@@ -0,0 +1,172 @@
+"""Compact, token-budgeted CONTEXT DATA for model calls
+
+The context is encoded without whitespace and with the short keys below,
+which the system prompt explains once. Only the entities the conversation
+touches are sent in full. Leagues named in the message, in the conversation
+state or in the last few user turns come with their team lists; other
+leagues are listed by name only. Parts are added in priority order, and any
+part that would push past the hard token budget is cut down or dropped.
+"""
+import json
+import re
+
+from chat_history import estimate_tokens
+
+# Explained to the model once, in the system prompt (see legend)
+CONTEXT_KEYS = {
+    'cs': "conversation state so far",
+    'lg': "leagues the user mentioned, as [name, format, [team names]]",
+    'ol': "names of the other leagues",
+    'gm': "game counts by status",
+    'rf': "referees",
+    'vn': "venues the user mentioned",
+    'h': "recent chat turns",
+    'eh': "summaries of earlier turns",
+}
+# Trimmed first when over budget; 'cs' is never dropped
+DROP_ORDER = ['ol', 'eh', 'h', 'vn', 'rf', 'gm', 'lg']
+MENTION_TURNS = 2
+# Longer referee lists are cut down to the ones the conversation mentions
+MAX_REFEREES = 12
+WORD_RE = re.compile(r"[a-z0-9]+")
+STOP_WORDS = {'the', 'league', 'and', 'of', 'cup', 'fc'}
+
+
+def encode(context):
+    """Serialise a context dict as compact JSON"""
+    return json.dumps(context, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def legend():
+    """One "- key: meaning" line per context key, for the system prompt"""
+    return '\n'.join(f"- {key}: {meaning}" for key, meaning in CONTEXT_KEYS.items())
+
+
+def _tokens(text):
+    return WORD_RE.findall(text.lower())
+
+
+def _padded(text):
+    """Lower-cased words joined by single spaces, with a space at each end"""
+    return f" {' '.join(_tokens(text))} "
+
+
+def _keys(name):
+    """Distinctive words and adjacent word pairs of a name"""
+    tokens = _tokens(name)
+    words = {w for w in tokens if w not in STOP_WORDS and len(w) > 2 and not w.isdigit()}
+    return words | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def mentioned(text, names):
+    """Names referred to in text: the whole name, or a word or word pair no other name has"""
+    padded = _padded(text)
+    tokens = _tokens(text)
+    present = set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+    keys = {name: _keys(name) for name in names}
+    owners = {}
+    for name, name_keys in keys.items():
+        for key in name_keys:
+            owners[key] = owners.get(key, 0) + 1
+    return [name for name in names
+            if _padded(name) in padded or any(owners[key] == 1 for key in keys[name] & present)]
+
+
+def mentioned_by_team(text, leagues):
+    """Names of leagues one of whose teams is named in full in text"""
+    padded = _padded(text)
+    return [l['name'] for l in leagues if any(_padded(t['name']) in padded for t in l['teams'])]
+
+
+def _relevant(mention_text, leagues, referees, search):
+    """(league names, referee names, venue names) the conversation refers to, most relevant first"""
+    if search is None:
+        named = mentioned(mention_text, [l['name'] for l in leagues]) + mentioned_by_team(mention_text, leagues)
+        return list(dict.fromkeys(named)), mentioned(mention_text, referees), []
+    hits = search(mention_text)
+    named = [h.name if h.kind == 'league' else h.league for h in hits if h.kind in ('league', 'team')]
+    return (list(dict.fromkeys(named)), [h.name for h in hits if h.kind == 'referee'],
+            [h.name for h in hits if h.kind == 'venue'])
+
+
+def build_context(message, leagues, referees, stats, state=None, history=None, token_budget=1200,
+                  history_budget=None, search=None):
+    """Return (context dict, estimated tokens) holding as much as fits in token_budget
+
+    `history` is a ChatHistory; its turns get whatever budget is left, capped
+    at history_budget. `search(text)` returns entity index hits (see
+    entity_index.EntityIndex.search); without it mentions are found by
+    scanning every league and team name.
+    """
+    mention_text = ' '.join([message, encode(state or {})] +
+                            [turn['user'] for turn in (history.recent(MENTION_TURNS) if history else [])])
+    named, named_referees, venues = _relevant(mention_text, leagues, referees, search)
+
+    context = {}
+    used = 2
+
+    def fits(key, value):
+        nonlocal used
+        cost = estimate_tokens({key: value})
+        if used + cost > token_budget:
+            return False
+        context[key] = value
+        used += cost
+        return True
+
+    # The conversation state is always sent; the model cannot resume a flow without it
+    if state:
+        context['cs'] = state
+        used += estimate_tokens({'cs': state})
+
+    by_name = {l['name']: l for l in leagues}
+    in_play = []
+    for league in (by_name[name] for name in named if name in by_name):
+        entry = [league['name'], league.get('format'), [t['name'] for t in league['teams']]]
+        if estimate_tokens(entry) + used + 4 <= token_budget:
+            in_play.append(entry)
+            used += estimate_tokens(entry)
+    if in_play:
+        context['lg'] = in_play
+        used += 2
+    in_play_names = {entry[0] for entry in in_play}
+
+    if stats.get('games_by_status'):
+        fits('gm', stats['games_by_status'])
+
+    if referees and (len(referees) > MAX_REFEREES or not fits('rf', list(referees))) and named_referees:
+        fits('rf', named_referees)
+    if venues:
+        fits('vn', venues)
+
+    if history is not None:
+        remaining = max(0, token_budget - used - 4)
+        past = history.context(min(remaining, history_budget) if history_budget else remaining)
+        if past.get('recent_turns'):
+            fits('h', past['recent_turns'])
+        if past.get('earlier_turns'):
+            fits('eh', past['earlier_turns'])
+
+    others = []
+    for league in leagues:
+        if league['name'] in in_play_names:
+            continue
+        cost = estimate_tokens(league['name'])
+        if used + cost + 4 > token_budget:
+            break
+        others.append(league['name'])
+        used += cost
+    if others:
+        context['ol'] = others
+
+    # The per-part estimates are approximate; trim the lowest-priority parts until the whole fits
+    total = estimate_tokens(context)
+    for key in DROP_ORDER:
+        while total > token_budget and context.get(key):
+            if isinstance(context[key], list) and len(context[key]) > 1:
+                # History loses its oldest turns, the name lists their tail
+                context[key].pop(0 if key in ('h', 'eh') else -1)
+            else:
+                del context[key]
+            total = estimate_tokens(context)
+    return context, total
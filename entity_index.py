@@ -0,0 +1,138 @@
+"""Character-trigram retrieval over leagues, teams, venues and referees
+
+Every entity name is broken into word-bounded character trigrams held in an
+inverted index. A message is scored against all entities at once with
+NumPy. An entity's score is the IDF-weighted share of its own trigrams that
+also occur in the message, so "sun devils" finds "Sun Devils" and typos only
+cost the trigrams they touch. A whole word found in just one name lifts that
+name's score halfway to 1, so "winter league" finds "Phoenix Winter 2025". Adding an entity appends to the posting lists; the flat arrays
+used for scoring are rebuilt lazily on the next search.
+"""
+import re
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+KINDS = ('league', 'team', 'venue', 'referee')
+WORD_RE = re.compile(r"[a-z0-9]+")
+# Words that say nothing about which entity is meant
+STOP_WORDS = frozenset({'the', 'league', 'vs', 'v', 'and', 'of', 'at', 'in', 'on', 'a'})
+
+Hit = namedtuple('Hit', 'score kind name league')
+
+
+def trigrams(text):
+    """Trigrams of each lower-cased word padded with spaces ("sun" -> " su", "sun", "un "),
+    plus each adjacent word pair so word order and numbers next to words count"""
+    words = [w for w in WORD_RE.findall(text.lower()) if w not in STOP_WORDS]
+    grams = {f"{a} {b}" for a, b in zip(words, words[1:])}
+    for word in words:
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class EntityIndex:
+    """Incrementally built trigram index; entities are (kind, name, league) triples"""
+
+    def __init__(self):
+        self.entities = []
+        self._ids = {}
+        self._gram_ids = {}
+        # Growing int64 buffers (stdlib arrays append cheaply and copy into NumPy in one step)
+        self._postings = []
+        self._doc_freq = array('q')
+        # Posting lists as NumPy arrays, converted on first use and dropped when the list grows
+        self._posting_arrays = []
+        # One (entity, gram) pair per trigram occurrence
+        self._pair_entity = array('q')
+        self._pair_gram = array('q')
+        self._arrays = None
+        # Whole words -> entities whose name contains them, for partial mentions like "winter"
+        self._word_entities = {}
+
+    def __len__(self):
+        return len(self.entities)
+
+    def add(self, kind, name, league=None):
+        """Index an entity once; blank names and repeats are ignored"""
+        if not name or not str(name).strip():
+            return
+        key = (kind, name, league if kind == 'team' else None)
+        if key in self._ids:
+            return
+        entity = self._ids[key] = len(self.entities)
+        self.entities.append(key)
+        for word in set(WORD_RE.findall(name.lower())) - STOP_WORDS:
+            if len(word) > 2 and not word.isdigit():
+                self._word_entities.setdefault(word, []).append(entity)
+        for gram in trigrams(name):
+            gram_id = self._gram_ids.get(gram)
+            if gram_id is None:
+                gram_id = self._gram_ids[gram] = len(self._postings)
+                self._postings.append(array('q'))
+                self._posting_arrays.append(None)
+                self._doc_freq.append(0)
+            self._postings[gram_id].append(entity)
+            self._doc_freq[gram_id] += 1
+            self._posting_arrays[gram_id] = None
+            self._pair_entity.append(entity)
+            self._pair_gram.append(gram_id)
+        self._arrays = None
+
+    def add_league(self, league):
+        self.add('league', league['name'])
+        self.add_teams(league['name'], league.get('teams', []))
+        if league.get('venue') and league['venue'] != 'TBD':
+            self.add('venue', league['venue'])
+
+    def add_teams(self, league_name, teams):
+        for team in teams:
+            self.add('team', team['name'], league_name)
+
+    def add_game(self, game):
+        self.add('venue', game.get('venue'))
+        self.add('referee', game.get('referee'))
+
+    def _posting_array(self, gram_id):
+        postings = self._posting_arrays[gram_id]
+        if postings is None:
+            postings = self._posting_arrays[gram_id] = np.frombuffer(self._postings[gram_id], dtype=np.int64).copy()
+        return postings
+
+    def _weights(self):
+        """IDF per trigram and the IDF mass of each entity's name, cached until the next add"""
+        if self._arrays is None:
+            doc_freq = np.frombuffer(self._doc_freq, dtype=np.int64).astype(np.float64)
+            idf = np.log1p(len(self.entities) / np.maximum(doc_freq, 1))
+            pair_entity = np.frombuffer(self._pair_entity, dtype=np.int64).copy()
+            pair_gram = np.frombuffer(self._pair_gram, dtype=np.int64).copy()
+            mass = np.bincount(pair_entity, weights=idf[pair_gram], minlength=len(self.entities))
+            self._arrays = idf, mass
+        return self._arrays
+
+    def search(self, text, k=8, kinds=None, min_score=0.4):
+        """Top-k Hit(score, kind, name, league) for entities named in text, best first"""
+        gram_ids = [self._gram_ids[g] for g in trigrams(text) if g in self._gram_ids]
+        if not gram_ids or not self.entities:
+            return []
+        idf, mass = self._weights()
+        postings = [self._posting_array(g) for g in gram_ids]
+        entity = np.concatenate(postings)
+        weight = np.repeat(idf[gram_ids], [len(p) for p in postings])
+        scores = np.bincount(entity, weights=weight, minlength=len(self.entities)) / np.maximum(mass, 1e-9)
+        # A word only one name contains picks that name out even when the rest is missing
+        for word in set(WORD_RE.findall(text.lower())):
+            owners = self._word_entities.get(word)
+            if owners and len(owners) == 1:
+                scores[owners[0]] = (1 + scores[owners[0]]) / 2
+        if kinds:
+            allowed = np.fromiter((kind in kinds for kind, _, _ in self.entities), dtype=bool, count=len(self.entities))
+            scores[~allowed] = 0
+        candidates = np.flatnonzero(scores >= min_score)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        # Best score first; among equals the longer (more specific) name wins
+        ranked = sorted(candidates, key=lambda e: (-scores[e], -mass[e]))
+        return [Hit(round(float(scores[e]), 3), *self.entities[e]) for e in ranked]
@@ -0,0 +1,156 @@
+"""Timing spans and counters for the hot paths (reruns, model calls, storage)
+
+One process-wide Metrics instance collects span durations into bounded
+per-name windows for percentiles, plus monotonically increasing counters.
+Set PFFL_METRICS_LOG to also append every span as a JSON line, and
+PFFL_METRICS_PORT to serve the OpenMetrics text on http://127.0.0.1:<port>/metrics.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+WINDOW = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Metrics:
+    """Thread-safe span timings and counters"""
+
+    def __init__(self, window=WINDOW, log_path=None, clock=time.perf_counter):
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._totals = defaultdict(lambda: [0, 0.0])
+        self._counters = defaultdict(float)
+        self._log = open(log_path, 'a', buffering=1, encoding='utf-8') if log_path else None
+        self._server = None
+
+    @contextmanager
+    def span(self, name, **fields):
+        """Time the block; the yielded dict can take extra fields for the log line"""
+        started = self._clock()
+        try:
+            yield fields
+        except Exception as e:
+            fields['error'] = type(e).__name__
+            raise
+        finally:
+            self.observe(name, self._clock() - started, **fields)
+
+    def timed(self, name=None):
+        """Decorator form of span, named after the function by default"""
+        def decorate(func):
+            label = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def observe(self, name, seconds, **fields):
+        """Record one duration under `name`"""
+        with self._lock:
+            self._samples[name].append(seconds)
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+            if self._log:
+                self._log.write(json.dumps({'ts': round(time.time(), 3), 'span': name,
+                                            'ms': round(seconds * 1000, 3), **fields}, default=str) + '\n')
+
+    def count(self, name, value=1):
+        """Add to a counter (tokens, cache hits, parse failures...)"""
+        with self._lock:
+            self._counters[name] += value
+
+    def summary(self):
+        """Per-span rows with call count and p50/p95/p99/max over the recent window, in ms"""
+        with self._lock:
+            samples = {name: np.fromiter(window, dtype=float) for name, window in self._samples.items()}
+            totals = {name: tuple(t) for name, t in self._totals.items()}
+        rows = []
+        for name, values in samples.items():
+            p50, p95, p99 = np.quantile(values, QUANTILES) * 1000
+            rows.append({'span': name, 'calls': totals[name][0], 'p50_ms': round(p50, 2), 'p95_ms': round(p95, 2),
+                         'p99_ms': round(p99, 2), 'max_ms': round(values.max() * 1000, 2),
+                         'total_s': round(totals[name][1], 3)})
+        return sorted(rows, key=lambda row: row['total_s'], reverse=True)
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._counters.clear()
+
+    def openmetrics(self):
+        """Spans as a summary (seconds) and counters, in OpenMetrics text format"""
+        lines = ['# TYPE pffl_span_seconds summary']
+        with self._lock:
+            samples = {name: np.fromiter(window, dtype=float) for name, window in self._samples.items()}
+            totals = {name: tuple(t) for name, t in self._totals.items()}
+            counters = dict(self._counters)
+        for name in sorted(samples):
+            label = _label(name)
+            for q, value in zip(QUANTILES, np.quantile(samples[name], QUANTILES)):
+                lines.append(f'pffl_span_seconds{{span="{label}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'pffl_span_seconds_count{{span="{label}"}} {totals[name][0]}')
+            lines.append(f'pffl_span_seconds_sum{{span="{label}"}} {totals[name][1]:.6f}')
+        lines.append('# TYPE pffl_events counter')
+        for name in sorted(counters):
+            lines.append(f'pffl_events_total{{event="{_label(name)}"}} {counters[name]:g}')
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port, host='127.0.0.1'):
+        """Serve openmetrics() at /metrics from a daemon thread (once per process)"""
+        if self._server:
+            return self._server
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.openmetrics().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/openmetrics-text; version=1.0.0; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name='metrics', daemon=True).start()
+        return self._server
+
+
+def _label(name):
+    return name.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def usage_tokens(response):
+    """(prompt, completion) token counts from a Gemini response or final stream chunk"""
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is None:
+        return None
+    return getattr(usage, 'prompt_token_count', 0) or 0, getattr(usage, 'candidates_token_count', 0) or 0
+
+
+metrics = Metrics(log_path=os.getenv('PFFL_METRICS_LOG'))
@@ -0,0 +1,398 @@
+"""Deterministic parser for fully specified chatbot commands
+
+Structured messages such as "schedule Phoenix Firebirds vs Desert Storm
+2025-01-20 10:00 at Desert Field ref John Carter" are turned straight into
+the same action dicts the model returns. Anything incomplete or ambiguous
+returns None so the caller falls back to Gemini, and so do questions and
+negated commands ("can we book ...?", "do not schedule ...").
+"""
+import re
+from datetime import datetime
+
+DATE_RE = re.compile(r'\b(\d{4}-\d{2}-\d{2})\b')
+TIME_RE = re.compile(r'\b(\d{1,2})(?::(\d{2}))?\s*(am|pm)\b|\b(\d{1,2}):(\d{2})\b', re.IGNORECASE)
+# Commands start with their verb, optionally after a polite lead-in; "can we book ...?" is a question
+COMMAND_LEAD = r"^\s*(?:(?:please|let'?s|i want to|i(?:'d| would) like to|go ahead and)\s+)?"
+GAME_VERB_RE = re.compile(COMMAND_LEAD + r'(?:schedule|book|create|add|set up)\b', re.IGNORECASE)
+LEAGUE_VERB_RE = re.compile(COMMAND_LEAD + r'(?:create|add|new|set up|start)\b[^;:]*\bleague\b', re.IGNORECASE)
+NEGATION_RE = re.compile(r"\b(?:don[’']?t|do not|never|not)\b|n[’']t\b", re.IGNORECASE)
+VENUE_RE = re.compile(
+    r'\b(?:at|venue:?|@)\s+(?!at\b)([A-Za-z][^,;]*?)\s*(?=\b(?:ref|referee|refereed by|officiated by|with|on)\b|[,;]|$)',
+    re.IGNORECASE
+)
+# Listing and counting questions are answered locally only when nothing follows but filler words
+LEAGUE_QUERY_RE = re.compile(
+    r"^\s*(?:please\s+)?(?:list|show(?: me)?|what(?:'s| are| is)?|which(?: are)?|how many)\s+"
+    r"(?:all\s+)?(?:of\s+)?(?:the\s+|my\s+|our\s+)?(?:current\s+|active\s+)?leagues\b(.*?)[\s?.!]*$",
+    re.IGNORECASE
+)
+GAME_COUNT_RE = re.compile(r'^\s*how many games\b(.*?)[\s?.!]*$', re.IGNORECASE)
+TEAM_COUNT_RE = re.compile(r'^\s*how many teams\b(.*?)[\s?.!]*$', re.IGNORECASE)
+FEES_RE = re.compile(
+    r"^\s*(?:what(?:'s| is| are)|how much (?:is|are)|show(?: me)?)\s+(?:the\s+)?(?:total\s+)?"
+    r"(?:entry\s+)?(?:fees?|fee totals?)\b(.*?)[\s?.!]*$",
+    re.IGNORECASE
+)
+STANDINGS_RE = re.compile(
+    r"\b(standings|league table|leaderboard|rankings?|top of the table|"
+    r"who(?:'s| is) (?:leading|winning|top|first|on top))\b",
+    re.IGNORECASE
+)
+WORD_RE = re.compile(r"[a-z0-9]+")
+LEAGUE_PREFIX_RE = re.compile(r'^.*?\bleague\b[\s,:-]*(?:(?:called|named|titled)\b[\s,:-]*)?', re.IGNORECASE)
+FIELD_RE = re.compile(r'^\s*([a-z _]+?)\s*[:=]\s*(.+?)\s*$', re.IGNORECASE)
+
+# Words that can follow a listing or counting question without changing what it asks
+FILLER_WORDS = frozenset({
+    'a', 'all', 'altogether', 'are', 'across', 'available', 'currently', 'do', 'does', 'have', 'has', 'i',
+    'in', 'is', 'me', 'now', 'of', 'on', 'our', 'overall', 'please', 'right', 'running', 'schedule',
+    'scheduled', 'so', 'far', 'the', 'there', 'total', 'we', 'you',
+})
+
+LEAGUE_KEYS = {
+    'name': 'name', 'league': 'name', 'league name': 'name',
+    'format': 'format',
+    'logo': 'logo',
+    'start': 'start_date', 'start date': 'start_date', 'start_date': 'start_date', 'starts': 'start_date',
+    'end': 'end_date', 'end date': 'end_date', 'end_date': 'end_date', 'ends': 'end_date',
+    'fee type': 'fee_type', 'fee_type': 'fee_type',
+    'fee': 'fee_amount', 'fee amount': 'fee_amount', 'fee_amount': 'fee_amount',
+    'teams': 'teams',
+    'venue': 'venue',
+    'schedule': 'schedule_preferences', 'schedule preferences': 'schedule_preferences',
+    'schedule_preferences': 'schedule_preferences',
+}
+
+
+def _find_names(text, names):
+    """Return names mentioned in text, longest first, without overlaps"""
+    lowered = text.lower()
+    taken = []
+    found = []
+    for name in sorted(set(names), key=len, reverse=True):
+        for match in re.finditer(r'(?<!\w)' + re.escape(name.lower()) + r'(?!\w)', lowered):
+            span = match.span()
+            if any(span[0] < end and start < span[1] for start, end in taken):
+                continue
+            taken.append(span)
+            found.append((span[0], name))
+            break
+    return [name for _, name in sorted(found)]
+
+
+def _find_league(message, leagues):
+    """Resolve the league a question is about: full name, else a unique word match, else the only league"""
+    named = _find_names(message, [l['name'] for l in leagues])
+    if len(named) == 1:
+        return next(l for l in leagues if l['name'] == named[0])
+    words = set(WORD_RE.findall(message.lower())) - {'league', 'the'}
+    scores = [(len(words & set(WORD_RE.findall(l['name'].lower()))), l) for l in leagues]
+    best = max((score for score, _ in scores), default=0)
+    matches = [l for score, l in scores if score == best and score > 0]
+    if len(matches) == 1:
+        return matches[0]
+    return leagues[0] if len(leagues) == 1 else None
+
+
+def _only_filler(text):
+    """Whether text adds nothing to a listing or counting question"""
+    return set(WORD_RE.findall(text.lower())) <= FILLER_WORDS
+
+
+def _tail_league(text, leagues):
+    """(True, league) when the words after a counting question name exactly one league,
+    (False, None) when they are only filler, and (True, None) when they ask something else"""
+    words = set(WORD_RE.findall(text.lower())) - FILLER_WORDS - {'for', 'league', 'leagues', 'registered'}
+    if not words:
+        return False, None
+    matches = [l for l in leagues if words <= set(WORD_RE.findall(l['name'].lower()))]
+    return True, matches[0] if len(matches) == 1 else None
+
+
+def _is_command(message, verb_re):
+    """Whether message is a plain instruction: verb first, no question and no negation anywhere"""
+    return bool(verb_re.match(message)) and '?' not in message and not NEGATION_RE.search(message)
+
+
+def _parse_date(text):
+    match = DATE_RE.search(text)
+    if not match:
+        return None
+    try:
+        datetime.strptime(match.group(1), '%Y-%m-%d')
+    except ValueError:
+        return None
+    return match.group(1)
+
+
+def _parse_time(text):
+    match = TIME_RE.search(text)
+    if not match:
+        return None
+    if match.group(3):
+        hour, minute = int(match.group(1)), int(match.group(2) or 0)
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if match.group(3).lower() == 'pm' else 0)
+    else:
+        hour, minute = int(match.group(4)), int(match.group(5))
+    if hour > 23 or minute > 59:
+        return None
+    return f"{hour:02d}:{minute:02d}"
+
+
+def _strip(text, patterns):
+    for pattern in patterns:
+        text = pattern.sub(' ', text) if hasattr(pattern, 'sub') else \
+            re.sub(re.escape(pattern), ' ', text, flags=re.IGNORECASE)
+    return text
+
+
+def parse_game(message, leagues, referees):
+    """Parse a complete game-scheduling command into a create_game action"""
+    if not _is_command(message, GAME_VERB_RE):
+        return None
+    date = _parse_date(message)
+    time = _parse_time(DATE_RE.sub(' ', message))
+    referee_names = _find_names(message, referees)
+    if not date or not time or len(referee_names) != 1:
+        return None
+
+    league_names = _find_names(message, [l['name'] for l in leagues])
+    candidates = [l for l in leagues if l['name'] in league_names] if league_names else leagues
+    matches = []
+    for league in candidates:
+        teams = _find_names(message, [t['name'] for t in league['teams']])
+        if len(teams) == 2:
+            matches.append((league, teams))
+    if len(matches) != 1:
+        return None
+    league, (team_a, team_b) = matches[0]
+
+    remainder = _strip(message, [DATE_RE, TIME_RE, team_a, team_b, league['name'], referee_names[0]])
+    venue_match = VENUE_RE.search(remainder)
+    venue = venue_match.group(1).strip() if venue_match else ''
+    if not venue:
+        return None
+
+    return {
+        "action": "create_game",
+        "title": "Game Scheduled! ⚡",
+        "body": f"{team_a} vs {team_b} is set for {date} at {time} at {venue}.",
+        "speak": "Game scheduled successfully!",
+        "source": "fast_path",
+        "data": {
+            "league_name": league['name'],
+            "team_a": team_a,
+            "team_b": team_b,
+            "date": date,
+            "time": time,
+            "venue": venue,
+            "referee": referee_names[0]
+        }
+    }
+
+
+def parse_league(message, leagues):
+    """Parse a 'key: value; key: value' league command into a create_league action"""
+    if not _is_command(message, LEAGUE_VERB_RE):
+        return None
+    fields = {}
+    segments = re.split(r'[;\n]', message)
+    # "create league Spring Cup; format: 7v7" names the league in the lead segment
+    segments[0] = LEAGUE_PREFIX_RE.sub('', segments[0], count=1)
+    if segments[0].strip() and not FIELD_RE.match(segments[0]):
+        fields['name'] = segments[0].strip()
+    for segment in segments:
+        match = FIELD_RE.match(segment)
+        if match and match.group(1).strip().lower() in LEAGUE_KEYS:
+            fields[LEAGUE_KEYS[match.group(1).strip().lower()]] = match.group(2)
+
+    required = ('name', 'format', 'start_date', 'end_date', 'teams')
+    if not all(fields.get(k) for k in required):
+        return None
+    fields['format'] = fields['format'].lower().replace(' ', '')
+    if fields['format'] not in ('5v5', '7v7'):
+        return None
+    start, end = _parse_date(fields['start_date']), _parse_date(fields['end_date'])
+    if not start or not end:
+        return None
+    teams = [t.strip() for t in fields['teams'].split(',') if t.strip()]
+    if len(teams) < 2:
+        return None
+
+    if any(l['name'].lower() == fields['name'].lower() for l in leagues):
+        return {
+            "action": "error",
+            "title": "Oops!",
+            "body": f"A league named '{fields['name']}' already exists. Please choose a different name.",
+            "speak": "Please try a different name",
+            "source": "fast_path"
+        }
+    if end <= start:
+        return {
+            "action": "error",
+            "title": "Oops!",
+            "body": "The end date must be after the start date.",
+            "speak": "Please check the dates",
+            "source": "fast_path"
+        }
+
+    fee_type = 'captain'
+    fee_amount = 0
+    if fields.get('fee_amount'):
+        amount = re.search(r'\d+(?:\.\d+)?', fields['fee_amount'])
+        if not amount:
+            return None
+        fee_amount = float(amount.group(0))
+        fee_amount = int(fee_amount) if fee_amount.is_integer() else fee_amount
+        if 'player' in fields['fee_amount'].lower():
+            fee_type = 'player'
+    if fields.get('fee_type'):
+        fee_type = 'player' if 'player' in fields['fee_type'].lower() else 'captain'
+
+    data = {
+        "name": fields['name'],
+        "format": fields['format'],
+        "start_date": start,
+        "end_date": end,
+        "teams": teams,
+        "fee_type": fee_type,
+        "fee_amount": fee_amount,
+        "venue": fields.get('venue', 'TBD'),
+        "schedule_preferences": fields.get('schedule_preferences', 'Weekends')
+    }
+    if fields.get('logo'):
+        data['logo'] = fields['logo']
+    return {
+        "action": "create_league",
+        "title": "League Created! 🎉",
+        "body": f"Your league '{data['name']}' is ready with {len(teams)} teams!",
+        "speak": "All done! Your league is created.",
+        "source": "fast_path",
+        "data": data
+    }
+
+
+def parse_info(message, leagues, stats):
+    """Answer simple league/game/fee questions from the stats counters into a show_info action
+
+    Questions about a particular team, league or attribute ("how many games
+    does Desert Storm have left?") return None and go to the model.
+    """
+    game_count = GAME_COUNT_RE.match(message)
+    if game_count and _only_filler(game_count.group(1)):
+        by_status = ', '.join(f"{count} {status.lower()}" for status, count in sorted(stats['games_by_status'].items()))
+        body = f"There are {stats['games']} games on the schedule"
+        return {
+            "action": "show_info",
+            "title": "Games",
+            "body": f"{body}: {by_status}." if by_status else f"{body}.",
+            "speak": f"{stats['games']} games in total",
+            "source": "fast_path"
+        }
+    team_count = TEAM_COUNT_RE.match(message)
+    if team_count:
+        named, league = _tail_league(team_count.group(1), leagues)
+        if league:
+            teams = len(league['teams'])
+            return {
+                "action": "show_info",
+                "title": f"{league['name']} Teams",
+                "body": f"{league['name']} has {teams} registered team{'s' if teams != 1 else ''}: "
+                        f"{', '.join(t['name'] for t in league['teams'])}." if teams else
+                        f"{league['name']} has no registered teams yet.",
+                "speak": f"{teams} teams in {league['name']}",
+                "source": "fast_path"
+            }
+        if not named:
+            return {
+                "action": "show_info",
+                "title": "Teams",
+                "body": f"{stats['teams']} teams are registered across {stats['leagues']} leagues.",
+                "speak": f"{stats['teams']} teams are registered",
+                "source": "fast_path"
+            }
+    fees = FEES_RE.match(message)
+    if fees:
+        named, league = _tail_league(fees.group(1), leagues)
+        if league:
+            amount = league.get('fee_amount') or 0
+            payer = 'player' if league.get('fee_type') == 'player' else 'team'
+            body = f"The entry fee for {league['name']} is ${amount:,.0f} per {payer}"
+            if payer == 'team':
+                body += f", ${amount * len(league['teams']):,.0f} across its {len(league['teams'])} teams"
+            return {
+                "action": "show_info",
+                "title": f"{league['name']} Entry Fee",
+                "body": body + ".",
+                "speak": f"${amount:,.0f} per {payer}",
+                "source": "fast_path"
+            }
+        if not named:
+            return {
+                "action": "show_info",
+                "title": "Entry Fees",
+                "body": f"Entry fees total ${stats['fee_total']:,.0f} across {stats['teams']} teams.",
+                "speak": "Here are the fee totals",
+                "source": "fast_path"
+            }
+    league_query = LEAGUE_QUERY_RE.match(message)
+    if league_query and _only_filler(league_query.group(1)):
+        listed = [f"{l['name']} ({l.get('format', '?')})" for l in leagues]
+        if not listed:
+            body = "There are no leagues yet."
+        elif len(listed) == 1:
+            body = f"You have 1 active league: {listed[0]}."
+        else:
+            body = f"You have {len(listed)} active leagues: {', '.join(listed[:-1])} and {listed[-1]}."
+        return {
+            "action": "show_info",
+            "title": "Current Leagues",
+            "body": body,
+            "speak": "Here are your leagues",
+            "source": "fast_path"
+        }
+    return None
+
+
+def parse_standings(message, leagues, standings):
+    """Answer "who's leading the Winter league" from a standings(league_id) DataFrame lookup"""
+    if standings is None or not STANDINGS_RE.search(message):
+        return None
+    league = _find_league(message, leagues)
+    if league is None:
+        return None
+    table = standings(league['id'])
+    played = table[table['played'] > 0]
+    if played.empty:
+        return {
+            "action": "show_info",
+            "title": f"🏆 {league['name']} Standings",
+            "body": f"No {league['name']} games have been played yet.",
+            "speak": "No results yet",
+            "source": "fast_path"
+        }
+    rows = [f"{r.rank}. {r.team} {r.wins}-{r.losses}-{r.ties} ({r.differential:+d})"
+            for r in played.head(5).itertuples()]
+    leader = played.iloc[0]
+    return {
+        "action": "show_info",
+        "title": f"🏆 {league['name']} Standings",
+        "body": f"{leader['team']} lead {league['name']} at {leader['wins']}-{leader['losses']}-{leader['ties']}. "
+                f"Top of the table: {', '.join(rows)}.",
+        "speak": f"{leader['team']} are on top",
+        "source": "fast_path"
+    }
+
+
+def parse_intent(message, leagues, referees, stats, standings=None):
+    """Return an action dict for a fully specified command, or None
+
+    `standings` is an optional callable returning a league's standings
+    DataFrame by league id.
+    """
+    return (parse_league(message, leagues)
+            or parse_game(message, leagues, referees)
+            or parse_standings(message, leagues, standings)
+            or parse_info(message, leagues, stats))
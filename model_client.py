@@ -0,0 +1,173 @@
+"""Timeout, retry and circuit-breaker wrapper around Gemini model calls"""
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from google.api_core import exceptions as api_exceptions
+
+from instrumentation import metrics as default_metrics, usage_tokens
+
+RETRYABLE_ERRORS = (
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.InternalServerError,
+    api_exceptions.TooManyRequests,
+    ConnectionError,
+    TimeoutError,
+)
+
+_DONE = object()
+
+
+class ModelUnavailable(Exception):
+    """Raised when the model cannot answer: breaker open, timeouts or retries exhausted"""
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures, retries after `reset_after` seconds"""
+
+    def __init__(self, failure_threshold=3, reset_after=30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def is_open(self):
+        """True while calls are being short-circuited"""
+        with self._lock:
+            return self.opened_at is not None and self._clock() - self.opened_at < self.reset_after
+
+    def allow(self):
+        """Return whether a call may go through; a half-open breaker lets one probe through"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._clock() - self.opened_at >= self.reset_after:
+                # Half-open: let this call probe, and hold the others off until it reports back
+                self.opened_at = self._clock()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = self._clock()
+
+
+class ModelClient:
+    """Runs generate_content on a worker pool with a deadline, backoff and a breaker
+
+    The Streamlit script thread only waits on futures/queues, so a hung call
+    costs at most `timeout` seconds per attempt instead of freezing the rerun.
+    """
+
+    def __init__(self, timeout=20, max_retries=2, base_delay=0.5, max_delay=4,
+                 breaker=None, max_workers=8, sleep=time.sleep, metrics=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini")
+        self._sleep = sleep
+        self.metrics = metrics or default_metrics
+
+    def backoff(self, attempt):
+        """Full-jitter exponential delay before retry number `attempt` (1-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def generate(self, model, prompt, on_chunk=None):
+        """Return the reply text; with on_chunk the reply is streamed and each chunk passed on
+
+        Retries only happen before any chunk has been delivered, so callers
+        never see a partial reply twice. Each call is recorded as a
+        'model.generate' span with attempts and token usage.
+        """
+        with self.metrics.span('model.generate', mode='stream' if on_chunk else 'call') as span:
+            if not self.breaker.allow():
+                span['outcome'] = 'breaker_open'
+                raise ModelUnavailable("The AI model is temporarily unavailable")
+            attempt = 0
+            while True:
+                delivered = []
+                try:
+                    if on_chunk:
+                        text, usage = self._stream(model, prompt, on_chunk, delivered)
+                    else:
+                        text, usage = self._call(model, prompt)
+                except RETRYABLE_ERRORS as e:
+                    attempt += 1
+                    if delivered or attempt > self.max_retries:
+                        self.breaker.record_failure()
+                        span.update(outcome='unavailable', attempts=attempt)
+                        raise ModelUnavailable(f"The AI model did not respond ({type(e).__name__})") from e
+                    self.metrics.count('model.retries')
+                    self._sleep(self.backoff(attempt))
+                    continue
+                except Exception:
+                    # The model answered, just not usably (blocked reply, bad request): that is
+                    # not an outage, so it neither counts against the breaker nor holds it half-open
+                    self.breaker.record_success()
+                    span.update(outcome='error', attempts=attempt + 1)
+                    raise
+                self.breaker.record_success()
+                span.update(outcome='ok', attempts=attempt + 1, prompt_chars=len(prompt), reply_chars=len(text))
+                if usage:
+                    span.update(prompt_tokens=usage[0], completion_tokens=usage[1])
+                    self.metrics.count('model.prompt_tokens', usage[0])
+                    self.metrics.count('model.completion_tokens', usage[1])
+                return text
+
+    def _call(self, model, prompt):
+        future = self._executor.submit(
+            model.generate_content, prompt, request_options={"timeout": self.timeout}
+        )
+        try:
+            response = future.result(timeout=self.timeout)
+            return response.text, usage_tokens(response)
+        except FutureTimeout:
+            future.cancel()
+            raise TimeoutError(f"No reply within {self.timeout}s")
+
+    def _stream(self, model, prompt, on_chunk, delivered):
+        chunks = queue.Queue()
+        # Token usage arrives on the final chunk
+        usage = [None]
+
+        def pump():
+            try:
+                for chunk in model.generate_content(prompt, stream=True, request_options={"timeout": self.timeout}):
+                    usage[0] = usage_tokens(chunk) or usage[0]
+                    chunks.put(chunk.text)
+            except Exception as e:
+                chunks.put(e)
+            chunks.put(_DONE)
+
+        self._executor.submit(pump)
+        deadline = time.monotonic() + self.timeout
+        parts = []
+        while True:
+            try:
+                item = chunks.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise TimeoutError(f"No reply within {self.timeout}s")
+            if item is _DONE:
+                return ''.join(parts), usage[0]
+            if isinstance(item, Exception):
+                raise item
+            parts.append(item)
+            delivered.append(True)
+            on_chunk(item)
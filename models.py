@@ -0,0 +1,256 @@
+"""Typed records and validation for leagues, games and chatbot actions"""
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import lru_cache
+
+FORMATS = ('5v5', '7v7')
+FEE_TYPES = ('captain', 'player')
+ACTIONS = ('ask_question', 'create_league', 'create_game', 'create_games', 'show_info', 'error')
+GAME_STATUSES = ('Scheduled', 'In Progress', 'Final', 'Cancelled')
+MAX_BATCH_GAMES = 50
+
+
+class ValidationError(ValueError):
+    """Raised when a league, game or chatbot action is malformed"""
+
+
+@dataclass(slots=True)
+class Team:
+    id: int
+    name: str
+    logo: str | None = None
+
+
+@dataclass(slots=True)
+class League:
+    name: str
+    format: str
+    start_date: str
+    end_date: str
+    teams: list = field(default_factory=list)
+    id: int | None = None
+    logo: str | None = None
+    fee_type: str = 'captain'
+    fee_amount: float = 0
+    venue: str = 'TBD'
+    schedule_preferences: str = 'Weekends'
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class Game:
+    league_name: str
+    team_a: str
+    team_b: str
+    date: str
+    time: str
+    venue: str = 'TBD'
+    referee: str | None = None
+    league_id: int | None = None
+    team_a_logo: str = '🏈'
+    team_b_logo: str = '🏈'
+    status: str = 'Scheduled'
+    score_a: int | None = None
+    score_b: int | None = None
+    id: int | None = None
+
+    def to_dict(self):
+        # Every field is a scalar, so skip asdict's recursive deep copy
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True)
+class ChatAction:
+    action: str
+    title: str
+    body: str
+    speak: str | None = None
+    data: League | Game | list | None = None
+    current_step: int | None = None
+    total_steps: int | None = None
+    conversation_state: dict | None = None
+
+
+def _text(data, key, required=True, default=None):
+    value = data.get(key)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise ValidationError(f"Missing {key.replace('_', ' ')}")
+        return default
+    if not isinstance(value, (str, int, float)):
+        raise ValidationError(f"Invalid {key.replace('_', ' ')}")
+    return str(value).strip()
+
+
+# Bulk imports repeat the same dates and kickoff times, and strptime is slow
+@lru_cache(maxsize=4096)
+def _normalize_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _normalize_time(value):
+    for pattern in ('%H:%M', '%H:%M:%S'):
+        try:
+            return datetime.strptime(value, pattern).strftime('%H:%M')
+        except ValueError:
+            continue
+    return None
+
+
+def _date(data, key):
+    value = _text(data, key)
+    normalized = _normalize_date(value)
+    if normalized is None:
+        raise ValidationError(f"{key.replace('_', ' ').capitalize()} must be YYYY-MM-DD, got '{value}'")
+    return normalized
+
+
+def _time(data, key):
+    value = _text(data, key)
+    normalized = _normalize_time(value)
+    if normalized is None:
+        raise ValidationError(f"Time must be HH:MM, got '{value}'")
+    return normalized
+
+
+def _score(data, key):
+    value = data.get(key)
+    if value is None or value == '':
+        return None
+    try:
+        score = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"Invalid {key.replace('_', ' ')}")
+    if score < 0:
+        raise ValidationError(f"{key.replace('_', ' ').capitalize()} cannot be negative")
+    return score
+
+
+def validate_league(data):
+    """Check league fields and return a League record"""
+    if not isinstance(data, dict):
+        raise ValidationError("League data must be an object")
+    league_format = _text(data, 'format').lower().replace(' ', '')
+    if league_format not in FORMATS:
+        raise ValidationError(f"Format must be one of {', '.join(FORMATS)}")
+    start_date, end_date = _date(data, 'start_date'), _date(data, 'end_date')
+    if end_date <= start_date:
+        raise ValidationError("End date must be after start date")
+
+    raw_teams = data.get('teams') or []
+    if isinstance(raw_teams, str):
+        raw_teams = [t.strip() for t in raw_teams.split(',')]
+    if not isinstance(raw_teams, list):
+        raise ValidationError("Teams must be a list of names")
+    teams = []
+    for idx, team in enumerate(raw_teams):
+        if isinstance(team, dict):
+            name, logo = team.get('name'), team.get('logo')
+        else:
+            name, logo = team, None
+        if not isinstance(name, str) or not name.strip():
+            continue
+        teams.append(Team(id=idx + 1, name=name.strip(), logo=logo))
+    names = [t.name.lower() for t in teams]
+    if len(set(names)) != len(names):
+        raise ValidationError("Team names must be unique")
+
+    fee_type = (_text(data, 'fee_type', required=False, default='captain')).lower()
+    if fee_type not in FEE_TYPES:
+        raise ValidationError(f"Fee type must be one of {', '.join(FEE_TYPES)}")
+    try:
+        fee_amount = float(data.get('fee_amount') or 0)
+    except (TypeError, ValueError):
+        raise ValidationError("Fee amount must be a number")
+    if fee_amount < 0:
+        raise ValidationError("Fee amount cannot be negative")
+
+    return League(
+        name=_text(data, 'name'),
+        format=league_format,
+        start_date=start_date,
+        end_date=end_date,
+        teams=teams,
+        id=data.get('id'),
+        logo=_text(data, 'logo', required=False),
+        fee_type=fee_type,
+        fee_amount=int(fee_amount) if fee_amount.is_integer() else fee_amount,
+        venue=_text(data, 'venue', required=False, default='TBD'),
+        schedule_preferences=_text(data, 'schedule_preferences', required=False, default='Weekends'),
+    )
+
+
+def validate_game(data):
+    """Check game fields and return a Game record"""
+    if not isinstance(data, dict):
+        raise ValidationError("Game data must be an object")
+    team_a, team_b = _text(data, 'team_a'), _text(data, 'team_b')
+    if team_a.lower() == team_b.lower():
+        raise ValidationError("Team A and Team B must be different")
+    status = _text(data, 'status', required=False, default='Scheduled')
+    if status not in GAME_STATUSES:
+        raise ValidationError(f"Status must be one of {', '.join(GAME_STATUSES)}")
+    game = Game(
+        league_name=_text(data, 'league_name'),
+        team_a=team_a,
+        team_b=team_b,
+        date=_date(data, 'date'),
+        time=_time(data, 'time'),
+        venue=_text(data, 'venue', required=False, default='TBD'),
+        referee=_text(data, 'referee', required=False),
+        league_id=data.get('league_id'),
+        status=status,
+        score_a=_score(data, 'score_a'),
+        score_b=_score(data, 'score_b'),
+        id=data.get('id'),
+    )
+    for key in ('team_a_logo', 'team_b_logo'):
+        if data.get(key):
+            setattr(game, key, data[key])
+    return game
+
+
+def validate_action(payload):
+    """Check a chatbot reply and return a ChatAction with typed data"""
+    if not isinstance(payload, dict):
+        raise ValidationError("Response must be a JSON object")
+    action = payload.get('action')
+    if action not in ACTIONS:
+        raise ValidationError(f"Unknown action '{action}'")
+    data = None
+    if action == 'create_league':
+        data = validate_league(payload.get('data'))
+    elif action == 'create_game':
+        data = validate_game(payload.get('data'))
+    elif action == 'create_games':
+        # Entries are validated one by one when scheduled, so each can fail on its own
+        data = payload.get('data')
+        if isinstance(data, dict):
+            data = data.get('games')
+        if not isinstance(data, list) or not data:
+            raise ValidationError("create_games needs a non-empty list of games")
+        if len(data) > MAX_BATCH_GAMES:
+            raise ValidationError(f"At most {MAX_BATCH_GAMES} games can be scheduled at once")
+    state = payload.get('conversation_state')
+    if state is not None and not isinstance(state, dict):
+        raise ValidationError("conversation_state must be an object")
+    steps = {}
+    for key in ('current_step', 'total_steps'):
+        value = payload.get(key)
+        steps[key] = value if isinstance(value, int) and not isinstance(value, bool) else None
+    return ChatAction(
+        action=action,
+        title=str(payload.get('title', '')),
+        body=str(payload.get('body', '')),
+        speak=payload.get('speak') if isinstance(payload.get('speak'), str) else None,
+        data=data,
+        conversation_state=state,
+        **steps,
+    )
+
@@ -0,0 +1,159 @@
+"""Forgiving lookup of league and team names the model spells loosely
+
+Names are folded before lookup: accents, case and punctuation are dropped
+and "&" reads as "and", so "phoenix winter, 2025" is "Phoenix Winter 2025".
+A folded name is found in one dict lookup. Failing that, the name is
+compared word by word. Each word matches the same word or one edit away from
+it (found through an index of single-character deletions, so no scan over
+the vocabulary). A name resolves when exactly one entry holds every query
+word ("Winter 2025"), or when exactly one entry's words all appear in the
+query ("Phoenix Winter 2025 League"). Anything ambiguous resolves to None,
+and suggest() lists the nearest names instead.
+"""
+import re
+import unicodedata
+from collections import Counter
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+# Words the model adds or leaves out freely; they never decide a match
+FILLER_WORDS = frozenset({'the', 'league', 'team', 'and', 'of', 'fc'})
+# Shorter words ("Jets" vs "Nets") and numbers ("2024" vs "2025") must match exactly
+MIN_FUZZY_LENGTH = 5
+
+
+def fold(name):
+    """Accent-, case- and punctuation-folded words of a name joined by single spaces"""
+    text = unicodedata.normalize('NFKD', str(name or '')).encode('ascii', 'ignore').decode()
+    return ' '.join(WORD_RE.findall(text.lower().replace('&', ' and ')))
+
+
+def _deletes(word):
+    """The word and every variant of it with one character removed"""
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _fuzzy(word):
+    return len(word) >= MIN_FUZZY_LENGTH and not word.isdigit()
+
+
+def edit_distance(a, b, limit=1):
+    """Optimal string alignment distance (transpositions count once), capped at limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if before is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        # A transposition reaches back two rows, so stop only when both are past the limit
+        if min(current) > limit and min(previous) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def _key_words(key):
+    words = [w for w in key.split() if w not in FILLER_WORDS]
+    # A name made only of filler words still needs something to match on
+    return set(words or key.split())
+
+
+class NameIndex:
+    """Resolve loosely written names to values; built once from (name, value) pairs"""
+
+    def __init__(self, items):
+        self.names = []
+        self.values = []
+        self._exact = {}
+        self._compact = {}
+        self._entry_words = []
+        self._word_entries = {}
+        self._deletions = {}
+        for name, value in items:
+            key = fold(name)
+            if not key:
+                continue
+            entry = len(self.values)
+            self.names.append(name)
+            self.values.append(value)
+            # First entry wins on a repeated name, like get_league_by_name
+            self._exact.setdefault(key, entry)
+            self._compact.setdefault(key.replace(' ', ''), entry)
+            words = _key_words(key)
+            self._entry_words.append(words)
+            for word in words:
+                if word not in self._word_entries:
+                    self._word_entries[word] = []
+                    if _fuzzy(word):
+                        for variant in _deletes(word):
+                            self._deletions.setdefault(variant, set()).add(word)
+                self._word_entries[word].append(entry)
+
+    def __len__(self):
+        return len(self.values)
+
+    def _similar_words(self, word):
+        """Indexed words equal to word or one edit away from it"""
+        if word in self._word_entries:
+            return {word}
+        if not _fuzzy(word):
+            return set()
+        near = set()
+        for variant in _deletes(word):
+            near |= self._deletions.get(variant, set())
+        return {w for w in near if edit_distance(word, w) <= 1}
+
+    def _overlap(self, words):
+        """Counter of entry -> how many of the query words it holds"""
+        counts = Counter()
+        for word in words:
+            entries = set()
+            for similar in self._similar_words(word):
+                entries.update(self._word_entries[similar])
+            counts.update(entries)
+        return counts
+
+    def lookup(self, name):
+        """Index of the entry a name refers to, or None when unknown or ambiguous"""
+        key = fold(name)
+        if not key:
+            return None
+        entry = self._exact.get(key)
+        if entry is None:
+            entry = self._compact.get(key.replace(' ', ''))
+        if entry is not None:
+            return entry
+        words = _key_words(key)
+        counts = self._overlap(words)
+        holding = [e for e, n in counts.items() if n == len(words)]
+        if len(holding) > 1:
+            # "Sun Devls" matches "Sun Devils" and "Sun Devils B"; prefer the one with no extra words
+            holding = [e for e in holding if len(self._entry_words[e]) == len(words)]
+            return holding[0] if len(holding) == 1 else None
+        if holding:
+            return holding[0]
+        held = [e for e, n in counts.items() if n == len(self._entry_words[e])]
+        if not held:
+            return None
+        most = max(len(self._entry_words[e]) for e in held)
+        held = [e for e in held if len(self._entry_words[e]) == most]
+        return held[0] if len(held) == 1 else None
+
+    def get(self, name):
+        """Value whose folded name equals name's folded form, or None"""
+        entry = self._exact.get(fold(name))
+        return None if entry is None else self.values[entry]
+
+    def resolve(self, name):
+        """Value for a loosely written name, or None"""
+        entry = self.lookup(name)
+        return None if entry is None else self.values[entry]
+
+    def suggest(self, name, limit=3):
+        """Names sharing the most words with name, best first"""
+        counts = self._overlap(_key_words(fold(name)))
+        ranked = sorted(counts, key=lambda e: (-counts[e] / len(self._entry_words[e]), e))
+        return [self.names[e] for e in ranked[:limit]]
@@ -0,0 +1,117 @@
+"""Process-wide, read-only snapshots of leagues, teams and referees
+
+Every Streamlit session used to carry its own copy of the reference data.
+Sessions now share one immutable ReferenceSnapshot per reference version of
+the repository, which only leagues, teams and referees move (game writes
+do not). The first reader after such a write rebuilds it, everyone else
+gets the same object. Snapshots are frozen: mappings are read-only proxies
+and lists are tuples.
+Each snapshot also carries name indexes for resolving the league and team
+names the chatbot writes.
+"""
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from name_index import NameIndex
+
+
+def freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class ReferenceSnapshot:
+    version: int
+    leagues: tuple
+    referees: tuple
+    _by_id: MappingProxyType
+    _by_name: MappingProxyType
+    # Name indexes, built on first use: most snapshots never resolve a name
+    _names: dict
+
+    @classmethod
+    def build(cls, version, leagues, referees):
+        leagues = freeze(leagues)
+        return cls(
+            version=version,
+            leagues=leagues,
+            referees=tuple(referees),
+            _by_id=MappingProxyType({l['id']: l for l in leagues}),
+            # First league wins on a repeated name, like get_league_by_name
+            _by_name=MappingProxyType({l['name']: l for l in reversed(leagues)}),
+            _names={},
+        )
+
+    def league(self, league_id):
+        """Return a league by id, or None"""
+        return self._by_id.get(league_id)
+
+    def league_by_name(self, name, folded=False):
+        """Return a league by exact name, or None; `folded` ignores case, accents and punctuation"""
+        if folded:
+            return self._name_index().get(name)
+        return self._by_name.get(name)
+
+    def _name_index(self, league_id=None):
+        """NameIndex over league names, or over one league's teams"""
+        index = self._names.get(league_id)
+        if index is None:
+            if league_id is None:
+                items = ((l['name'], l) for l in self.leagues)
+            else:
+                items = ((t['name'], t) for t in self._by_id[league_id]['teams'])
+            # Two sessions may build the same index at once; either copy will do
+            index = self._names.setdefault(league_id, NameIndex(items))
+        return index
+
+    def resolve_league(self, name):
+        """Return the league a loosely written name refers to (see name_index), or None"""
+        return self._by_name.get(name) or self._name_index().resolve(name)
+
+    def resolve_team(self, league_id, name):
+        """Return the team of a league a loosely written name refers to, or None"""
+        if league_id not in self._by_id:
+            return None
+        return self._name_index(league_id).resolve(name)
+
+    def suggest_leagues(self, name, limit=3):
+        """League names closest to an unresolved name"""
+        return self._name_index().suggest(name, limit)
+
+    def suggest_teams(self, league_id, name, limit=3):
+        """Team names of a league closest to an unresolved name"""
+        if league_id not in self._by_id:
+            return []
+        return self._name_index(league_id).suggest(name, limit)
+
+    def league_names(self):
+        return [l['name'] for l in self.leagues]
+
+
+class ReferenceCache:
+    """Hands out the snapshot for the repository's current reference version"""
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self.builds = 0
+
+    def snapshot(self):
+        """Return the shared snapshot, rebuilding it once after each league, team or referee write"""
+        current = self._snapshot
+        if current is not None and current.version == self.repo.reference_version:
+            return current
+        with self._lock:
+            # Re-check: another session may have rebuilt it while we waited
+            version = self.repo.reference_version
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = ReferenceSnapshot.build(version, self.repo.list_leagues(), self.repo.list_referees())
+                self.builds += 1
+            return self._snapshot
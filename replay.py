@@ -0,0 +1,214 @@
+"""Record chatbot model traffic and replay it offline
+
+With PFFL_RECORD_PATH set, every model call made by get_ai_response is
+appended as one JSON line: the user message, the context_data sent with it
+and the raw reply text. Paths ending in .zst are written as zstd frames
+(needs the optional `zstandard` package).
+
+Replay runs the chat page's parse-and-act steps on each recorded reply:
+parse_reply, then validate_action, then a dry run of the action against a
+repository. The dry run calls the chat page's own checks (chat_actions):
+league and team names are resolved, the league must exist and the teams be
+two different members of its roster, the pairing must not be scheduled yet,
+the venue and referee must be free and a new league's name must be unused.
+Nothing is written and no model is called.
+
+    python replay.py traffic.jsonl[.zst] [--db pffl.db] [--show 10]
+
+A record may carry an "expected" object ({"action": ..., "outcome": ...})
+added by hand; replay then also reports how many replies matched it.
+"""
+import argparse
+import atexit
+import io
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from chat_actions import check_game, check_games, check_league, outcome
+from models import ValidationError, validate_action
+from reference_data import ReferenceCache
+from response_parser import parse_reply
+
+# Records buffered per zstd frame; plain JSON-lines logs are written line by line
+FRAME_RECORDS = 100
+
+
+def _require_zstd(path):
+    if zstandard is None:
+        raise RuntimeError(f"{path}: .zst logs need the zstandard package (pip install zstandard)")
+
+
+class Recorder:
+    """Thread-safe appender of (message, context, raw reply) records"""
+
+    def __init__(self, path, frame_records=FRAME_RECORDS):
+        self.path = path
+        self.compressed = path.endswith('.zst')
+        if self.compressed:
+            _require_zstd(path)
+            self._compressor = zstandard.ZstdCompressor(level=10)
+            atexit.register(self.flush)
+        self.frame_records = frame_records
+        self._lock = threading.Lock()
+        self._pending = []
+        if self.compressed:
+            self._file = open(path, 'ab')
+        else:
+            self._file = open(path, 'a', encoding='utf-8', buffering=1)
+
+    def record(self, message, context, reply):
+        line = json.dumps({'ts': datetime.now().isoformat(timespec='seconds'), 'message': message,
+                           'context': context, 'reply': reply}, ensure_ascii=False, separators=(',', ':'), default=str)
+        with self._lock:
+            if not self.compressed:
+                self._file.write(line + '\n')
+                return
+            self._pending.append(line)
+            if len(self._pending) >= self.frame_records:
+                self._write_frame()
+
+    def _write_frame(self):
+        # Each frame is a complete zstd stream, so a crash loses at most the pending records
+        if self._pending:
+            self._file.write(self._compressor.compress(('\n'.join(self._pending) + '\n').encode('utf-8')))
+            self._file.flush()
+            self._pending = []
+
+    def flush(self):
+        with self._lock:
+            if self.compressed:
+                self._write_frame()
+            self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def read_records(path):
+    """Yield recorded dicts from a .jsonl or .jsonl.zst log, skipping damaged lines"""
+    if path.endswith('.zst'):
+        _require_zstd(path)
+        raw = open(path, 'rb')
+        stream = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True), encoding='utf-8')
+    else:
+        stream = open(path, encoding='utf-8')
+    with stream:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def dry_run(action, repo, snapshot=None):
+    """What acting on a validated ChatAction would do, without writing anything
+
+    Runs the chat page's own checks (chat_actions). `snapshot` is the
+    repository's ReferenceSnapshot, built here when not given.
+    """
+    if repo is None or action.action not in ('create_game', 'create_games', 'create_league'):
+        return 'ok'
+    snapshot = snapshot or ReferenceCache(repo).snapshot()
+    try:
+        if action.action == 'create_league':
+            check_league(snapshot, action.data)
+        elif action.action == 'create_game':
+            check_game(repo, snapshot, action.data)
+        else:
+            accepted, failures = check_games(repo, snapshot, action.data)
+            # A batch succeeds when at least one game would be scheduled, like the chat page
+            if not accepted:
+                return failures[0]['outcome'] if failures else 'invalid'
+    except ValidationError as e:
+        return outcome(e)
+    return 'ok'
+
+
+def replay_record(record, repo=None, snapshot=None):
+    """Run one record through parse and act; returns (action, outcome, error, parse seconds)"""
+    started = time.perf_counter()
+    reply = parse_reply(record.get('reply') or '')
+    elapsed = time.perf_counter() - started
+    if reply is None:
+        return None, 'parse_failed', 'no JSON object in reply', elapsed
+    try:
+        action = validate_action(reply)
+    except ValidationError as e:
+        return reply.get('action'), 'invalid', str(e), elapsed
+    return action.action, dry_run(action, repo, snapshot), None, elapsed
+
+
+def replay(records, repo=None):
+    """Replay every record and return a summary dict plus the failing records"""
+    outcomes = Counter()
+    actions = Counter()
+    parse_times = []
+    failures = []
+    expected = matched = 0
+    # Nothing is written during a replay, so one snapshot serves every record
+    snapshot = ReferenceCache(repo).snapshot() if repo else None
+    started = time.perf_counter()
+    for index, record in enumerate(records):
+        action, outcome, error, elapsed = replay_record(record, repo, snapshot)
+        parse_times.append(elapsed)
+        outcomes[outcome] += 1
+        actions[action or '-'] += 1
+        want = record.get('expected')
+        if isinstance(want, dict):
+            expected += 1
+            ok = want.get('action', action) == action and want.get('outcome', outcome) == outcome
+            matched += ok
+            if not ok:
+                error = error or f"expected {want}, got action={action} outcome={outcome}"
+        if error or outcome != 'ok':
+            failures.append({'index': index, 'message': record.get('message', '')[:80], 'action': action,
+                             'outcome': outcome, 'error': error})
+    total = time.perf_counter() - started
+    times = np.array(parse_times or [0.0]) * 1e6
+    p50, p95, p99 = np.quantile(times, (0.5, 0.95, 0.99))
+    return {
+        'records': len(parse_times),
+        'records_per_s': round(len(parse_times) / total) if total else 0,
+        'parse_us': {'p50': round(p50, 1), 'p95': round(p95, 1), 'p99': round(p99, 1)},
+        'actions': dict(actions),
+        'outcomes': dict(outcomes),
+        'expected': expected,
+        'matched': matched,
+    }, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded chatbot replies offline")
+    parser.add_argument('log', help="JSON-lines log written with PFFL_RECORD_PATH (.jsonl or .jsonl.zst)")
+    parser.add_argument('--db', help="SQLite database to dry-run actions against (default: parse and validate only)")
+    parser.add_argument('--show', type=int, default=10, help="how many failing records to print")
+    args = parser.parse_args()
+
+    repo = None
+    if args.db:
+        from storage import LeagueRepository
+        repo = LeagueRepository(args.db)
+    summary, failures = replay(read_records(args.log), repo)
+    print(json.dumps(summary, indent=2))
+    for failure in failures[:args.show]:
+        print(f"#{failure['index']} {failure['outcome']}: {failure['message']!r} ({failure['error'] or failure['action']})")
+    if repo:
+        repo.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""LRU/TTL cache for read-only chatbot answers"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Words that point back at an earlier turn ("and their fees?"); such questions depend on the history
+FOLLOW_UP_RE = re.compile(
+    r"^(?:and|so|what about|how about)\b|"
+    r"\b(?:it|its|that|those|they|them|their|he|she|him|her|his|same|else|instead|again)\b"
+)
+
+
+def normalize_message(message):
+    """Fold case, punctuation and whitespace so equivalent questions share a key"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', message.lower()).split())
+
+
+def refers_back(message):
+    """Whether a question leans on earlier turns and so cannot be answered from the cache"""
+    return bool(FOLLOW_UP_RE.search(normalize_message(message)))
+
+
+class ResponseCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds"""
+
+    def __init__(self, maxsize=256, ttl=300, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return a copy of the cached value, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (self._clock(), dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
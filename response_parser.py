@@ -0,0 +1,109 @@
+"""Parsing helpers for Gemini chatbot replies"""
+import json
+import re
+
+
+class StreamingFields:
+    """Pull string fields out of a JSON reply while it is still streaming
+
+    Each call to feed() appends a chunk and returns the decoded text seen so
+    far for every tracked field; `done` holds the fields whose closing quote
+    has arrived. Only the first occurrence of each key is tracked.
+    """
+
+    def __init__(self, fields=('title', 'body')):
+        self.buffer = ''
+        self.values = {}
+        self.done = set()
+        self._patterns = {f: re.compile(r'"%s"\s*:\s*"' % re.escape(f)) for f in fields}
+        self._starts = {}
+        self._ends = {}
+
+    def feed(self, chunk):
+        """Add a chunk of reply text and return the fields decoded so far"""
+        self.buffer += chunk
+        for field, pattern in self._patterns.items():
+            if field in self.done:
+                continue
+            if field not in self._starts:
+                match = pattern.search(self.buffer)
+                if not match:
+                    continue
+                self._starts[field] = self._ends[field] = match.end()
+            self._scan(field)
+        return self.values
+
+    def _scan(self, field):
+        start = self._starts[field]
+        pos = self._ends[field]
+        buffer = self.buffer
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '\\':
+                if pos + 1 >= len(buffer):
+                    break
+                pos += 2
+                continue
+            if char == '"':
+                self.values[field] = _decode(buffer[start:pos])
+                self.done.add(field)
+                return
+            pos += 1
+        self._ends[field] = pos
+        self.values[field] = _decode_partial(buffer[start:pos])
+
+
+def _decode(raw):
+    try:
+        return json.loads('"' + raw + '"')
+    except json.JSONDecodeError:
+        return raw
+
+
+def _decode_partial(raw):
+    # A chunk can end halfway through an escape like \u00e9; drop the unfinished tail
+    for trim in range(0, 6):
+        try:
+            return json.loads('"' + raw[:len(raw) - trim] + '"')
+        except json.JSONDecodeError:
+            continue
+    return raw
+
+
+_decoder = json.JSONDecoder()
+
+
+def extract_json_object(text):
+    """Return the first JSON object in a reply, or None
+
+    Tries json's raw_decode at each '{' in turn, so markdown fences, prose
+    around the object, stray braces and trailing extra objects are skipped
+    without any pre-cleaning. An object carrying an "action" key wins over
+    any earlier object that does not.
+    """
+    first = None
+    pos = text.find('{')
+    while pos != -1:
+        try:
+            value, end = _decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            pos = text.find('{', pos + 1)
+            continue
+        if isinstance(value, dict):
+            if 'action' in value:
+                return value
+            if first is None:
+                first = value
+        pos = text.find('{', end)
+    return first
+
+
+def parse_reply(text):
+    """Extract the reply object and fill in the fields the chat page relies on, or None"""
+    reply = extract_json_object(text)
+    if reply is None:
+        return None
+    reply.setdefault('action', 'show_info')
+    reply.setdefault('title', 'AI Response')
+    reply.setdefault('body', 'Processing your request...')
+    return reply
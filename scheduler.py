@@ -0,0 +1,171 @@
+"""Round-robin season schedule generator
+
+Pairings come from the circle method; a greedy constraint pass then places
+them into (date, time, venue) slots day by day, honouring venue capacity,
+referee double-booking and availability, team rest days, the league's
+schedule preference and any games already on the calendar.
+"""
+from collections import Counter, deque
+from collections.abc import Mapping
+from datetime import date as date_type, datetime, timedelta
+
+from storage import BookingIndex
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+DAY_SLOTS = ['09:00', '10:30', '12:00', '13:30', '15:00', '16:30']
+EVENING_SLOTS = ['18:00', '19:30']
+
+
+class SchedulingError(ValueError):
+    """Raised when a season cannot be generated from the given inputs"""
+
+
+def round_robin(teams, double=False):
+    """Pair every team with every other using the circle method
+
+    Returns a list of rounds, each a list of (home, away) pairs. An odd
+    team count gets a bye each round. Home/away alternates by round so no
+    team is always listed first; `double` appends the return fixtures.
+    """
+    teams = list(teams)
+    if len(teams) < 2:
+        return []
+    if len(teams) % 2:
+        teams.append(None)
+    fixed, rotating = teams[0], teams[1:]
+    half = len(teams) // 2
+    rounds = []
+    for idx in range(len(teams) - 1):
+        lineup = [fixed] + rotating
+        pairs = []
+        for i in range(half):
+            home, away = lineup[i], lineup[-1 - i]
+            if home is None or away is None:
+                continue
+            pairs.append((away, home) if (idx + i) % 2 else (home, away))
+        rounds.append(pairs)
+        rotating = rotating[-1:] + rotating[:-1]
+    if double:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+
+def allowed_weekdays(preference):
+    """Map a schedule preference such as 'Weekends' or 'Weekday evenings' to weekday numbers"""
+    text = (preference or '').lower()
+    days = {idx for idx, name in enumerate(WEEKDAYS) if name in text or name[:3] + 's' in text}
+    if 'weekend' in text:
+        days |= {5, 6}
+    if 'weekday' in text:
+        days |= {0, 1, 2, 3, 4}
+    return days or set(range(7))
+
+
+def default_slot_times(preference):
+    """Kickoff times implied by a schedule preference"""
+    return EVENING_SLOTS if 'evening' in (preference or '').lower() else DAY_SLOTS
+
+
+def _as_date(value):
+    return value if isinstance(value, date_type) else datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def generate_season(league, referees, venues=None, slot_times=None, rest_days=1,
+                    start_date=None, end_date=None, double=False,
+                    referee_availability=None, is_booked=None, meetings=None):
+    """Build a conflict-free round-robin season for a league
+
+    `rest_days` is the number of full days a team gets off between games.
+    `referee_availability` optionally maps a referee to the weekday numbers
+    they can work. `is_booked(kind, name, date, time)` reports venue and
+    referee bookings already on the calendar (see
+    LeagueRepository.is_booked). `meetings` maps (team_a, team_b) to the
+    number of games the league already has in that order; only the missing
+    fixtures are scheduled, one home and one away leg per pair with
+    `double`. Returns (games, unscheduled) where unscheduled lists the pairs
+    that did not fit before end_date.
+    """
+    teams = [t['name'] if isinstance(t, Mapping) else t for t in league.get('teams', [])]
+    if len(teams) < 2:
+        raise SchedulingError("A league needs at least two teams to build a schedule")
+    venues = [v for v in (venues or [league.get('venue')]) if v and v != 'TBD'] or ['TBD']
+    referees = list(referees)
+    if not referees:
+        raise SchedulingError("At least one referee is needed to build a schedule")
+    preference = league.get('schedule_preferences')
+    slot_times = sorted(slot_times or default_slot_times(preference))
+    weekdays = allowed_weekdays(preference)
+    start = _as_date(start_date or league['start_date'])
+    end = _as_date(end_date or league['end_date'])
+    if end < start:
+        raise SchedulingError("The season end date is before its start date")
+    availability = referee_availability or {}
+
+    # New games are booked here with negative ids until stored; the calendar is asked through is_booked
+    bookings = BookingIndex()
+
+    def busy(kind, name, day, time):
+        return bool(bookings.overlapping(kind, name, day, time)) or bool(is_booked and is_booked(kind, name, day, time))
+
+    # An existing game fills the fixture with the same home team; single round-robin needs either order
+    remaining = Counter(meetings or {})
+    pending = deque()
+    for home, away in (pair for pairs in round_robin(teams, double) for pair in pairs):
+        if remaining[(home, away)]:
+            remaining[(home, away)] -= 1
+        elif not double and remaining[(away, home)]:
+            remaining[(away, home)] -= 1
+        else:
+            pending.append((home, away))
+    last_played = {}
+    games = []
+    rest = timedelta(days=rest_days)
+    day = start
+    while pending and day <= end:
+        if day.weekday() not in weekdays:
+            day += timedelta(days=1)
+            continue
+        iso_day = day.isoformat()
+        day_referees = [r for r in referees if day.weekday() in availability.get(r, range(7))]
+        # Free (time, venue) slots for the day, earliest first
+        free = deque((t, v) for t in slot_times for v in venues
+                     if v == 'TBD' or not busy('venue', v, iso_day, t))
+        busy_today = set()
+        deferred = deque()
+        while pending and free:
+            home, away = pending.popleft()
+            if home in busy_today or away in busy_today or \
+                    any(team in last_played and day - last_played[team] <= rest for team in (home, away)):
+                deferred.append((home, away))
+                continue
+            placed = False
+            for _ in range(len(free)):
+                time, venue = free.popleft()
+                if venue != 'TBD' and busy('venue', venue, iso_day, time):
+                    continue
+                referee = next((r for r in day_referees if not busy('referee', r, iso_day, time)), None)
+                if referee is None:
+                    continue
+                games.append({
+                    'league_id': league.get('id'),
+                    'league_name': league['name'],
+                    'team_a': home,
+                    'team_b': away,
+                    'date': iso_day,
+                    'time': time,
+                    'venue': venue,
+                    'referee': referee,
+                    'status': 'Scheduled'
+                })
+                bookings.add(dict(games[-1], id=-len(games)))
+                busy_today.update((home, away))
+                last_played[home] = last_played[away] = day
+                placed = True
+                break
+            if not placed:
+                deferred.append((home, away))
+                break
+        deferred.extend(pending)
+        pending = deferred
+        day += timedelta(days=1)
+    return games, list(pending)
@@ -0,0 +1,246 @@
+"""League standings from final scores, computed with NumPy and pandas
+
+Every league keeps per-team counter arrays (W/L/T, points for/against)
+that are adjusted in O(1) when a score is entered or corrected. The ranked
+table (win percentage, streaks and tie-breakers) is rebuilt from the
+league's results in vectorised form on first read and cached until the
+next change.
+
+Ranking: win percentage (ties count half), then head-to-head win
+percentage among the teams level on win percentage, then point
+differential, then points for, then team name.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['rank', 'team', 'played', 'wins', 'losses', 'ties', 'points_for',
+           'points_against', 'differential', 'win_pct', 'streak']
+
+
+def is_final(game):
+    """True when a game counts towards the standings"""
+    return game.get('status') == 'Final' and game.get('score_a') is not None and game.get('score_b') is not None
+
+
+def _kickoff(game):
+    """Kickoff as a sortable YYYYMMDDHHMM integer (0 when the date or time is malformed)"""
+    try:
+        return int(game['date'].replace('-', '')) * 10000 + int(game['time'].replace(':', '')[:4])
+    except (AttributeError, KeyError, ValueError):
+        return 0
+
+
+def _perspective(team_a, team_b, score_a, score_b, kickoff, game_id):
+    """Stack each result twice, once from each team's side"""
+    team = np.concatenate([team_a, team_b])
+    opponent = np.concatenate([team_b, team_a])
+    points_for = np.concatenate([score_a, score_b])
+    points_against = np.concatenate([score_b, score_a])
+    # Games play out in kickoff order, then id order for same-time games
+    played_order = np.lexsort((np.concatenate([game_id, game_id]), np.concatenate([kickoff, kickoff])))
+    sequence = np.empty(len(team), dtype=np.int64)
+    sequence[played_order] = np.arange(len(team))
+    return team, opponent, np.sign(points_for - points_against), sequence
+
+
+def _streaks(size, team, result, sequence):
+    """Current streak per team as (run length, run result: 1 win, -1 loss, 0 tie)"""
+    lengths = np.zeros(size, dtype=np.int64)
+    kinds = np.zeros(size, dtype=np.int64)
+    if not len(team):
+        return lengths, kinds
+    order = np.lexsort((sequence, team))
+    team, result = team[order], result[order]
+    # A new run starts wherever the team or the result changes
+    starts = np.ones(len(team), dtype=bool)
+    starts[1:] = (team[1:] != team[:-1]) | (result[1:] != result[:-1])
+    run_ids = np.cumsum(starts) - 1
+    run_lengths = np.bincount(run_ids)
+    last = np.ones(len(team), dtype=bool)
+    last[:-1] = team[1:] != team[:-1]
+    lengths[team[last]] = run_lengths[run_ids[last]]
+    kinds[team[last]] = result[last]
+    return lengths, kinds
+
+
+def _streak_labels(lengths, kinds):
+    letters = np.where(kinds > 0, 'W', np.where(kinds < 0, 'L', 'T'))
+    return np.where(lengths > 0, np.char.add(letters, lengths.astype(str)), '-')
+
+
+def rank_table(names, wins, losses, ties, points_for, points_against, results):
+    """Build the ranked standings frame from counter arrays and a results array
+
+    `results` is a (team_a_code, team_b_code, score_a, score_b, kickoff, game_id)
+    tuple of equal-length integer arrays.
+    """
+    names = np.asarray(names, dtype=object)
+    size = len(names)
+    played = wins + losses + ties
+    win_pct = np.divide(wins + 0.5 * ties, played, out=np.zeros(size), where=played > 0)
+    differential = points_for - points_against
+
+    team, opponent, result, sequence = _perspective(*results)
+    # Head-to-head only among teams level on win percentage
+    level = win_pct[team] == win_pct[opponent]
+    h2h_games = np.bincount(team[level], minlength=size)
+    h2h_points = np.bincount(team[level], weights=(result[level] > 0) + 0.5 * (result[level] == 0), minlength=size)
+    h2h_pct = np.divide(h2h_points, h2h_games, out=np.zeros(size), where=h2h_games > 0)
+
+    name_rank = np.argsort(np.argsort(np.char.lower(names.astype(str))))
+    order = np.lexsort((name_rank, -points_for, -differential, -h2h_pct, -win_pct))
+    lengths, kinds = _streaks(size, team, result, sequence)
+    frame = pd.DataFrame({
+        'rank': np.arange(1, size + 1),
+        'team': names[order],
+        'played': played[order],
+        'wins': wins[order],
+        'losses': losses[order],
+        'ties': ties[order],
+        'points_for': points_for[order],
+        'points_against': points_against[order],
+        'differential': differential[order],
+        'win_pct': win_pct[order].round(3),
+        'streak': _streak_labels(lengths, kinds)[order],
+    }, columns=COLUMNS)
+    return frame
+
+
+def compute_standings(teams, games):
+    """Rank teams from scratch over a list of games (no incremental state)"""
+    names = list(dict.fromkeys(list(teams) + [g[k] for g in games if is_final(g) for k in ('team_a', 'team_b')]))
+    codes = {name: idx for idx, name in enumerate(names)}
+    finals = pd.DataFrame([g for g in games if is_final(g)], columns=['team_a', 'team_b', 'score_a', 'score_b', 'date', 'time'])
+    team_a = finals['team_a'].map(codes).to_numpy(dtype=np.int64)
+    team_b = finals['team_b'].map(codes).to_numpy(dtype=np.int64)
+    score_a = finals['score_a'].to_numpy(dtype=np.int64)
+    score_b = finals['score_b'].to_numpy(dtype=np.int64)
+    kickoff = np.array([_kickoff(g) for g in games if is_final(g)], dtype=np.int64)
+    game_id = np.array([g.get('id') or 0 for g in games if is_final(g)], dtype=np.int64)
+    size = len(names)
+    team, _, result, _ = _perspective(team_a, team_b, score_a, score_b, kickoff, game_id)
+    points = np.concatenate([score_a, score_b])
+    conceded = np.concatenate([score_b, score_a])
+    return rank_table(
+        names,
+        np.bincount(team[result > 0], minlength=size),
+        np.bincount(team[result < 0], minlength=size),
+        np.bincount(team[result == 0], minlength=size),
+        np.bincount(team, weights=points, minlength=size).astype(np.int64),
+        np.bincount(team, weights=conceded, minlength=size).astype(np.int64),
+        (team_a, team_b, score_a, score_b, kickoff, game_id),
+    )
+
+
+class LeagueTable:
+    """Incrementally maintained standings for one league"""
+
+    def __init__(self, team_names=()):
+        self.names = []
+        self.codes = {}
+        self.wins = np.zeros(0, dtype=np.int64)
+        self.losses = np.zeros(0, dtype=np.int64)
+        self.ties = np.zeros(0, dtype=np.int64)
+        self.points_for = np.zeros(0, dtype=np.int64)
+        self.points_against = np.zeros(0, dtype=np.int64)
+        # One (code_a, code_b, score_a, score_b, kickoff, game_id) row per final game;
+        # removals move the last row into the gap so the live rows stay contiguous
+        self._results = np.zeros((16, 6), dtype=np.int64)
+        self._game_ids = []
+        self._rows = {}
+        self._frame = None
+        for name in team_names:
+            self._code(name)
+
+    def _code(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+            for attr in ('wins', 'losses', 'ties', 'points_for', 'points_against'):
+                setattr(self, attr, np.append(getattr(self, attr), 0))
+            self._frame = None
+        return code
+
+    def add_teams(self, team_names):
+        for name in team_names:
+            self._code(name)
+
+    def _apply(self, code_a, code_b, score_a, score_b, sign):
+        self.points_for[code_a] += sign * score_a
+        self.points_for[code_b] += sign * score_b
+        self.points_against[code_a] += sign * score_b
+        self.points_against[code_b] += sign * score_a
+        if score_a == score_b:
+            self.ties[code_a] += sign
+            self.ties[code_b] += sign
+        else:
+            winner, loser = (code_a, code_b) if score_a > score_b else (code_b, code_a)
+            self.wins[winner] += sign
+            self.losses[loser] += sign
+        self._frame = None
+
+    def __len__(self):
+        return len(self._game_ids)
+
+    def add_game(self, game):
+        """Count a game if it is final"""
+        if not is_final(game) or game['id'] in self._rows:
+            return
+        entry = (self._code(game['team_a']), self._code(game['team_b']),
+                 int(game['score_a']), int(game['score_b']), _kickoff(game), game['id'])
+        row = len(self._game_ids)
+        if row == len(self._results):
+            self._results = np.concatenate([self._results, np.zeros_like(self._results)])
+        self._results[row] = entry
+        self._rows[game['id']] = row
+        self._game_ids.append(game['id'])
+        self._apply(*entry[:4], 1)
+
+    def remove_game(self, game):
+        """Take a game's result back out"""
+        row = self._rows.pop(game['id'], None)
+        if row is None:
+            return
+        self._apply(*self._results[row, :4].tolist(), -1)
+        last = len(self._game_ids) - 1
+        moved = self._game_ids.pop()
+        if row != last:
+            self._results[row] = self._results[last]
+            self._game_ids[row] = moved
+            self._rows[moved] = row
+
+    def frame(self):
+        """Return the ranked standings DataFrame, rebuilt only after a change"""
+        if self._frame is None:
+            results = self._results[:len(self._game_ids)]
+            self._frame = rank_table(
+                self.names, self.wins, self.losses, self.ties, self.points_for, self.points_against,
+                tuple(results.T),
+            )
+        return self._frame.copy()
+
+
+class StandingsIndex:
+    """LeagueTable per league id, kept current by the repository"""
+
+    def __init__(self):
+        self._tables = {}
+
+    def _table(self, league_id):
+        return self._tables.setdefault(league_id, LeagueTable())
+
+    def add_league(self, league_id, team_names):
+        self._table(league_id).add_teams(team_names)
+
+    def add_game(self, game):
+        self._table(game['league_id']).add_game(game)
+
+    def remove_game(self, game):
+        table = self._tables.get(game['league_id'])
+        if table is not None:
+            table.remove_game(game)
+
+    def table(self, league_id):
+        """Ranked standings for a league (empty frame for an unknown league)"""
+        return self._table(league_id).frame()
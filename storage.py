@@ -0,0 +1,693 @@
+"""Shared SQLite storage for PFFL leagues, teams and games"""
+import os
+import sqlite3
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from itertools import combinations, groupby
+
+from entity_index import EntityIndex
+from instrumentation import metrics
+from standings import StandingsIndex
+
+DB_PATH = os.getenv("PFFL_DB_PATH", "pffl.db")
+GAME_DURATION_MINUTES = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leagues (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    format TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    logo TEXT,
+    fee_type TEXT,
+    fee_amount REAL,
+    venue TEXT,
+    schedule_preferences TEXT
+);
+
+CREATE TABLE IF NOT EXISTS teams (
+    league_id INTEGER NOT NULL REFERENCES leagues(id) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    logo TEXT,
+    PRIMARY KEY (league_id, id)
+);
+
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    league_id INTEGER NOT NULL REFERENCES leagues(id),
+    league_name TEXT,
+    team_a TEXT NOT NULL,
+    team_a_logo TEXT,
+    team_b TEXT NOT NULL,
+    team_b_logo TEXT,
+    date TEXT,
+    time TEXT,
+    venue TEXT,
+    referee TEXT,
+    status TEXT NOT NULL DEFAULT 'Scheduled',
+    score_a INTEGER,
+    score_b INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS referees (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE INDEX IF NOT EXISTS idx_leagues_name ON leagues(name);
+CREATE INDEX IF NOT EXISTS idx_games_league_id ON games(league_id);
+CREATE INDEX IF NOT EXISTS idx_games_league_schedule ON games(league_name, date, time);
+CREATE INDEX IF NOT EXISTS idx_games_teams ON games(league_id, team_a, team_b);
+CREATE INDEX IF NOT EXISTS idx_games_date_time ON games(date, time);
+CREATE INDEX IF NOT EXISTS idx_games_status ON games(status, date, time);
+"""
+
+LEAGUE_FIELDS = ['name', 'format', 'start_date', 'end_date', 'logo',
+                 'fee_type', 'fee_amount', 'venue', 'schedule_preferences']
+GAME_FIELDS = ['league_id', 'league_name', 'team_a', 'team_a_logo', 'team_b', 'team_b_logo',
+               'date', 'time', 'venue', 'referee', 'status', 'score_a', 'score_b']
+
+
+class MatchupIndex:
+    """Hash index of games keyed on league and unordered team pair
+
+    Each game is filed under (league_id, {team_a, team_b}) and under the same
+    key plus its date, so duplicate checks are a dict lookup either way.
+    Cancelled games are left out, so their matchup can be booked again.
+    """
+
+    def __init__(self):
+        self._games = {}
+
+    @staticmethod
+    def key(league_id, team_a, team_b, date=None):
+        """Return the index key for a matchup, optionally pinned to a date"""
+        pair = frozenset((team_a, team_b))
+        return (league_id, pair) if date is None else (league_id, pair, date)
+
+    def _keys(self, game):
+        return (self.key(game['league_id'], game['team_a'], game['team_b']),
+                self.key(game['league_id'], game['team_a'], game['team_b'], game.get('date')))
+
+    def add(self, game):
+        """File a game under its matchup keys unless it was cancelled"""
+        if game.get('status') == 'Cancelled':
+            return
+        for key in self._keys(game):
+            self._games.setdefault(key, set()).add(game['id'])
+
+    def remove(self, game):
+        """Drop a game from its matchup keys"""
+        for key in self._keys(game):
+            ids = self._games.get(key)
+            if ids is not None:
+                ids.discard(game['id'])
+                if not ids:
+                    del self._games[key]
+
+    def contains(self, league_id, team_a, team_b, date=None):
+        """Check whether the matchup exists, optionally on a given date"""
+        return self.key(league_id, team_a, team_b, date) in self._games
+
+    def unplayed(self, league_id, team_names):
+        """Return team pairs in a league that have no game yet"""
+        return [(a, b) for a, b in combinations(team_names, 2)
+                if self.key(league_id, a, b) not in self._games]
+
+
+class UpcomingGames:
+    """Kickoff keys (date, time, id) of scheduled games, kept sorted
+
+    Inserts and removals are a bisect plus a list shift, and next(n) is a
+    slice, so the dashboard never sorts the game table. Only the keys are
+    held; the repository reads the rows for the ids next(n) returns.
+    """
+
+    def __init__(self):
+        self._keys = []
+
+    @staticmethod
+    def _key(game):
+        return (game.get('date') or '', game.get('time') or '', game['id'])
+
+    def add(self, game):
+        """Track a game if it is scheduled"""
+        if game.get('status', 'Scheduled') != 'Scheduled':
+            return
+        insort(self._keys, self._key(game))
+
+    def remove(self, game):
+        """Stop tracking a game, given as it was when added"""
+        key = self._key(game)
+        idx = bisect_left(self._keys, key)
+        if idx < len(self._keys) and self._keys[idx] == key:
+            del self._keys[idx]
+
+    def next(self, count):
+        """Return the ids of the next `count` scheduled games in kickoff order"""
+        return [key[2] for key in self._keys[:count]]
+
+    def __len__(self):
+        return len(self._keys)
+
+
+@lru_cache(maxsize=16384)
+def kickoff_minutes(date, time):
+    """Minutes since 0001-01-01 for a game's date and HH:MM time, or None if unparseable"""
+    try:
+        day = datetime.strptime(date, '%Y-%m-%d')
+        hour, minute = (int(part) for part in time.split(':')[:2])
+    except (TypeError, ValueError, AttributeError):
+        return None
+    return day.toordinal() * 1440 + hour * 60 + minute
+
+
+class BookingIndex:
+    """Sorted booking intervals per venue and per referee
+
+    Each resource keeps a list of (start, end, game_id) sorted by start.
+    Games all last `duration` minutes, so an overlap query is a bisect to
+    `start - duration` followed by a scan of the few neighbours. Double
+    bookings are kept as a set updated on add and remove, so listing them
+    never sweeps the calendar. Cancelled games book nothing.
+    """
+
+    def __init__(self, duration=GAME_DURATION_MINUTES):
+        self.duration = duration
+        self._intervals = {}
+        # (kind, name, earlier game_id, later game_id) for every overlapping pair
+        self._conflicts = set()
+        self._conflicts_by_game = {}
+        self._sorted_conflicts = None
+
+    @staticmethod
+    def _resources(game):
+        resources = []
+        if game.get('status') == 'Cancelled':
+            return resources
+        if game.get('venue') and game['venue'] != 'TBD':
+            resources.append(('venue', game['venue']))
+        if game.get('referee'):
+            resources.append(('referee', game['referee']))
+        return resources
+
+    def add(self, game):
+        """Book a game's venue and referee"""
+        start = kickoff_minutes(game.get('date'), game.get('time'))
+        if start is None:
+            return
+        entry = (start, start + self.duration, game['id'])
+        for resource in self._resources(game):
+            intervals = self._intervals.setdefault(resource, [])
+            for other in self._overlaps(intervals, start):
+                first, second = sorted((other, entry))
+                self._link(resource + (first[2], second[2]))
+            insort(intervals, entry)
+
+    def remove(self, game):
+        """Release a game's venue and referee bookings"""
+        start = kickoff_minutes(game.get('date'), game.get('time'))
+        if start is None:
+            return
+        entry = (start, start + self.duration, game['id'])
+        for resource in self._resources(game):
+            intervals = self._intervals.get(resource, [])
+            idx = bisect_left(intervals, entry)
+            if idx < len(intervals) and intervals[idx] == entry:
+                del intervals[idx]
+                for conflict in list(self._conflicts_by_game.get(game['id'], ())):
+                    if conflict[:2] == resource:
+                        self._unlink(conflict)
+
+    def _link(self, conflict):
+        self._conflicts.add(conflict)
+        self._sorted_conflicts = None
+        for game_id in conflict[2:]:
+            self._conflicts_by_game.setdefault(game_id, set()).add(conflict)
+
+    def _unlink(self, conflict):
+        self._conflicts.discard(conflict)
+        self._sorted_conflicts = None
+        for game_id in conflict[2:]:
+            linked = self._conflicts_by_game.get(game_id)
+            if linked is not None:
+                linked.discard(conflict)
+                if not linked:
+                    del self._conflicts_by_game[game_id]
+
+    def _overlaps(self, intervals, start):
+        """Intervals overlapping a game that starts at `start` minutes"""
+        end = start + self.duration
+        idx = bisect_left(intervals, (start - self.duration + 1,))
+        while idx < len(intervals) and intervals[idx][0] < end:
+            if intervals[idx][1] > start:
+                yield intervals[idx]
+            idx += 1
+
+    def overlapping(self, kind, name, date, time, exclude_id=None):
+        """Return ids of games booking the resource during a game starting at date/time"""
+        start = kickoff_minutes(date, time)
+        intervals = self._intervals.get((kind, name))
+        if start is None or not intervals:
+            return []
+        return [game_id for _, _, game_id in self._overlaps(intervals, start) if game_id != exclude_id]
+
+    def all_conflicts(self):
+        """Return every (kind, name, game_id, other_id) double booking, earlier game first"""
+        if self._sorted_conflicts is None:
+            self._sorted_conflicts = sorted(self._conflicts)
+        return list(self._sorted_conflicts)
+
+
+class LeagueStats:
+    """Dashboard counters kept up to date as leagues and games are written"""
+
+    def __init__(self):
+        self.leagues = 0
+        self.teams = 0
+        self.fee_total = 0
+        self.games = 0
+        self.games_by_status = Counter()
+        self.games_by_league = Counter()
+        self.games_by_venue = Counter()
+
+    def add_league(self, league):
+        """Count a league, its teams and its entry fees (fee_amount x teams)"""
+        self.leagues += 1
+        self.teams += len(league.get('teams', []))
+        self.fee_total += (league.get('fee_amount') or 0) * len(league.get('teams', []))
+
+    def add_teams(self, league, count):
+        """Count teams added to an existing league and the fees they owe"""
+        self.teams += count
+        self.fee_total += (league.get('fee_amount') or 0) * count
+
+    def add_game(self, game):
+        self.games += 1
+        self.games_by_status[game.get('status', 'Scheduled')] += 1
+        self.games_by_league[game.get('league_name')] += 1
+        self.games_by_venue[game.get('venue') or 'TBD'] += 1
+
+    def remove_game(self, game):
+        self.games -= 1
+        for counter, key in ((self.games_by_status, game.get('status', 'Scheduled')),
+                             (self.games_by_league, game.get('league_name')),
+                             (self.games_by_venue, game.get('venue') or 'TBD')):
+            counter[key] -= 1
+            if counter[key] <= 0:
+                del counter[key]
+
+    def active_games(self):
+        """Games that have not finished or been cancelled"""
+        return self.games_by_status['Scheduled'] + self.games_by_status['In Progress']
+
+    def snapshot(self):
+        """Return a copy of every counter"""
+        return {
+            'leagues': self.leagues,
+            'teams': self.teams,
+            'fee_total': self.fee_total,
+            'games': self.games,
+            'active_games': self.active_games(),
+            'games_by_status': dict(self.games_by_status),
+            'games_by_league': dict(self.games_by_league),
+            'games_by_venue': dict(self.games_by_venue),
+        }
+
+
+class LeagueRepository:
+    """Repository over the leagues/teams/games tables
+
+    A single connection is shared by every Streamlit session, so all access
+    goes through one lock. WAL mode keeps readers from blocking on writes.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        # Bumped on every write so caches can key on the data they were built from;
+        # reference_version only moves when leagues, teams or referees change
+        self.version = 0
+        self.reference_version = 0
+        self.matchups = MatchupIndex()
+        self.upcoming = UpcomingGames()
+        self.stats = LeagueStats()
+        self.bookings = BookingIndex()
+        self.standings = StandingsIndex()
+        self.entities = EntityIndex()
+        for league in self.list_leagues():
+            self.stats.add_league(league)
+            self.standings.add_league(league['id'], [t['name'] for t in league['teams']])
+            self.entities.add_league(league)
+        for name in self.list_referees():
+            self.entities.add('referee', name)
+        for row in self._query("SELECT * FROM games"):
+            game = dict(row)
+            self.matchups.add(game)
+            self.upcoming.add(game)
+            self.stats.add_game(game)
+            self.bookings.add(game)
+            self.standings.add_game(game)
+            self.entities.add_game(game)
+
+    def close(self):
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # Leagues
+
+    def _league_from_row(self, row, teams):
+        league = {k: row[k] for k in row.keys() if row[k] is not None}
+        league['teams'] = teams
+        return league
+
+    def _teams_for(self, league_ids):
+        teams = {league_id: [] for league_id in league_ids}
+        if not league_ids:
+            return teams
+        placeholders = ','.join('?' * len(league_ids))
+        rows = self._query(
+            f"SELECT league_id, id, name, logo FROM teams WHERE league_id IN ({placeholders}) ORDER BY league_id, id",
+            tuple(league_ids)
+        )
+        for row in rows:
+            teams[row['league_id']].append({'id': row['id'], 'name': row['name'], 'logo': row['logo']})
+        return teams
+
+    @metrics.timed('storage.list_leagues')
+    def list_leagues(self):
+        """Return every league with its teams, ordered by id"""
+        rows = self._query("SELECT * FROM leagues ORDER BY id")
+        teams = self._teams_for([row['id'] for row in rows])
+        return [self._league_from_row(row, teams[row['id']]) for row in rows]
+
+    def league_names(self):
+        """Return league names without loading teams"""
+        return [row['name'] for row in self._query("SELECT name FROM leagues ORDER BY id")]
+
+    @metrics.timed('storage.get_league')
+    def get_league(self, league_id):
+        """Return a league by id, or None"""
+        rows = self._query("SELECT * FROM leagues WHERE id = ?", (league_id,))
+        if not rows:
+            return None
+        return self._league_from_row(rows[0], self._teams_for([league_id])[league_id])
+
+    @metrics.timed('storage.get_league_by_name')
+    def get_league_by_name(self, name):
+        """Return a league by exact name, or None"""
+        rows = self._query("SELECT * FROM leagues WHERE name = ? ORDER BY id LIMIT 1", (name,))
+        if not rows:
+            return None
+        league_id = rows[0]['id']
+        return self._league_from_row(rows[0], self._teams_for([league_id])[league_id])
+
+    def count_leagues(self):
+        """Return the number of leagues"""
+        return self._query("SELECT COUNT(*) FROM leagues")[0][0]
+
+    @metrics.timed('storage.add_league')
+    def add_league(self, league):
+        """Insert a league and its teams, returning the stored league with its id"""
+        columns = [f for f in LEAGUE_FIELDS if f in league]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO leagues ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                tuple(league[c] for c in columns)
+            )
+            league_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO teams (league_id, id, name, logo) VALUES (?, ?, ?, ?)",
+                [(league_id, t.get('id', idx + 1), t['name'], t.get('logo')) for idx, t in enumerate(league.get('teams', []))]
+            )
+            self.stats.add_league(league)
+            self.standings.add_league(league_id, [t['name'] for t in league.get('teams', [])])
+            self.entities.add_league(league)
+            self.version += 1
+            self.reference_version += 1
+        return dict(league, id=league_id)
+
+    @metrics.timed('storage.add_teams')
+    def add_teams(self, league_id, teams):
+        """Append teams to an existing league, numbering them after its current roster"""
+        with self._lock, self._conn:
+            league = self.get_league(league_id)
+            if league is None or not teams:
+                return []
+            next_id = max((t['id'] for t in league['teams']), default=0) + 1
+            added = [{'id': next_id + idx, 'name': t['name'], 'logo': t.get('logo')} for idx, t in enumerate(teams)]
+            self._conn.executemany(
+                "INSERT INTO teams (league_id, id, name, logo) VALUES (?, ?, ?, ?)",
+                [(league_id, t['id'], t['name'], t['logo']) for t in added]
+            )
+            self.stats.add_teams(league, len(added))
+            self.standings.add_league(league_id, [t['name'] for t in added])
+            self.entities.add_teams(league['name'], added)
+            self.version += 1
+            self.reference_version += 1
+        return added
+
+    # Referees
+
+    @metrics.timed('storage.list_referees')
+    def list_referees(self):
+        """Return referee names in the order they were added"""
+        return [row['name'] for row in self._query("SELECT name FROM referees ORDER BY id")]
+
+    @metrics.timed('storage.add_referees')
+    def add_referees(self, names):
+        """Add referees, ignoring names already on the list"""
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO referees (name) VALUES (?)", [(n,) for n in names])
+            for name in names:
+                self.entities.add('referee', name)
+            self.version += 1
+            self.reference_version += 1
+
+    # Games
+
+    def _where(self, league_id=None, league_name=None, status=None):
+        clauses, params = [], []
+        if league_id is not None:
+            clauses.append("league_id = ?")
+            params.append(league_id)
+        if league_name is not None:
+            clauses.append("league_name = ?")
+            params.append(league_name)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    @metrics.timed('storage.list_games')
+    def list_games(self, league_id=None, league_name=None, status=None, limit=None):
+        """Return games matching the filters, ordered by date and time"""
+        where, params = self._where(league_id, league_name, status)
+        sql = f"SELECT * FROM games{where} ORDER BY date, time, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._query(sql, tuple(params))]
+
+    @metrics.timed('storage.page_games')
+    def page_games(self, league_name=None, status=None, after=None, limit=25, descending=False):
+        """Return one page of games in (date, time, id) order and the cursor for the next page
+
+        Keyset pagination: `after` is the cursor returned with the previous
+        page, so each page is an index range scan no matter how deep it is.
+        """
+        where, params = self._where(league_name=league_name, status=status)
+        if after is not None:
+            where += (" AND " if where else " WHERE ") + f"(date, time, id) {'<' if descending else '>'} (?, ?, ?)"
+            params.extend(after)
+        order = "DESC" if descending else "ASC"
+        rows = self._query(
+            f"SELECT * FROM games{where} ORDER BY date {order}, time {order}, id {order} LIMIT ?",
+            tuple(params) + (limit + 1,)
+        )
+        games = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = games[-1]
+            next_cursor = (last['date'], last['time'], last['id'])
+        return games, next_cursor
+
+    @metrics.timed('storage.booking_conflicts')
+    def booking_conflicts(self, date, time, venue=None, referee=None, exclude_id=None):
+        """Return games that would clash with a game at date/time on the venue or referee"""
+        with self._lock:
+            ids = []
+            if venue and venue != 'TBD':
+                ids += [('venue', i) for i in self.bookings.overlapping('venue', venue, date, time, exclude_id)]
+            if referee:
+                ids += [('referee', i) for i in self.bookings.overlapping('referee', referee, date, time, exclude_id)]
+        return [(kind, self.get_game(game_id)) for kind, game_id in ids]
+
+    def is_booked(self, kind, name, date, time):
+        """Whether a venue or referee is busy during a game starting at date/time"""
+        with self._lock:
+            return bool(self.bookings.overlapping(kind, name, date, time))
+
+    @metrics.timed('storage.meetings')
+    def meetings(self, league_id):
+        """Counter of (team_a, team_b) -> games a league already has in that order, cancelled ones aside"""
+        rows = self._query("SELECT team_a, team_b, COUNT(*) FROM games WHERE league_id = ? AND status != 'Cancelled' "
+                           "GROUP BY team_a, team_b", (league_id,))
+        return Counter({(row[0], row[1]): row[2] for row in rows})
+
+    def all_booking_conflicts(self):
+        """Return every pair of games that double-books a venue or referee"""
+        with self._lock:
+            return self.bookings.all_conflicts()
+
+    @metrics.timed('storage.standings_table')
+    def standings_table(self, league_id):
+        """Return the ranked standings DataFrame for a league"""
+        with self._lock:
+            return self.standings.table(league_id)
+
+    @metrics.timed('storage.search_entities')
+    def search_entities(self, text, k=8, kinds=None):
+        """Leagues, teams, venues and referees named in text, best match first"""
+        with self._lock:
+            return self.entities.search(text, k=k, kinds=kinds)
+
+    def get_stats(self):
+        """Return the current dashboard counters"""
+        with self._lock:
+            return self.stats.snapshot()
+
+    @metrics.timed('storage.upcoming_games')
+    def upcoming_games(self, count):
+        """Return the next `count` scheduled games, read by id in kickoff order"""
+        with self._lock:
+            ids = self.upcoming.next(count)
+            if not ids:
+                return []
+            rows = self._query(f"SELECT * FROM games WHERE id IN ({','.join('?' * len(ids))})", tuple(ids))
+        games = {row['id']: dict(row) for row in rows}
+        return [games[game_id] for game_id in ids if game_id in games]
+
+    @metrics.timed('storage.get_game')
+    def get_game(self, game_id):
+        """Return a game by id, or None"""
+        rows = self._query("SELECT * FROM games WHERE id = ?", (game_id,))
+        return dict(rows[0]) if rows else None
+
+    def game_total(self, league_name=None):
+        """Return the number of games, overall or in one league, from the in-memory counters"""
+        with self._lock:
+            return self.stats.games if league_name is None else self.stats.games_by_league[league_name]
+
+    @metrics.timed('storage.count_games')
+    def count_games(self, league_id=None, league_name=None, status=None):
+        """Return the number of games matching the filters"""
+        where, params = self._where(league_id, league_name, status)
+        return self._query(f"SELECT COUNT(*) FROM games{where}", tuple(params))[0][0]
+
+    def game_exists(self, league_id, team_a, team_b, date=None):
+        """Check whether the two teams already meet in a league, in either order"""
+        return self.matchups.contains(league_id, team_a, team_b, date)
+
+    def unplayed_matchups(self, league_id):
+        """Return team pairs in a league that have not been scheduled yet"""
+        league = self.get_league(league_id)
+        if league is None:
+            return []
+        return self.matchups.unplayed(league_id, [t['name'] for t in league['teams']])
+
+    @metrics.timed('storage.add_game')
+    def add_game(self, game):
+        """Insert a game, returning the stored game with its id"""
+        columns = [f for f in GAME_FIELDS if f in game]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO games ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                tuple(game[c] for c in columns)
+            )
+            stored = dict(game, id=cursor.lastrowid)
+            self.matchups.add(stored)
+            self.upcoming.add(stored)
+            self.stats.add_game(stored)
+            self.bookings.add(stored)
+            self.standings.add_game(stored)
+            self.entities.add_game(stored)
+            self.version += 1
+        return stored
+
+    @metrics.timed('storage.add_games')
+    def add_games(self, games):
+        """Insert many games in one transaction, returning them with their ids"""
+        games = list(games)
+        stored = []
+        with self._lock, self._conn:
+            # One prepared statement per run of games that share the same columns. Ids come from
+            # each row's lastrowid; inferring them from MAX(id) breaks when another connection
+            # (a second app process, replay or bulk tools) inserts before this transaction does
+            for columns, run in groupby(games, key=lambda g: tuple(f for f in GAME_FIELDS if f in g)):
+                sql = f"INSERT INTO games ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+                cursor = self._conn.cursor()
+                for game in run:
+                    cursor.execute(sql, tuple(game[c] for c in columns))
+                    stored.append(dict(game, id=cursor.lastrowid))
+            for game in stored:
+                self.matchups.add(game)
+                self.upcoming.add(game)
+                self.stats.add_game(game)
+                self.bookings.add(game)
+                self.standings.add_game(game)
+                self.entities.add_game(game)
+            self.version += 1
+        return stored
+
+    @metrics.timed('storage.update_game')
+    def update_game(self, game_id, **fields):
+        """Update fields of a game, returning the stored game"""
+        columns = [f for f in GAME_FIELDS if f in fields]
+        with self._lock:
+            previous = self.get_game(game_id)
+            if previous is None or not columns:
+                return previous
+            with self._conn:
+                self._conn.execute(
+                    f"UPDATE games SET {', '.join(c + ' = ?' for c in columns)} WHERE id = ?",
+                    tuple(fields[c] for c in columns) + (game_id,)
+                )
+            game = dict(previous, **{c: fields[c] for c in columns})
+            self.matchups.remove(previous)
+            self.matchups.add(game)
+            self.upcoming.remove(previous)
+            self.upcoming.add(game)
+            self.stats.remove_game(previous)
+            self.stats.add_game(game)
+            self.bookings.remove(previous)
+            self.bookings.add(game)
+            self.standings.remove_game(previous)
+            self.standings.add_game(game)
+            self.entities.add_game(game)
+            self.version += 1
+        return game
+
+    def seed(self, leagues, games, referees=()):
+        """Load demo data into an empty database"""
+        self.add_referees(referees)
+        for league in leagues:
+            self.add_league(league)
+        for game in games:
+            self.add_game(game)
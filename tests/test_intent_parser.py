@@ -0,0 +1,72 @@
+"""Which chat messages the local command parser applies without asking the model
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from intent_parser import parse_game, parse_league
+
+LEAGUES = [{'id': 1, 'name': 'Phoenix Winter 2025', 'format': '7v7',
+            'teams': [{'id': 1, 'name': 'Phoenix Firebirds'}, {'id': 2, 'name': 'Desert Storm'}]}]
+REFEREES = ['John Carter']
+GAME = "Phoenix Firebirds vs Desert Storm 2025-01-20 10:00 at Desert Field ref John Carter"
+LEAGUE = "format: 7v7; start: 2025-04-01; end: 2025-06-01; teams: Hawks, Owls, Kites, Jays"
+
+
+@pytest.mark.parametrize('message', [
+    f"schedule {GAME}",
+    f"Please book {GAME}",
+    f"let's set up {GAME}",
+])
+def test_game_command(message):
+    action = parse_game(message, LEAGUES, REFEREES)
+    assert action['action'] == 'create_game'
+    assert action['data'] == {'league_name': 'Phoenix Winter 2025', 'team_a': 'Phoenix Firebirds',
+                              'team_b': 'Desert Storm', 'date': '2025-01-20', 'time': '10:00',
+                              'venue': 'Desert Field', 'referee': 'John Carter'}
+
+
+@pytest.mark.parametrize('message', [
+    f"Do not schedule {GAME}",
+    f"Don't book {GAME}",
+    f"never schedule {GAME}",
+    f"schedule {GAME}. Actually, dont.",
+    f"Can we book {GAME}? Actually, dont.",
+    f"Should I schedule {GAME}?",
+    f"schedule {GAME}?",
+    f"We already scheduled {GAME}",
+])
+def test_game_questions_and_negations_go_to_model(message):
+    assert parse_game(message, LEAGUES, REFEREES) is None
+
+
+@pytest.mark.parametrize('message', [
+    f"create league Spring Cup; {LEAGUE}",
+    f"I want to create a new league called Spring Cup; {LEAGUE}",
+    f"create a league named: Spring Cup; {LEAGUE}",
+    f"New league titled Spring Cup; {LEAGUE}",
+])
+def test_league_command_names_the_league(message):
+    action = parse_league(message, LEAGUES)
+    assert action['action'] == 'create_league'
+    assert action['data']['name'] == 'Spring Cup'
+    assert action['data']['teams'] == ['Hawks', 'Owls', 'Kites', 'Jays']
+
+
+@pytest.mark.parametrize('message', [
+    f"Do not create league Spring Cup; {LEAGUE}",
+    f"Can we create league Spring Cup? {LEAGUE}",
+    f"which league is Spring Cup; {LEAGUE}",
+])
+def test_league_questions_and_negations_go_to_model(message):
+    assert parse_league(message, LEAGUES) is None
+
+
+def test_existing_league_name_is_refused():
+    action = parse_league(f"create league phoenix winter 2025; {LEAGUE}", LEAGUES)
+    assert action['action'] == 'error'
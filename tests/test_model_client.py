@@ -0,0 +1,195 @@
+"""ModelClient timeouts, backoff and circuit breaker against a fake model
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+import model_client
+from instrumentation import Metrics
+from model_client import CircuitBreaker, ModelClient, ModelUnavailable
+
+
+class Reply:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FakeModel:
+    """Plays back a script of replies: a string is returned, an exception raised, a float slept"""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        step = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(step, float):
+            time.sleep(step)
+            return 'late'
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        text = self._next()
+        if stream:
+            return [Reply(part) for part in text.split('|')]
+        return Reply(text)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_client(breaker=None, **kwargs):
+    sleeps = []
+    client = ModelClient(breaker=breaker, sleep=sleeps.append, metrics=Metrics(), **kwargs)
+    return client, sleeps
+
+
+def test_returns_reply_and_records_span():
+    client, sleeps = make_client()
+    assert client.generate(FakeModel('{"action": "show_info"}'), 'prompt') == '{"action": "show_info"}'
+    assert sleeps == []
+    row = client.metrics.summary()[0]
+    assert row['span'] == 'model.generate' and row['calls'] == 1
+
+
+def test_timeout_is_retried_then_reported_unavailable():
+    client, sleeps = make_client(timeout=0.05, max_retries=2)
+    model = FakeModel(0.3)
+    started = time.monotonic()
+    with pytest.raises(ModelUnavailable, match='TimeoutError'):
+        client.generate(model, 'prompt')
+    # Each attempt is cut off at the deadline instead of waiting for the slow reply
+    assert time.monotonic() - started < 0.3 * 3
+    assert model.calls == 3
+    assert len(sleeps) == 2
+    assert client.breaker.failures == 1
+
+
+def test_streaming_timeout():
+    client, _ = make_client(timeout=0.05, max_retries=0)
+    with pytest.raises(ModelUnavailable):
+        client.generate(FakeModel(0.3), 'prompt', on_chunk=lambda text: None)
+
+
+def test_retryable_errors_back_off_then_succeed():
+    client, sleeps = make_client(max_retries=3)
+    model = FakeModel(api_exceptions.ServiceUnavailable('down'), api_exceptions.TooManyRequests('slow down'), 'ok')
+    assert client.generate(model, 'prompt') == 'ok'
+    assert model.calls == 3
+    assert len(sleeps) == 2
+    assert client.metrics.counters()['model.retries'] == 2
+    assert client.breaker.failures == 0
+
+
+def test_backoff_is_capped_exponential_jitter(monkeypatch):
+    client, _ = make_client(base_delay=0.5, max_delay=4)
+    monkeypatch.setattr(model_client.random, 'uniform', lambda low, high: high)
+    assert [client.backoff(n) for n in range(1, 6)] == [0.5, 1, 2, 4, 4]
+    monkeypatch.setattr(model_client.random, 'uniform', lambda low, high: low)
+    assert client.backoff(3) == 0
+
+
+def test_no_retry_once_chunks_were_delivered():
+    class BreaksMidStream(FakeModel):
+        def generate_content(self, prompt, stream=False, request_options=None):
+            self.calls += 1
+
+            def chunks():
+                yield Reply('{"action": ')
+                raise api_exceptions.ServiceUnavailable('dropped')
+            return chunks()
+
+    client, sleeps = make_client(max_retries=3)
+    model = BreaksMidStream('unused')
+    seen = []
+    with pytest.raises(ModelUnavailable):
+        client.generate(model, 'prompt', on_chunk=seen.append)
+    assert model.calls == 1 and sleeps == [] and seen == ['{"action": ']
+
+
+def test_breaker_opens_after_consecutive_outages():
+    clock = Clock()
+    client, _ = make_client(breaker=CircuitBreaker(failure_threshold=3, reset_after=30, clock=clock), max_retries=0)
+    model = FakeModel(api_exceptions.ServiceUnavailable('down'))
+    for _ in range(3):
+        with pytest.raises(ModelUnavailable, match='did not respond'):
+            client.generate(model, 'prompt')
+    assert client.breaker.is_open
+    with pytest.raises(ModelUnavailable, match='temporarily unavailable'):
+        client.generate(model, 'prompt')
+    # Short-circuited: the model was not called a fourth time
+    assert model.calls == 3
+
+
+@pytest.mark.parametrize('error', [ValueError('reply blocked by safety filters'),
+                                   api_exceptions.InvalidArgument('bad request')])
+def test_non_availability_errors_do_not_open_breaker(error):
+    client, sleeps = make_client(breaker=CircuitBreaker(failure_threshold=3), max_retries=2)
+    model = FakeModel(error)
+    for _ in range(5):
+        with pytest.raises(type(error)):
+            client.generate(model, 'prompt')
+    assert model.calls == 5 and sleeps == []
+    assert not client.breaker.is_open and client.breaker.failures == 0
+
+
+def test_half_open_lets_one_probe_through():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_after=30, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+    clock.now = 30
+    assert breaker.allow()
+    # While the probe is out, everyone else is still held off
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and not breaker.is_open
+
+
+def test_failed_probe_reopens_breaker():
+    clock = Clock()
+    client, _ = make_client(breaker=CircuitBreaker(failure_threshold=1, reset_after=30, clock=clock), max_retries=0)
+    model = FakeModel(api_exceptions.ServiceUnavailable('down'), api_exceptions.ServiceUnavailable('still down'), 'ok')
+    with pytest.raises(ModelUnavailable):
+        client.generate(model, 'prompt')
+    clock.now = 30
+    with pytest.raises(ModelUnavailable, match='did not respond'):
+        client.generate(model, 'prompt')
+    clock.now = 45
+    with pytest.raises(ModelUnavailable, match='temporarily unavailable'):
+        client.generate(model, 'prompt')
+    clock.now = 60
+    assert client.generate(model, 'prompt') == 'ok'
+    assert not client.breaker.is_open
+    assert model.calls == 3
+
+
+def test_half_open_probe_is_single_under_concurrency():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_after=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 31
+    allowed = []
+    threads = [threading.Thread(target=lambda: allowed.append(breaker.allow())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert allowed.count(True) == 1
@@ -0,0 +1,59 @@
+"""replay.py's dry run reaches the same verdicts as the chat page
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from models import validate_action
+from replay import dry_run
+from storage import LeagueRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = LeagueRepository(str(tmp_path / 'league.db'))
+    repo.add_referees(['John Carter'])
+    repo.add_league({'name': 'Phoenix Winter 2025', 'format': '7v7',
+                     'teams': [{'name': n} for n in ('Sun Devils', 'Cactus Kings', 'Red Rocks')]})
+    repo.add_game({'league_id': 1, 'league_name': 'Phoenix Winter 2025', 'team_a': 'Sun Devils',
+                   'team_b': 'Red Rocks', 'date': '2025-01-20', 'time': '10:00', 'venue': 'Desert Field',
+                   'referee': 'John Carter'})
+    yield repo
+    repo.close()
+
+
+def game(**fields):
+    return dict({'league_name': 'winter 2025', 'team_a': 'Sun Devls', 'team_b': 'CACTUS KINGS',
+                 'date': '2025-01-27', 'time': '10:00', 'venue': 'Desert Field', 'referee': 'John Carter'}, **fields)
+
+
+def outcome(repo, action, data):
+    return dry_run(validate_action({'action': action, 'title': 'T', 'body': 'B', 'data': data}), repo)
+
+
+@pytest.mark.parametrize('fields, expected', [
+    ({}, 'ok'),
+    ({'league_name': 'Phoenix Fall 2030'}, 'unknown_league'),
+    ({'team_b': 'Mesa Mavericks'}, 'unknown_team'),
+    ({'team_b': 'sun devils'}, 'same_team'),
+    ({'team_a': 'Red Rocks', 'team_b': 'Sun Devils'}, 'duplicate'),
+    ({'date': '2025-01-20', 'time': '10:30'}, 'conflict'),
+])
+def test_create_game(repo, fields, expected):
+    assert outcome(repo, 'create_game', game(**fields)) == expected
+
+
+def test_create_games_checks_entries_against_each_other(repo):
+    assert outcome(repo, 'create_games', [game(), game(team_a='Cactus Kings', team_b='Sun Devils')]) == 'ok'
+    assert outcome(repo, 'create_games', [game(team_b='Sun Devils'), game(team_b='Mesa Mavericks')]) == 'same_team'
+
+
+def test_create_league_name_is_compared_folded(repo):
+    league = {'format': '7v7', 'start_date': '2025-04-01', 'end_date': '2025-06-01', 'teams': ['Hawks', 'Owls']}
+    assert outcome(repo, 'create_league', dict(league, name='Spring Cup')) == 'ok'
+    assert outcome(repo, 'create_league', dict(league, name='phoenix winter, 2025')) == 'duplicate_league'
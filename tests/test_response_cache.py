@@ -0,0 +1,50 @@
+"""Which chatbot questions may be answered from the shared response cache
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from response_cache import ResponseCache, normalize_message, refers_back
+
+
+def test_equivalent_questions_share_a_key():
+    assert normalize_message("Which venues do we use?") == normalize_message("  which VENUES do we use ")
+
+
+@pytest.mark.parametrize('message', [
+    "How many games are there?",
+    "Which venues do we use",
+    "What is the fee for the Winter league?",
+    "When does this season end?",
+])
+def test_standalone_questions_are_cacheable(message):
+    assert not refers_back(message)
+
+
+@pytest.mark.parametrize('message', [
+    "And their fees?",
+    "What about the Winter league?",
+    "When do they play next?",
+    "Is that the same venue?",
+    "how many teams does it have",
+])
+def test_follow_ups_skip_the_cache(message):
+    assert refers_back(message)
+
+
+def test_entries_expire_and_evict():
+    now = [0.0]
+    cache = ResponseCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.put('a', {'body': 1})
+    cache.put('b', {'body': 2})
+    assert cache.get('a') == {'body': 1}
+    cache.put('c', {'body': 3})
+    assert cache.get('b') is None and cache.stats()['evictions'] == 1
+    now[0] = 11
+    assert cache.get('a') is None
+    assert cache.stats()['hits'] == 1
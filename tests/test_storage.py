@@ -0,0 +1,90 @@
+"""LeagueRepository's in-memory indexes stay in step with the games table
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from storage import LeagueRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = LeagueRepository(str(tmp_path / 'league.db'))
+    repo.add_league({'name': 'Winter', 'format': '7v7', 'teams': [{'name': n} for n in 'ABCD']})
+    yield repo
+    repo.close()
+
+
+def game(team_a, team_b, time='10:00', **fields):
+    return dict({'league_id': 1, 'league_name': 'Winter', 'team_a': team_a, 'team_b': team_b,
+                 'date': '2025-01-20', 'time': time, 'venue': 'F', 'referee': 'R'}, **fields)
+
+
+def test_double_booking_is_listed(repo):
+    first, second = repo.add_games([game('A', 'B'), game('C', 'D', time='10:30')])
+    assert repo.all_booking_conflicts() == [('referee', 'R', first['id'], second['id']),
+                                            ('venue', 'F', first['id'], second['id'])]
+    assert repo.is_booked('venue', 'F', '2025-01-20', '10:45')
+
+
+def test_cancelled_game_releases_venue_referee_and_matchup(repo):
+    first, second = repo.add_games([game('A', 'B'), game('C', 'D', time='10:30')])
+    repo.update_game(first['id'], status='Cancelled')
+    assert repo.all_booking_conflicts() == []
+    assert not repo.is_booked('venue', 'F', '2025-01-20', '09:30')
+    assert not repo.is_booked('referee', 'R', '2025-01-20', '09:30')
+    assert not repo.game_exists(1, 'A', 'B')
+    assert not repo.game_exists(1, 'B', 'A', '2025-01-20')
+    assert repo.meetings(1) == {('C', 'D'): 1}
+    # The other game still holds its slot
+    assert repo.is_booked('venue', 'F', '2025-01-20', '10:30')
+
+
+def test_cancelled_game_can_be_rebooked(repo):
+    first = repo.add_game(game('A', 'B'))
+    repo.update_game(first['id'], status='Cancelled')
+    again = repo.add_game(game('B', 'A'))
+    assert repo.game_exists(1, 'A', 'B')
+    assert repo.all_booking_conflicts() == []
+    # Reinstating the cancelled game books it again, clash included
+    repo.update_game(first['id'], status='Scheduled')
+    assert repo.all_booking_conflicts() == [('referee', 'R', first['id'], again['id']),
+                                            ('venue', 'F', first['id'], again['id'])]
+
+
+def test_cancelled_games_load_without_bookings(repo, tmp_path):
+    first, _ = repo.add_games([game('A', 'B', status='Cancelled'), game('C', 'D')])
+    reopened = LeagueRepository(str(tmp_path / 'league.db'))
+    try:
+        assert reopened.all_booking_conflicts() == []
+        assert not reopened.game_exists(1, 'A', 'B')
+        assert reopened.game_exists(1, 'C', 'D')
+    finally:
+        reopened.close()
+
+
+def test_upcoming_games_follow_kickoff_order(repo):
+    late, early, final = repo.add_games([game('A', 'B', time='12:00'), game('C', 'D', time='09:00'),
+                                         game('A', 'C', time='08:00', status='Final')])
+    assert [g['id'] for g in repo.upcoming_games(5)] == [early['id'], late['id']]
+    assert repo.upcoming_games(1)[0]['team_a'] == 'C'
+    repo.update_game(late['id'], time='08:30')
+    assert [g['id'] for g in repo.upcoming_games(5)] == [late['id'], early['id']]
+    repo.update_game(early['id'], status='Cancelled')
+    assert [g['id'] for g in repo.upcoming_games(5)] == [late['id']]
+    assert len(repo.upcoming) == 1
+
+
+def test_game_total_matches_count_query(repo):
+    repo.add_league({'name': 'Summer', 'format': '5v5', 'teams': [{'name': n} for n in 'XY']})
+    first, _ = repo.add_games([game('A', 'B'), game('C', 'D', time='12:00')])
+    repo.add_game(game('X', 'Y', league_id=2, league_name='Summer'))
+    repo.update_game(first['id'], status='Final', score_a=3, score_b=1)
+    for league_name in (None, 'Winter', 'Summer', 'Spring'):
+        assert repo.game_total(league_name) == repo.count_games(league_name=league_name)
+    assert repo.game_total('Winter') == 2 and repo.game_total() == 3